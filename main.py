@@ -1,49 +1,28 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, UploadFile, File, Depends
 from fastapi.middleware.cors import CORSMiddleware
+import os
 from .database import SessionLocal
-from .models import Base
-from .database import engine
-from .routers import (
-    auth,
-    products_input,
-    products_output,
-    profile,
-    users,
-    client_types,
-    clients,
-    contact_person,
-    vendors,
-    products,
-    technicians_role,
-    technicians,
-    job,
-    job_assign,
-    job_report,
-    job_report_image,
-    company_info,
-    purchase_order,
-    purchase_order_product,
-    generate_references,
-    quotation_type,
-    quotation_product,
-    quotation,
-    quotation_service,
-    invoice,
-    invoice_job,
-    invoice_products,
-    invoice_technician,
-    invoice_type,
-    payment_method,
-    payment,
-    tools,
-    tools_output,
-    tools_return,
-    cash,
-    expense,
-    expense_task,
+from .utils.idempotency import IdempotencyMiddleware
+from .utils.storage import RequestSizeLimitMiddleware
+from .utils.startup import (
+    LazyRouterMiddleware,
+    import_report,
+    include_routers,
+    log_import_report,
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop the image resizing workers (imported here: PIL stays off startup)
+    from .utils.images import shutdown_pool
+
+    shutdown_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow your frontend origin
 origins = [
@@ -53,6 +32,13 @@ origins = [
     "https://almapps2.kais-consulting.com",
 ]
 
+# Retried POST /create calls carrying an Idempotency-Key replay the first response.
+# Added before CORS so CORS wraps it: replays and 409/422 get the CORS headers
+app.add_middleware(IdempotencyMiddleware)
+
+# Oversized bodies get a 413 before they are spooled (MAX_REQUEST_BYTES)
+app.add_middleware(RequestSizeLimitMiddleware)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -62,7 +48,7 @@ app.add_middleware(
     allow_headers=["*"],  # Accept, Content-Type, Authorization, etc.
 )
 
-Base.metadata.create_all(bind=engine)
+# Schema changes are applied by `python -m <package>.migrate`, never at startup
 
 
 def get_db():
@@ -78,43 +64,19 @@ def health_check():
     return {"status": "Healthy"}
 
 
+@app.get("/startup-report")
+def startup_report():
+    return {"total": round(sum(import_report.values()), 4), "modules": import_report}
+
+
 # UPLOAD_DIR = "uploads/reports/images"
 # os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-app.include_router(auth.router)
-app.include_router(generate_references.router)
-app.include_router(profile.router)
-app.include_router(users.router)
-app.include_router(client_types.router)
-app.include_router(clients.router)
-app.include_router(contact_person.router)
-app.include_router(vendors.router)
-app.include_router(products.router)
-app.include_router(products_input.router)
-app.include_router(products_output.router)
-app.include_router(technicians_role.router)
-app.include_router(technicians.router)
-app.include_router(job.router)
-app.include_router(job_assign.router)
-app.include_router(job_report.router)
-app.include_router(job_report_image.router)
-app.include_router(company_info.router)
-app.include_router(purchase_order.router)
-app.include_router(purchase_order_product.router)
-app.include_router(quotation_type.router)
-app.include_router(quotation.router)
-app.include_router(quotation_product.router)
-app.include_router(quotation_service.router)
-app.include_router(invoice_type.router)
-app.include_router(invoice.router)
-app.include_router(invoice_job.router)
-app.include_router(invoice_products.router)
-app.include_router(invoice_technician.router)
-app.include_router(payment_method.router)
-app.include_router(payment.router)
-app.include_router(tools.router)
-app.include_router(tools_output.router)
-app.include_router(tools_return.router)
-app.include_router(cash.router)
-app.include_router(expense.router)
-app.include_router(expense_task.router)
+# LAZY_ROUTERS=1 defers importing each router until its first request,
+# STARTUP_REPORT=1 logs how long each module took to import
+if os.getenv("LAZY_ROUTERS", "0") == "1":
+    app.add_middleware(LazyRouterMiddleware, fastapi_app=app)
+else:
+    include_routers(app)
+    if os.getenv("STARTUP_REPORT", "0") == "1":
+        log_import_report()
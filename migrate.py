@@ -0,0 +1,19 @@
+import sys
+from .migrations import run_migrations, pending_migrations
+from .utils.db_indexes import check_query_plans
+
+
+if __name__ == "__main__":
+    if "--status" in sys.argv:
+        for name in pending_migrations():
+            print(f"⏳ pending {name}")
+        sys.exit(0)
+
+    for name in run_migrations():
+        print(f"✅ applied {name}")
+
+    regressions = check_query_plans()
+    for name, plan in regressions.items():
+        print(f"❌ {name}: full table scan: {plan}")
+    if regressions:
+        sys.exit(1)
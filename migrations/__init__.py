@@ -0,0 +1,96 @@
+import importlib
+import pkgutil
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select
+from ..database import engine
+
+
+# Bookkeeping table: one row per applied migration
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(32), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def load_migrations():
+    """Migration modules of `versions/`, sorted by their numeric prefix."""
+    package = f"{__name__}.versions"
+    path = importlib.import_module(package).__path__
+    names = sorted(info.name for info in pkgutil.iter_modules(path))
+    return [(name, importlib.import_module(f"{package}.{name}")) for name in names]
+
+
+def applied_versions(connection):
+    schema_migrations.create(connection, checkfirst=True)
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(bind=engine):
+    """Apply every pending migration in order and return their names."""
+    applied = []
+    with bind.begin() as connection:
+        done = applied_versions(connection)
+
+    for name, module in load_migrations():
+        if name in done:
+            continue
+        with bind.begin() as connection:
+            module.upgrade(connection)
+            connection.execute(
+                schema_migrations.insert().values(
+                    version=name, applied_at=datetime.now(timezone.utc)
+                )
+            )
+        applied.append(name)
+    return applied
+
+
+def pending_migrations(bind=engine):
+    with bind.begin() as connection:
+        done = applied_versions(connection)
+    return [name for name, _ in load_migrations() if name not in done]
+
+
+# Helpers keeping migrations safe to run on databases created by create_all
+
+
+def add_column(connection, table_name: str, column: Column):
+    columns = {c["name"] for c in inspect(connection).get_columns(table_name)}
+    if column.name in columns:
+        return
+    column_type = column.type.compile(dialect=connection.dialect)
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}"
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg}"
+    if not column.nullable:
+        ddl += " NOT NULL"
+    connection.exec_driver_sql(ddl)
+
+
+def create_table(connection, table: Table):
+    table.create(connection, checkfirst=True)
+
+
+def create_indexes(connection, table_name: str, indexes: dict):
+    """Create the `{name: columns}` indexes missing on `table_name`."""
+    inspector = inspect(connection)
+    # MySQL creates an index for each foreign key on its own, under another
+    # name: an index over the same columns counts as already there
+    existing = {
+        tuple(index["column_names"]) for index in inspector.get_indexes(table_name)
+    }
+    existing.update(
+        tuple(constraint["column_names"])
+        for constraint in inspector.get_unique_constraints(table_name)
+    )
+    quote = connection.dialect.identifier_preparer.quote
+    for name, columns in indexes.items():
+        if tuple(columns) in existing:
+            continue
+        connection.exec_driver_sql(
+            f"CREATE INDEX {quote(name)} ON {quote(table_name)} "
+            f"({', '.join(quote(column) for column in columns)})"
+        )
+        existing.add(tuple(columns))
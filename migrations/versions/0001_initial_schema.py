@@ -0,0 +1,508 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+)
+
+
+# Tables as they stood when migrations replaced create_all at startup.
+# Databases created before that already have them and are left untouched.
+# Frozen copy of the schema at this revision: later changes to models.py must
+# not leak into it, they get their own migration.
+metadata = MetaData()
+
+profiles = Table(
+    "profiles",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String(255), nullable=False),
+    Column("email", String(255), nullable=False, unique=True),
+    Column("password", String(255), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("profile_id", Integer, ForeignKey("profiles.id")),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+clients_types = Table(
+    "clients_types",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("type", String(255), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+clients = Table(
+    "clients",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("address", String(255), nullable=False),
+    Column("email", String(255)),
+    Column("phone", String(255)),
+    Column("postal", String(255)),
+    Column("nui", String(255)),
+    Column("rc", String(255)),
+    Column("type_id", Integer, ForeignKey("clients_types.id")),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+client_contact_person = Table(
+    "client_contact_person",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("email", String(255), nullable=False),
+    Column("phone", String(255), nullable=False),
+    Column("client_id", Integer, ForeignKey("clients.id")),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+vendors = Table(
+    "vendors",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("email", String(255), nullable=False),
+    Column("phone", String(255), nullable=False),
+    Column("address", String(255), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+products = Table(
+    "products",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("description", String(255), nullable=False),
+    Column("unit", String(255)),
+    Column("stock_security_level", Float),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+products_inputs = Table(
+    "products_inputs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("product_id", Integer, ForeignKey("products.id")),
+    Column("vendor_id", Integer, ForeignKey("vendors.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("quantity", Float, nullable=False),
+    Column("price", Float, nullable=False),
+    Column("date_input", Date, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+products_outputs = Table(
+    "products_outputs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("product_id", Integer, ForeignKey("products.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("quantity", Float, nullable=False),
+    Column("price", Float),
+    Column("date_output", Date, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+technicians_roles = Table(
+    "technicians_roles",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("role", String(255), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+technicians = Table(
+    "technicians",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("email", String(255), nullable=False),
+    Column("phone", String(255), nullable=False),
+    Column("role_id", Integer, ForeignKey("technicians_roles.id")),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+tools = Table(
+    "tools",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("description", String(255), nullable=False),
+    Column("stock_level", Float),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+tools_outputs = Table(
+    "tools_outputs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("tool_id", Integer, ForeignKey("tools.id")),
+    Column("technician_id", Integer, ForeignKey("technicians.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("quantity", Float, nullable=False),
+    Column("date_output", Date, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+tools_returns = Table(
+    "tools_returns",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("tool_output_id", Integer, ForeignKey("tools_outputs.id")),
+    Column("technician_id", Integer, ForeignKey("technicians.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("quantity", Float, nullable=False),
+    Column("date_return", Date, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+jobs = Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_name", String(255), nullable=False),
+    Column("job_description", String(1000)),
+    Column("duration", Float),
+    Column("price", Float),
+    Column("date_program", Date),
+    Column("status", Boolean),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+jobs_assigns = Table(
+    "jobs_assigns",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_id", Integer, ForeignKey("jobs.id")),
+    Column("technician_id", Integer, ForeignKey("technicians.id")),
+    Column("date_start", Date, nullable=False),
+    Column("date_end", Date, nullable=False),
+    Column("amount", Float),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+jobs_reports = Table(
+    "jobs_reports",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_id", Integer, ForeignKey("jobs.id")),
+    Column("technician_id", Integer, ForeignKey("technicians.id")),
+    Column("report_heading", String(255), nullable=False),
+    Column("report_description", String(2000), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+jobs_reports_images = Table(
+    "jobs_reports_images",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_report_id", Integer, ForeignKey("jobs_reports.id")),
+    Column("file_path", String(255), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+company_details = Table(
+    "company_details",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("address", String(255), nullable=False),
+    Column("po_box", String(255)),
+    Column("bank_name", String(255)),
+    Column("bank_iban", String(255)),
+    Column("bank_swift_code", String(255)),
+    Column("phone", String(255)),
+    Column("email", String(255)),
+    Column("rc", String(255)),
+    Column("nui", String(255)),
+    Column("contact_name", String(255)),
+    Column("contact_phone1", String(255)),
+    Column("contact_phone2", String(255)),
+    Column("contact_email1", String(255)),
+    Column("contact_email2", String(255)),
+    Column("status", Boolean),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+purchase_orders = Table(
+    "purchase_orders",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("reference", String(15), nullable=False),
+    Column("vendor_id", Integer, ForeignKey("vendors.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("company_id", Integer, ForeignKey("company_details.id")),
+    Column("date_op", Date, nullable=False),
+    Column("amount", Float),
+    Column("tva_status", Boolean),
+    Column("discount_status", Boolean),
+    Column("discount_percent", Float),
+    Column("shipping_status", Boolean),
+    Column("shipping_amount", Float),
+    Column("shipping_terms", String(255)),
+    Column("shipping_method", String(255)),
+    Column("shipping_date", Date),
+    Column("status", Boolean),
+    Column("currency_used", String(20)),
+    Column("locale_currency", String(20)),
+    Column("on_delete", Boolean),
+    Column("reason_delete", String(255)),
+    Column("user_id_del", Integer),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+purchase_order_products = Table(
+    "purchase_order_products",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("product_id", Integer, ForeignKey("products.id")),
+    Column("po_id", Integer, ForeignKey("purchase_orders.id")),
+    Column("unit_price", Float),
+    Column("quantity", Float),
+    Column("status", Boolean),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+quotations_types = Table(
+    "quotations_types",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("type", String(200), nullable=False),
+)
+
+quotations = Table(
+    "quotations",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("reference", String(15), nullable=False),
+    Column("client_id", Integer, ForeignKey("clients.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("type_id", Integer, ForeignKey("quotations_types.id")),
+    Column("company_id", Integer, ForeignKey("company_details.id")),
+    Column("date_op", Date, nullable=False),
+    Column("amount", Float),
+    Column("tva_status", Boolean),
+    Column("discount_status", Boolean),
+    Column("discount_percent", Float),
+    Column("delivery_status", Boolean),
+    Column("delivery_amount", Float),
+    Column("status", Boolean),
+    Column("currency_used", String(20)),
+    Column("locale_currency", String(20)),
+    Column("on_delete", Boolean),
+    Column("reason_delete", String(255)),
+    Column("user_id_del", Integer),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+quotations_products = Table(
+    "quotations_products",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("product_id", Integer, ForeignKey("products.id")),
+    Column("quotation_id", Integer, ForeignKey("quotations.id")),
+    Column("market_price", Float),
+    Column("unit_price", Float),
+    Column("quantity", Float),
+    Column("status", Boolean),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+quotations_service = Table(
+    "quotations_Service",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("service", String(255), nullable=False),
+    Column("quotation_id", Integer, ForeignKey("quotations.id")),
+    Column("unit_price", Float),
+    Column("quantity", Float),
+    Column("status", Boolean),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+invoice_types = Table(
+    "invoice_types",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("type", String(200), nullable=False),
+)
+
+invoices = Table(
+    "invoices",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("reference", String(15), nullable=False),
+    Column("client_id", Integer, ForeignKey("clients.id")),
+    Column("purchase_order_id", Integer, ForeignKey("purchase_orders.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("type_id", Integer, ForeignKey("invoice_types.id")),
+    Column("company_id", Integer, ForeignKey("company_details.id")),
+    Column("date_op", Date, nullable=False),
+    Column("amount", Float),
+    Column("tva_status", Boolean),
+    Column("status", Boolean),
+    Column("has_heading", Boolean),
+    Column("has_po", Boolean),
+    Column("heading", String(255)),
+    Column("currency_used", String(20)),
+    Column("locale_currency", String(20)),
+    Column("on_delete", Boolean),
+    Column("reason_delete", String(255)),
+    Column("user_id_del", Integer),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+invoice_jobs = Table(
+    "invoice_jobs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_id", Integer, ForeignKey("jobs.id")),
+    Column("invoice_id", Integer, ForeignKey("invoices.id")),
+)
+
+invoice_products = Table(
+    "invoice_products",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("product_id", Integer, ForeignKey("products.id")),
+    Column("invoice_id", Integer, ForeignKey("invoices.id")),
+    Column("unit_price", Float),
+    Column("quantity", Float),
+)
+
+invoice_technicians = Table(
+    "invoice_technicians",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("technician_id", Integer, ForeignKey("technicians.id")),
+    Column("invoice_id", Integer, ForeignKey("invoices.id")),
+    Column("normal_hour1", Integer),
+    Column("normal_hour2", Integer),
+    Column("normal_unit_price", Float),
+    Column("overtime_hour1", Integer),
+    Column("overtime_hour2", Integer),
+    Column("overtime_unit_price", Float),
+    Column("allowance_hour1", Integer),
+    Column("allowance_hour2", Integer),
+    Column("allowance_unit_price", Float),
+)
+
+payment_methods = Table(
+    "payment_methods",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("method", String(100), nullable=False),
+)
+
+payments = Table(
+    "payments",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("reference", String(15), nullable=False),
+    Column("invoice_id", Integer, ForeignKey("invoices.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("company_id", Integer, ForeignKey("company_details.id")),
+    Column("date_op", Date, nullable=False),
+    Column("method_id", Integer, ForeignKey("payment_methods.id")),
+    Column("amount", Float),
+    Column("file_path", String(255)),
+    Column("currency_used", String(20)),
+    Column("locale_currency", String(20)),
+    Column("on_delete", Boolean),
+    Column("reason_delete", String(255)),
+    Column("user_id_del", Integer),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+cash_registers = Table(
+    "cash_registers",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("date", Date, unique=True),
+    Column("opening_balance", Float, nullable=False),
+    Column("closing_balance", Float),
+    Column("status", String(20)),
+)
+
+transactions = Table(
+    "transactions",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("type", String(10)),
+    Column("amount", Float, nullable=False),
+    Column("description", String(255)),
+    Column("date", Date),
+    Column("cash_id", Integer, ForeignKey("cash_registers.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+)
+
+expenses = Table(
+    "expenses",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("reference", String(15), nullable=False),
+    Column("date", Date),
+    Column("amount", Float, nullable=False),
+    Column("label", String(255), nullable=False),
+    Column("type_expense", String(20)),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("invoice_id", Integer, ForeignKey("invoices.id")),
+)
+
+expense_tasks = Table(
+    "expense_tasks",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("expense_id", Integer, ForeignKey("expenses.id")),
+    Column("technician_id", Integer, ForeignKey("technicians.id")),
+    Column("job_id", Integer, ForeignKey("jobs.id")),
+    Column("job_assign_id", Integer, ForeignKey("jobs_assigns.id")),
+    Column("task", String(255), nullable=False),
+    Column("amount", Float, nullable=False),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
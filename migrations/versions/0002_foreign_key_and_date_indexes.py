@@ -0,0 +1,94 @@
+from .. import create_indexes
+
+
+# Indexes on foreign keys, references and the date columns lists are filtered
+# and sorted on, as declared on the models at this revision
+INDEXES = {
+    "cash_registers": {
+        "ix_cash_registers_status": ("status",),
+    },
+    "client_contact_person": {
+        "ix_client_contact_person_client_id": ("client_id",),
+    },
+    "jobs_assigns": {
+        "ix_jobs_assigns_job_technician": ("job_id", "technician_id"),
+        "ix_jobs_assigns_technician_id": ("technician_id",),
+    },
+    "jobs_reports": {
+        "ix_jobs_reports_job_id": ("job_id",),
+    },
+    "purchase_orders": {
+        "ix_purchase_orders_company_id": ("company_id",),
+        "ix_purchase_orders_date_op": ("date_op",),
+        "ix_purchase_orders_reference": ("reference",),
+        "ix_purchase_orders_vendor_date": ("vendor_id", "date_op"),
+    },
+    "quotations": {
+        "ix_quotations_client_date": ("client_id", "date_op"),
+        "ix_quotations_company_id": ("company_id",),
+        "ix_quotations_date_op": ("date_op",),
+        "ix_quotations_reference": ("reference",),
+        "ix_quotations_type_id": ("type_id",),
+    },
+    "transactions": {
+        "ix_transactions_cash_date": ("cash_id", "date"),
+        "ix_transactions_date": ("date",),
+        "ix_transactions_user_id": ("user_id",),
+    },
+    "invoices": {
+        "ix_invoices_client_date": ("client_id", "date_op"),
+        "ix_invoices_company_id": ("company_id",),
+        "ix_invoices_date_op": ("date_op",),
+        "ix_invoices_purchase_order_id": ("purchase_order_id",),
+        "ix_invoices_reference": ("reference",),
+        "ix_invoices_type_id": ("type_id",),
+    },
+    "jobs_reports_images": {
+        "ix_jobs_reports_images_job_report_id": ("job_report_id",),
+    },
+    "purchase_order_products": {
+        "ix_purchase_order_products_po_id": ("po_id",),
+    },
+    "quotations_Service": {
+        "ix_quotations_Service_quotation_id": ("quotation_id",),
+    },
+    "quotations_products": {
+        "ix_quotations_products_quotation_id": ("quotation_id",),
+    },
+    "expenses": {
+        "ix_expenses_date": ("date",),
+        "ix_expenses_invoice_id": ("invoice_id",),
+        "ix_expenses_reference": ("reference",),
+        "ix_expenses_type_expense": ("type_expense",),
+        "ix_expenses_user_id": ("user_id",),
+    },
+    "invoice_jobs": {
+        "ix_invoice_jobs_invoice_id": ("invoice_id",),
+        "ix_invoice_jobs_job_id": ("job_id",),
+    },
+    "invoice_products": {
+        "ix_invoice_products_invoice_id": ("invoice_id",),
+    },
+    "invoice_technicians": {
+        "ix_invoice_technicians_invoice_id": ("invoice_id",),
+        "ix_invoice_technicians_technician_id": ("technician_id",),
+    },
+    "payments": {
+        "ix_payments_company_id": ("company_id",),
+        "ix_payments_date_op": ("date_op",),
+        "ix_payments_invoice_id": ("invoice_id",),
+        "ix_payments_method_id": ("method_id",),
+        "ix_payments_reference": ("reference",),
+    },
+    "expense_tasks": {
+        "ix_expense_tasks_expense_id": ("expense_id",),
+        "ix_expense_tasks_job_assign_id": ("job_assign_id",),
+        "ix_expense_tasks_job_id": ("job_id",),
+        "ix_expense_tasks_technician_id": ("technician_id",),
+    },
+}
+
+
+def upgrade(connection):
+    for table_name, indexes in INDEXES.items():
+        create_indexes(connection, table_name, indexes)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Float
+from .. import add_column, create_indexes
+
+
+def upgrade(connection):
+    for table in ("purchase_orders", "quotations"):
+        for name in ("subtotal", "discount_amount", "tva_amount"):
+            add_column(connection, table, Column(name, Float, server_default="0"))
+        # Totals are now sortable: index the stored grand total
+        create_indexes(connection, table, {f"ix_{table}_amount": ("amount",)})
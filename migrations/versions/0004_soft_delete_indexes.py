@@ -0,0 +1,14 @@
+from .. import create_indexes
+
+
+SOFT_DELETE_TABLES = ["purchase_orders", "quotations", "invoices", "payments"]
+
+
+# (on_delete, date_op) on invoices, quotations, purchase orders and payments.
+# MySQL has no partial indexes: live rows are reached through the
+# `on_delete = 0 OR on_delete IS NULL` prefix of these instead.
+def upgrade(connection):
+    for table in SOFT_DELETE_TABLES:
+        create_indexes(
+            connection, table, {f"ix_{table}_live_date": ("on_delete", "date_op")}
+        )
@@ -0,0 +1,34 @@
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Table,
+)
+from .. import create_table
+
+
+metadata = MetaData()
+
+# Referenced table, declared for the foreign key only: it already exists
+Table("cash_registers", metadata, Column("id", Integer, primary_key=True))
+
+cash_snapshots = Table(
+    "cash_snapshots",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("cash_id", Integer, ForeignKey("cash_registers.id"), unique=True),
+    Column("date", Date, nullable=False, unique=True),
+    Column("opening_balance", Float, nullable=False),
+    Column("total_in", Float, nullable=False),
+    Column("total_out", Float, nullable=False),
+    Column("closing_balance", Float, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+
+def upgrade(connection):
+    create_table(connection, cash_snapshots)
@@ -0,0 +1,29 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.dialects.mysql import LONGBLOB
+from .. import create_table
+
+
+metadata = MetaData()
+
+idempotency_keys = Table(
+    "idempotency_keys",
+    metadata,
+    Column("key_hash", String(64), primary_key=True),
+    Column("fingerprint", String(64)),
+    Column("status_code", Integer),
+    Column("content_type", String(100)),
+    Column("body", LargeBinary().with_variant(LONGBLOB, "mysql")),
+    Column("created_at", DateTime, nullable=False, index=True),
+)
+
+
+def upgrade(connection):
+    create_table(connection, idempotency_keys)
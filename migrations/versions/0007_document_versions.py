@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer
+from .. import add_column
+
+
+VERSIONED_TABLES = [
+    "purchase_orders",
+    "quotations",
+    "invoices",
+    "payments",
+    "expenses",
+    "transactions",
+]
+
+
+def upgrade(connection):
+    for table in VERSIONED_TABLES:
+        add_column(
+            connection,
+            table,
+            Column("version", Integer, nullable=False, server_default="1"),
+        )
@@ -0,0 +1,17 @@
+from .. import create_indexes
+
+
+# (technician_id, date_start, date_end) on jobs_assigns, for overlap checks
+# and technician availability
+def upgrade(connection):
+    create_indexes(
+        connection,
+        "jobs_assigns",
+        {
+            "ix_jobs_assigns_technician_period": (
+                "technician_id",
+                "date_start",
+                "date_end",
+            )
+        },
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, inspect
+from .. import add_column, create_indexes
+
+
+# quotations.invoice_id: the invoice a quotation was converted to, a second
+# conversion is refused
+def upgrade(connection):
+    add_column(connection, "quotations", Column("invoice_id", Integer))
+    create_indexes(
+        connection, "quotations", {"ix_quotations_invoice_id": ("invoice_id",)}
+    )
+    if connection.dialect.name != "mysql":
+        return
+    foreign_keys = inspect(connection).get_foreign_keys("quotations")
+    if not any(fk["constrained_columns"] == ["invoice_id"] for fk in foreign_keys):
+        connection.exec_driver_sql(
+            "ALTER TABLE quotations ADD CONSTRAINT fk_quotations_invoice_id "
+            "FOREIGN KEY (invoice_id) REFERENCES invoices (id)"
+        )
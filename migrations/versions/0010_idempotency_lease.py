@@ -0,0 +1,8 @@
+from sqlalchemy import Column, DateTime
+from .. import add_column
+
+
+# idempotency_keys.locked_until: lease of the in-flight request, a retry takes
+# over the key of a request whose worker died once it lapses
+def upgrade(connection):
+    add_column(connection, "idempotency_keys", Column("locked_until", DateTime))
@@ -0,0 +1,8 @@
+from sqlalchemy import Column, Text
+from .. import add_column
+
+
+# idempotency_keys.headers: ETag, Location, ... of the stored response, sent
+# again with the replayed body
+def upgrade(connection):
+    add_column(connection, "idempotency_keys", Column("headers", Text))
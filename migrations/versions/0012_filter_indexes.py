@@ -0,0 +1,17 @@
+from .. import create_indexes
+
+
+# Indexes behind the list filters still missing one: `?status=` on invoices,
+# quotations and purchase orders ("unpaid this quarter" reads one range) and
+# `?type=` on cash transactions
+FILTER_INDEXES = {
+    "invoices": {"ix_invoices_status_date": ("status", "date_op")},
+    "quotations": {"ix_quotations_status_date": ("status", "date_op")},
+    "purchase_orders": {"ix_purchase_orders_status_date": ("status", "date_op")},
+    "transactions": {"ix_transactions_type_date": ("type", "date")},
+}
+
+
+def upgrade(connection):
+    for table, indexes in FILTER_INDEXES.items():
+        create_indexes(connection, table, indexes)
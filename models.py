@@ -1,7 +1,11 @@
 from .database import Base
+from .utils.soft_delete import SoftDeleteMixin
+from .utils.versioning import VersionedMixin
 import datetime
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
+from sqlalchemy import select, func
+from sqlalchemy.dialects.mysql import LONGBLOB
 from datetime import date
 from sqlalchemy import (
     Column,
@@ -12,6 +16,9 @@ from sqlalchemy import (
     Boolean,
     Date,
     Float,
+    Index,
+    LargeBinary,
+    Text,
 )
 
 
@@ -109,7 +116,7 @@ class ContactPerson(Base):
     name = Column(String(255), nullable=False)
     email = Column(String(255), nullable=False)
     phone = Column(String(255), nullable=False)
-    client_id = Column(Integer, ForeignKey("clients.id"))
+    client_id = Column(Integer, ForeignKey("clients.id"), index=True)
     created_at = Column(
         DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc)
     )
@@ -318,10 +325,19 @@ class Job(Base):
 
 class JobAssign(Base):
     __tablename__ = "jobs_assigns"
+    __table_args__ = (
+        Index("ix_jobs_assigns_job_technician", "job_id", "technician_id"),
+        Index(
+            "ix_jobs_assigns_technician_period",
+            "technician_id",
+            "date_start",
+            "date_end",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id"))
-    technician_id = Column(Integer, ForeignKey("technicians.id"))
+    technician_id = Column(Integer, ForeignKey("technicians.id"), index=True)
     date_start = Column(Date, nullable=False)
     date_end = Column(Date, nullable=False)
     amount = Column(Float, nullable=True, default=0.0)
@@ -341,7 +357,7 @@ class JobReport(Base):
     __tablename__ = "jobs_reports"
 
     id = Column(Integer, primary_key=True, index=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"))
+    job_id = Column(Integer, ForeignKey("jobs.id"), index=True)
     technician_id = Column(Integer, ForeignKey("technicians.id"))
     report_heading = Column(String(255), nullable=False)
     report_description = Column(String(2000), nullable=False)
@@ -352,12 +368,14 @@ class JobReport(Base):
         DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc)
     )
 
+    images = relationship("JobReportImage", back_populates="job_report")
+
 
 class JobReportImage(Base):
     __tablename__ = "jobs_reports_images"
 
     id = Column(Integer, primary_key=True, index=True)
-    job_report_id = Column(Integer, ForeignKey("jobs_reports.id"))
+    job_report_id = Column(Integer, ForeignKey("jobs_reports.id"), index=True)
     file_path = Column(String(255), nullable=False)
     created_at = Column(
         DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc)
@@ -366,6 +384,8 @@ class JobReportImage(Base):
         DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc)
     )
 
+    job_report = relationship("JobReport", back_populates="images")
+
 
 class CompanyDetail(Base):
     __tablename__ = "company_details"
@@ -400,16 +420,24 @@ class CompanyDetail(Base):
     payments = relationship("Payment", back_populates="company")
 
 
-class PurchaseOrder(Base):
+class PurchaseOrder(SoftDeleteMixin, VersionedMixin, Base):
     __tablename__ = "purchase_orders"
+    __table_args__ = (
+        Index("ix_purchase_orders_vendor_date", "vendor_id", "date_op"),
+        Index("ix_purchase_orders_live_date", "on_delete", "date_op"),
+        Index("ix_purchase_orders_status_date", "status", "date_op"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    reference = Column(String(15), nullable=False)
+    reference = Column(String(15), nullable=False, index=True)
     vendor_id = Column(Integer, ForeignKey("vendors.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
-    company_id = Column(Integer, ForeignKey("company_details.id"))
-    date_op = Column(Date, nullable=False)
-    amount = Column(Float, nullable=True, default=0.0)
+    company_id = Column(Integer, ForeignKey("company_details.id"), index=True)
+    date_op = Column(Date, nullable=False, index=True)
+    amount = Column(Float, nullable=True, default=0.0, index=True)  # grand total
+    subtotal = Column(Float, nullable=True, default=0.0, server_default="0")
+    discount_amount = Column(Float, nullable=True, default=0.0, server_default="0")
+    tva_amount = Column(Float, nullable=True, default=0.0, server_default="0")
     tva_status = Column(Boolean, default=False)
     discount_status = Column(Boolean, default=False)
     discount_percent = Column(Float, default=0.0)
@@ -421,8 +449,6 @@ class PurchaseOrder(Base):
     status = Column(Boolean, nullable=True)
     currency_used = Column(String(20), nullable=True)
     locale_currency = Column(String(20), nullable=True)
-    on_delete = Column(Boolean, nullable=True)
-    reason_delete = Column(String(255), nullable=True)
     user_id_del = Column(Integer, default=0, nullable=True)
     created_at = Column(
         DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc)
@@ -443,7 +469,20 @@ class PurchaseOrder(Base):
     @hybrid_property
     def computed_amount(self):
         """Dynamically compute the total from items (not stored in DB)."""
-        return sum(item.total_amount for item in self.products)
+        return sum(
+            item.total_amount for item in self.products if item.status is not False
+        )
+
+    @computed_amount.expression
+    def computed_amount(cls):
+        return (
+            select(func.coalesce(func.sum(PurchaseOrderProduct.total_amount), 0.0))
+            .where(
+                PurchaseOrderProduct.po_id == cls.id,
+                PurchaseOrderProduct.status.isnot(False),
+            )
+            .scalar_subquery()
+        )
 
 
 class PurchaseOrderProduct(Base):
@@ -451,7 +490,7 @@ class PurchaseOrderProduct(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"))
-    po_id = Column(Integer, ForeignKey("purchase_orders.id"))
+    po_id = Column(Integer, ForeignKey("purchase_orders.id"), index=True)
     unit_price = Column(Float, default=0.0)
     quantity = Column(Float, default=0.0)
     status = Column(Boolean, nullable=True, default=True)
@@ -479,17 +518,25 @@ class QuotationType(Base):
     quotations = relationship("Quotation", back_populates="type")
 
 
-class Quotation(Base):
+class Quotation(SoftDeleteMixin, VersionedMixin, Base):
     __tablename__ = "quotations"
+    __table_args__ = (
+        Index("ix_quotations_client_date", "client_id", "date_op"),
+        Index("ix_quotations_live_date", "on_delete", "date_op"),
+        Index("ix_quotations_status_date", "status", "date_op"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    reference = Column(String(15), nullable=False)
+    reference = Column(String(15), nullable=False, index=True)
     client_id = Column(Integer, ForeignKey("clients.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
-    type_id = Column(Integer, ForeignKey("quotations_types.id"))
-    company_id = Column(Integer, ForeignKey("company_details.id"))
-    date_op = Column(Date, nullable=False)
-    amount = Column(Float, nullable=True, default=0.0)
+    type_id = Column(Integer, ForeignKey("quotations_types.id"), index=True)
+    company_id = Column(Integer, ForeignKey("company_details.id"), index=True)
+    date_op = Column(Date, nullable=False, index=True)
+    amount = Column(Float, nullable=True, default=0.0, index=True)  # grand total
+    subtotal = Column(Float, nullable=True, default=0.0, server_default="0")
+    discount_amount = Column(Float, nullable=True, default=0.0, server_default="0")
+    tva_amount = Column(Float, nullable=True, default=0.0, server_default="0")
     tva_status = Column(Boolean, default=False)
     discount_status = Column(Boolean, default=False)
     discount_percent = Column(Float, default=0.0)
@@ -498,9 +545,9 @@ class Quotation(Base):
     status = Column(Boolean, nullable=True)
     currency_used = Column(String(20), nullable=True)
     locale_currency = Column(String(20), nullable=True)
-    on_delete = Column(Boolean, nullable=True)
-    reason_delete = Column(String(255), nullable=True)
     user_id_del = Column(Integer, default=0, nullable=True)
+    # Invoice the quotation was converted to
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=True, index=True)
     created_at = Column(
         DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc)
     )
@@ -523,13 +570,39 @@ class Quotation(Base):
         cascade="all, delete-orphan",
     )
 
+    @hybrid_property
+    def computed_amount(self):
+        """Total of the product and service lines (not stored in DB)."""
+        lines = [*self.products, *self.services]
+        return sum(item.total_amount for item in lines if item.status is not False)
+
+    @computed_amount.expression
+    def computed_amount(cls):
+        products = (
+            select(func.coalesce(func.sum(QuotationProduct.total_amount), 0.0))
+            .where(
+                QuotationProduct.quotation_id == cls.id,
+                QuotationProduct.status.isnot(False),
+            )
+            .scalar_subquery()
+        )
+        services = (
+            select(func.coalesce(func.sum(QuotationService.total_amount), 0.0))
+            .where(
+                QuotationService.quotation_id == cls.id,
+                QuotationService.status.isnot(False),
+            )
+            .scalar_subquery()
+        )
+        return products + services
+
 
 class QuotationProduct(Base):
     __tablename__ = "quotations_products"
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"))
-    quotation_id = Column(Integer, ForeignKey("quotations.id"))
+    quotation_id = Column(Integer, ForeignKey("quotations.id"), index=True)
     market_price = Column(Float, default=0.0)
     unit_price = Column(Float, default=0.0)
     quantity = Column(Float, default=0.0)
@@ -558,7 +631,7 @@ class QuotationService(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     service = Column(String(255), nullable=False)
-    quotation_id = Column(Integer, ForeignKey("quotations.id"))
+    quotation_id = Column(Integer, ForeignKey("quotations.id"), index=True)
     unit_price = Column(Float, default=0.0)
     quantity = Column(Float, default=0.0)
     status = Column(Boolean, nullable=True, default=True)
@@ -585,17 +658,24 @@ class InvoiceType(Base):
     invoices = relationship("Invoice", back_populates="type")
 
 
-class Invoice(Base):
+class Invoice(SoftDeleteMixin, VersionedMixin, Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        Index("ix_invoices_client_date", "client_id", "date_op"),
+        Index("ix_invoices_live_date", "on_delete", "date_op"),
+        Index("ix_invoices_status_date", "status", "date_op"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    reference = Column(String(15), nullable=False)
+    reference = Column(String(15), nullable=False, index=True)
     client_id = Column(Integer, ForeignKey("clients.id"))
-    purchase_order_id = Column(Integer, ForeignKey("purchase_orders.id"), nullable=True)
+    purchase_order_id = Column(
+        Integer, ForeignKey("purchase_orders.id"), nullable=True, index=True
+    )
     user_id = Column(Integer, ForeignKey("users.id"))
-    type_id = Column(Integer, ForeignKey("invoice_types.id"))
-    company_id = Column(Integer, ForeignKey("company_details.id"))
-    date_op = Column(Date, nullable=False)
+    type_id = Column(Integer, ForeignKey("invoice_types.id"), index=True)
+    company_id = Column(Integer, ForeignKey("company_details.id"), index=True)
+    date_op = Column(Date, nullable=False, index=True)
     amount = Column(Float, nullable=True, default=0.0)
     tva_status = Column(Boolean, default=False)
     status = Column(Boolean, nullable=True)
@@ -604,8 +684,6 @@ class Invoice(Base):
     heading = Column(String(255), nullable=True)
     currency_used = Column(String(20), nullable=True)
     locale_currency = Column(String(20), nullable=True)
-    on_delete = Column(Boolean, nullable=True)
-    reason_delete = Column(String(255), nullable=True)
     user_id_del = Column(Integer, default=0, nullable=True)
     created_at = Column(
         DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc)
@@ -646,8 +724,8 @@ class InvoiceJob(Base):
     __tablename__ = "invoice_jobs"
 
     id = Column(Integer, primary_key=True, index=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"))
-    invoice_id = Column(Integer, ForeignKey("invoices.id"))
+    job_id = Column(Integer, ForeignKey("jobs.id"), index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), index=True)
 
     invoice = relationship("Invoice", back_populates="jobs")
     job = relationship("Job", back_populates="invoice_jobs")
@@ -658,7 +736,7 @@ class InvoiceProduct(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"))
-    invoice_id = Column(Integer, ForeignKey("invoices.id"))
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), index=True)
     unit_price = Column(Float, default=0.0)
     quantity = Column(Float, default=0.0)
 
@@ -670,8 +748,8 @@ class InvoiceTechnician(Base):
     __tablename__ = "invoice_technicians"
 
     id = Column(Integer, primary_key=True, index=True)
-    technician_id = Column(Integer, ForeignKey("technicians.id"))
-    invoice_id = Column(Integer, ForeignKey("invoices.id"))
+    technician_id = Column(Integer, ForeignKey("technicians.id"), index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), index=True)
     normal_hour1 = Column(Integer, default=0)
     normal_hour2 = Column(Integer, default=0)
     normal_unit_price = Column(Float, default=0.0)
@@ -695,22 +773,21 @@ class PaymentMethod(Base):
     payments = relationship("Payment", back_populates="method")
 
 
-class Payment(Base):
+class Payment(SoftDeleteMixin, VersionedMixin, Base):
     __tablename__ = "payments"
+    __table_args__ = (Index("ix_payments_live_date", "on_delete", "date_op"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    reference = Column(String(15), nullable=False)
-    invoice_id = Column(Integer, ForeignKey("invoices.id"))
+    reference = Column(String(15), nullable=False, index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    company_id = Column(Integer, ForeignKey("company_details.id"))
-    date_op = Column(Date, nullable=False)
-    method_id = Column(Integer, ForeignKey("payment_methods.id"))
+    company_id = Column(Integer, ForeignKey("company_details.id"), index=True)
+    date_op = Column(Date, nullable=False, index=True)
+    method_id = Column(Integer, ForeignKey("payment_methods.id"), index=True)
     amount = Column(Float, default=0.0)
     file_path = Column(String(255), nullable=True)
     currency_used = Column(String(20), nullable=True)
     locale_currency = Column(String(20), nullable=True)
-    on_delete = Column(Boolean, nullable=True)
-    reason_delete = Column(String(255), nullable=True)
     user_id_del = Column(Integer, default=0, nullable=True)
     created_at = Column(
         DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc)
@@ -731,35 +808,59 @@ class CashRegister(Base):
     date = Column(Date, default=date.today, unique=True)
     opening_balance = Column(Float, nullable=False)
     closing_balance = Column(Float)
-    status = Column(String(20), default="open")  # open / closed
+    status = Column(String(20), default="open", index=True)  # open / closed
 
     transactions = relationship("Transaction", back_populates="cash")
+    snapshot = relationship("CashSnapshot", back_populates="cash", uselist=False)
 
 
-class Transaction(Base):
+class Transaction(VersionedMixin, Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_cash_date", "cash_id", "date"),
+        Index("ix_transactions_type_date", "type", "date"),
+    )
     id = Column(Integer, primary_key=True)
     type = Column(String(10))  # 'in' or 'out'
     amount = Column(Float, nullable=False)
     description = Column(String(255))
-    date = Column(Date, default=date.today)
+    date = Column(Date, default=date.today, index=True)
     cash_id = Column(Integer, ForeignKey("cash_registers.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
 
     cash = relationship("CashRegister", back_populates="transactions")
     user = relationship("User", back_populates="transactions")
 
 
-class Expense(Base):
+# Totals of a register frozen when it is closed
+class CashSnapshot(Base):
+    __tablename__ = "cash_snapshots"
+    id = Column(Integer, primary_key=True)
+    cash_id = Column(Integer, ForeignKey("cash_registers.id"), unique=True)
+    date = Column(Date, nullable=False, unique=True)
+    opening_balance = Column(Float, nullable=False)
+    total_in = Column(Float, nullable=False, default=0.0)
+    total_out = Column(Float, nullable=False, default=0.0)
+    closing_balance = Column(Float, nullable=False)
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+    )
+
+    cash = relationship("CashRegister", back_populates="snapshot")
+
+
+class Expense(VersionedMixin, Base):
     __tablename__ = "expenses"
     id = Column(Integer, primary_key=True, index=True)
-    reference = Column(String(15), nullable=False)
-    date = Column(Date, default=date.today)
+    reference = Column(String(15), nullable=False, index=True)
+    date = Column(Date, default=date.today, index=True)
     amount = Column(Float, nullable=False)
     label = Column(String(255), nullable=False)
-    type_expense = Column(String(20))
-    user_id = Column(Integer, ForeignKey("users.id"))
-    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=True)
+    type_expense = Column(String(20), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=True, index=True)
 
     invoice = relationship("Invoice", back_populates="expense")
     tasks = relationship("ExpenseTask", back_populates="expense")
@@ -769,10 +870,14 @@ class Expense(Base):
 class ExpenseTask(Base):
     __tablename__ = "expense_tasks"
     id = Column(Integer, primary_key=True, index=True)
-    expense_id = Column(Integer, ForeignKey("expenses.id"))
-    technician_id = Column(Integer, ForeignKey("technicians.id"), nullable=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
-    job_assign_id = Column(Integer, ForeignKey("jobs_assigns.id"), nullable=True)
+    expense_id = Column(Integer, ForeignKey("expenses.id"), index=True)
+    technician_id = Column(
+        Integer, ForeignKey("technicians.id"), nullable=True, index=True
+    )
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True, index=True)
+    job_assign_id = Column(
+        Integer, ForeignKey("jobs_assigns.id"), nullable=True, index=True
+    )
     task = Column(String(255), nullable=False)
     amount = Column(Float, nullable=False)
 
@@ -780,3 +885,21 @@ class ExpenseTask(Base):
     technician = relationship("Technician", back_populates="task")
     job = relationship("Job", back_populates="tasks_job")
     job_assign = relationship("JobAssign", back_populates="tasks_job_assign")
+
+
+# Responses of POST /create calls made with an Idempotency-Key header
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    # sha256 of method, path and the client's key
+    key_hash = Column(String(64), primary_key=True)
+    # sha256 of the request body, a reused key with another body is rejected
+    fingerprint = Column(String(64), nullable=True)
+    # NULL while the first request is still being processed
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    # JSON [name, value] pairs of the stored response headers worth replaying
+    headers = Column(Text, nullable=True)
+    body = Column(LargeBinary().with_variant(LONGBLOB, "mysql"), nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+    # Lease of the in-flight request, NULL once its response is stored
+    locked_until = Column(DateTime, nullable=True)
@@ -1,13 +1,31 @@
 # app/routers/cash.py
-from pathlib import Path
-from typing import Annotated, List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Annotated, List, Optional
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Header,
+    Path,
+    Request,
+    Response,
+    Query,
+)
+from sqlalchemy import select, func, case
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session
 from starlette import status
-from ..models import CashRegister, Transaction
+from ..models import CashRegister, CashSnapshot, Transaction
 from ..database import SessionLocal
 from datetime import date
-from ..schemas import CashRegisterResponse, TransactionResponse, TransactionCreate
+from ..schemas import (
+    CashRegisterResponse,
+    CashJournalResponse,
+    CashSnapshotResponse,
+    TransactionResponse,
+    TransactionCreate,
+)
+from ..utils.query_filters import apply_filters
+from ..utils.versioning import conditional_update, etag, load_updated
 
 router = APIRouter(prefix="/cash", tags=["cash"])
 
@@ -22,6 +40,63 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+# Transaction columns that can be used in ?field=, ?field__op= and ?order_by=
+TRANSACTION_FILTER_FIELDS = {
+    "id",
+    "cash_id",
+    "type",
+    "date",
+    "user_id",
+}
+
+
+def _close_register(db: Session, cash: CashRegister):
+    """Sum the register's movements in SQL, close it and snapshot its totals."""
+    total_in, total_out = db.execute(
+        select(
+            func.coalesce(
+                func.sum(case((Transaction.type == "in", Transaction.amount))), 0.0
+            ),
+            func.coalesce(
+                func.sum(case((Transaction.type == "out", Transaction.amount))), 0.0
+            ),
+        ).where(Transaction.cash_id == cash.id)
+    ).one()
+    cash.closing_balance = cash.opening_balance + total_in - total_out
+    cash.status = "closed"
+    db.add(
+        CashSnapshot(
+            cash_id=cash.id,
+            date=cash.date,
+            opening_balance=cash.opening_balance,
+            total_in=total_in,
+            total_out=total_out,
+            closing_balance=cash.closing_balance,
+        )
+    )
+
+
+def _ensure_register_open(db: Session, *cash_ids):
+    """
+    409 when a movement touches a closed register: its snapshot would no
+    longer match. The lock keeps the register from closing meanwhile.
+    """
+    ids = {cash_id for cash_id in cash_ids if cash_id is not None}
+    if not ids:
+        return
+    registers = (
+        db.query(CashRegister.id, CashRegister.status)
+        .filter(CashRegister.id.in_(ids))
+        .with_for_update()
+        .all()
+    )
+    for register in registers:
+        if register.status == "closed":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Cash register {register.id} is closed",
+            )
+
 
 @router.get("/", response_model=List[CashRegisterResponse])
 async def read_all(db: db_dependency):
@@ -41,53 +116,183 @@ async def read_opened_register(db: db_dependency):
     return db.query(CashRegister).filter(CashRegister.status == "open").first()
 
 
-@router.post("/open")
-def open_cash(opening_balance: float, db: db_dependency):
+def _lock_open_register(db: Session):
+    # SELECT ... FOR UPDATE: concurrent open/close calls queue up behind it
+    return (
+        db.query(CashRegister)
+        .filter(CashRegister.status == "open")
+        .order_by(CashRegister.date)
+        .with_for_update()
+        .first()
+    )
+
+
+def _register_for(db: Session, day: date):
+    return db.query(CashRegister).filter(CashRegister.date == day).first()
+
+
+# MySQL errors of a lost lock race: lock wait timeout, deadlock. Two opens
+# finding no open register both take a gap lock with SELECT ... FOR UPDATE,
+# then block each other's INSERT.
+LOCK_CONFLICTS = {1205, 1213}
+
+
+def _lock_conflict(exc: OperationalError) -> bool:
+    return bool(exc.orig and exc.orig.args) and exc.orig.args[0] in LOCK_CONFLICTS
+
+
+def _retry_later():
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="The cash register is being opened or closed, retry.",
+    )
+
+
+def _open_register(db: Session, opening_balance: float):
     today = date.today()
-    existing = db.query(CashRegister).filter(CashRegister.date == today).first()
-    if existing:
-        raise HTTPException(
-            status_code=400, detail="Caisse déjà ouverte pour aujourd'hui."
-        )
+    prev_opened = _lock_open_register(db)
+    if prev_opened and prev_opened.date == today:
+        return prev_opened
 
-    prev_opened = db.query(CashRegister).filter(CashRegister.status == "open").first()
+    existing = _register_for(db, today)
+    if existing:
+        return existing
 
     if prev_opened:
-        entries = sum(t.amount for t in prev_opened.transactions if t.type == "in")
-        exits = sum(t.amount for t in prev_opened.transactions if t.type == "out")
-        prev_opened.closing_balance = prev_opened.opening_balance + entries - exits
-        prev_opened.status = "closed"
-        db.commit()
-    prev = db.query(CashRegister).order_by(CashRegister.date.desc()).first()
-    opening_balance = prev.closing_balance if prev else opening_balance
+        _close_register(db, prev_opened)
+        opening_balance = prev_opened.closing_balance
+    else:
+        prev = db.query(CashRegister).order_by(CashRegister.date.desc()).first()
+        opening_balance = prev.closing_balance if prev else opening_balance
 
-    new_cash = CashRegister(opening_balance=opening_balance)
+    new_cash = CashRegister(date=today, opening_balance=opening_balance)
     db.add(new_cash)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request opened today's register first
+        db.rollback()
+        return _register_for(db, today)
     db.refresh(new_cash)
     return new_cash
 
 
+@router.post("/open")
+def open_cash(opening_balance: float, db: db_dependency):
+    """Open today's register, closing the previous one, in one transaction.
+
+    Opening twice returns the register already opened for today.
+    """
+    try:
+        return _open_register(db, opening_balance)
+    except OperationalError as exc:
+        db.rollback()
+        if not _lock_conflict(exc):
+            raise
+        raise _retry_later()
+
+
+def _close_open_register(db: Session):
+    cash = _lock_open_register(db)
+    if not cash:
+        last = db.query(CashRegister).order_by(CashRegister.date.desc()).first()
+        if not last:
+            raise HTTPException(
+                status_code=404, detail="Caisse non trouvée ou déjà fermée."
+            )
+        return {"closing_balance": last.closing_balance, "status": last.status}
+
+    _close_register(db, cash)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Closed concurrently: its snapshot already exists
+        db.rollback()
+        db.refresh(cash)
+    return {"closing_balance": cash.closing_balance, "status": cash.status}
+
+
 @router.post("/close")
 def close_cash(db: db_dependency):
-    cash = db.query(CashRegister).filter(CashRegister.status == "open").first()
+    """Close the open register; closing an already closed one returns its state."""
+    try:
+        return _close_open_register(db)
+    except OperationalError as exc:
+        db.rollback()
+        if not _lock_conflict(exc):
+            raise
+        raise _retry_later()
 
+
+@router.get("/journal/{cash_id}", response_model=CashJournalResponse)
+async def read_cash_journal(db: db_dependency, cash_id: int = Path(gt=0)):
+    cash = db.query(CashRegister).filter(CashRegister.id == cash_id).first()
     if not cash:
-        raise HTTPException(
-            status_code=404, detail="Caisse non trouvée ou déjà fermée."
+        raise HTTPException(status_code=404, detail="Data not found")
+
+    movement = case(
+        (Transaction.type == "in", Transaction.amount),
+        (Transaction.type == "out", -Transaction.amount),
+        else_=0.0,
+    )
+    running = func.sum(movement).over(
+        order_by=(Transaction.date, Transaction.id), rows=(None, 0)
+    )
+    query = (
+        select(
+            Transaction.id,
+            Transaction.type,
+            Transaction.amount,
+            Transaction.description,
+            Transaction.date,
+            Transaction.user_id,
+            (cash.opening_balance + running).label("balance"),
         )
+        .where(Transaction.cash_id == cash_id)
+        .order_by(Transaction.date, Transaction.id)
+    )
+    lines = db.execute(query).mappings().all()
+    return {
+        "cash_id": cash.id,
+        "date": cash.date,
+        "status": cash.status,
+        "opening_balance": cash.opening_balance,
+        "closing_balance": lines[-1]["balance"] if lines else cash.opening_balance,
+        "lines": lines,
+    }
+
+
+@router.get("/snapshots", response_model=List[CashSnapshotResponse])
+async def read_cash_snapshots(
+    db: db_dependency,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+):
+    query = db.query(CashSnapshot)
+    if date_from is not None:
+        query = query.filter(CashSnapshot.date >= date_from)
+    if date_to is not None:
+        query = query.filter(CashSnapshot.date <= date_to)
+    return query.order_by(CashSnapshot.date).all()
 
-    entries = sum(t.amount for t in cash.transactions if t.type == "in")
-    exits = sum(t.amount for t in cash.transactions if t.type == "out")
-    cash.closing_balance = cash.opening_balance + entries - exits
-    cash.status = "closed"
-    db.commit()
-    return {"closing_balance": cash.closing_balance, "status": "closed"}
+
+@router.get("/snapshots/{snapshot_date}", response_model=CashSnapshotResponse)
+async def read_cash_snapshot(db: db_dependency, snapshot_date: date):
+    query = db.query(CashSnapshot).filter(CashSnapshot.date == snapshot_date).first()
+    if not query:
+        raise HTTPException(status_code=404, detail="Data not found")
+    return query
 
 
 @router.get("/transactions", response_model=List[TransactionResponse])
-async def read_all(db: db_dependency):
-    return db.query(Transaction).all()
+async def read_all(db: db_dependency, request: Request):
+    query = apply_filters(
+        db.query(Transaction),
+        Transaction,
+        request.query_params,
+        TRANSACTION_FILTER_FIELDS,
+    )
+    return query.all()
 
 
 @router.get("/transactions/{cash_id}", response_model=List[TransactionResponse])
@@ -100,6 +305,7 @@ async def read_transactions_per_cash_register(
 
 @router.post("/transactions/create", status_code=status.HTTP_201_CREATED)
 async def create_transaction(db: db_dependency, db_request: TransactionCreate):
+    _ensure_register_open(db, db_request.cash_id)
     db_model = Transaction(**db_request.model_dump())
 
     db.add(db_model)
@@ -125,21 +331,20 @@ async def read_transactions_per_cash_register(
 async def update_transaction(
     db: db_dependency,
     db_request: TransactionCreate,
+    response: Response,
     transaction_id: int = Path(gt=0),
+    if_match: Optional[str] = Header(None),
 ):
-
-    request_model = (
-        db.query(Transaction).filter(Transaction.id == transaction_id).first()
-    )
-    if request_model is None:
-        raise HTTPException(status_code=404, detail="Data not found.")
-
     update_data = db_request.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(request_model, key, value)
-
+    current_cash_id = db.scalar(
+        select(Transaction.cash_id).where(Transaction.id == transaction_id)
+    )
+    _ensure_register_open(db, current_cash_id, update_data.get("cash_id"))
+    conditional_update(db, Transaction, transaction_id, update_data, if_match)
     db.commit()
-    db.refresh(request_model)
+
+    request_model = load_updated(db, Transaction, transaction_id)
+    response.headers["ETag"] = etag(request_model.version)
     return request_model
 
 
@@ -151,6 +356,7 @@ async def delete_transaction(db: db_dependency, transaction_id: int = Path(gt=0)
     db_model = db.query(Transaction).filter(Transaction.id == transaction_id).first()
     if not db_model:
         raise HTTPException(status_code=404, detail="Data not found")
+    _ensure_register_open(db, db_model.cash_id)
 
     db.delete(db_model)
     db.commit()
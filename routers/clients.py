@@ -1,11 +1,14 @@
 from typing import Annotated
+from sqlalchemy import select, func, literal, union_all
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from starlette import status
-from ..models import Client
+from datetime import date
+from ..models import Client, Invoice, Payment
 from ..database import SessionLocal
-from ..schemas import ClientResponse, ClientCreate
-from typing import List
+from ..schemas import ClientResponse, ClientCreate, ClientStatementResponse
+from ..utils.soft_delete import is_live
+from typing import List, Optional
 
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
@@ -35,6 +38,74 @@ async def read_client(db: db_dependency, client_id: int = Path(gt=0)):
     return db_client
 
 
+def _statement_entries(client_id: int):
+    invoices = select(
+        Invoice.date_op,
+        literal("invoice").label("kind"),
+        Invoice.id,
+        Invoice.reference,
+        func.coalesce(Invoice.amount, 0.0).label("debit"),
+        literal(0.0).label("credit"),
+    ).where(Invoice.client_id == client_id, is_live(Invoice))
+    payments = (
+        select(
+            Payment.date_op,
+            literal("payment").label("kind"),
+            Payment.id,
+            Payment.reference,
+            literal(0.0).label("debit"),
+            func.coalesce(Payment.amount, 0.0).label("credit"),
+        )
+        .join(Invoice, Payment.invoice_id == Invoice.id)
+        .where(Invoice.client_id == client_id, is_live(Invoice), is_live(Payment))
+    )
+    return union_all(invoices, payments).subquery("entries")
+
+
+@router.get("/{client_id}/statement", response_model=ClientStatementResponse)
+async def read_client_statement(
+    db: db_dependency,
+    client_id: int = Path(gt=0),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+):
+    if db.get(Client, client_id) is None:
+        raise HTTPException(status_code=404, detail="Data not found")
+
+    entries = _statement_entries(client_id)
+    movement = entries.c.debit - entries.c.credit
+
+    opening_balance = 0.0
+    if date_from is not None:
+        opening_balance = db.execute(
+            select(func.coalesce(func.sum(movement), 0.0)).where(
+                entries.c.date_op < date_from
+            )
+        ).scalar_one()
+
+    # Invoices before payments on the same day, then in creation order
+    running = func.sum(movement).over(
+        order_by=(entries.c.date_op, entries.c.kind, entries.c.id), rows=(None, 0)
+    )
+    query = select(entries, (running + opening_balance).label("balance")).order_by(
+        entries.c.date_op, entries.c.kind, entries.c.id
+    )
+    if date_from is not None:
+        query = query.where(entries.c.date_op >= date_from)
+    if date_to is not None:
+        query = query.where(entries.c.date_op <= date_to)
+
+    lines = db.execute(query).mappings().all()
+    return {
+        "client_id": client_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "opening_balance": opening_balance,
+        "closing_balance": lines[-1]["balance"] if lines else opening_balance,
+        "lines": lines,
+    }
+
+
 @router.post("/create", status_code=status.HTTP_201_CREATED)
 async def create_client(db: db_dependency, client_request: ClientCreate):
     client_model = Client(**client_request.model_dump())
@@ -1,6 +1,6 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
 from ..models import ContactPerson
@@ -23,80 +23,40 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+CONTACTS = select(
+    ContactPerson.id,
+    ContactPerson.name,
+    ContactPerson.email,
+    ContactPerson.phone,
+    ContactPerson.client_id,
+)
+
+
 @router.get("/", response_model=List[ContactPersonResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT * FROM client_contact_person;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "name": row.name,
-                "email": row.email,
-                "phone": row.phone,
-                "client_id": row.client_id,
-            }
-        )
-    return data
+    return db.execute(CONTACTS).mappings().all()
 
 
 @router.get("/{contact_id}", response_model=ContactPersonResponse)
 async def read_client_contact(db: db_dependency, contact_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM client_contact_person
-        WHERE id = :contact_id
-    """
-        ),
-        {"contact_id": contact_id},
-    ).fetchone()
-
+    result = (
+        db.execute(CONTACTS.where(ContactPerson.id == contact_id)).mappings().first()
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "name": result.name,
-        "email": result.email,
-        "phone": result.phone,
-        "client_id": result.client_id,
-    }
+    return result
 
 
 @router.get("/client/{client_id}", response_model=ContactPersonResponse)
 async def read_client_contact(db: db_dependency, client_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM client_contact_person
-        WHERE client_id = :client_id
-    """
-        ),
-        {"client_id": client_id},
-    ).fetchone()
-
+    result = (
+        db.execute(CONTACTS.where(ContactPerson.client_id == client_id))
+        .mappings()
+        .first()
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "name": result.name,
-        "email": result.email,
-        "phone": result.phone,
-        "client_id": result.client_id,
-    }
+    return result
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
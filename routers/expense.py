@@ -1,7 +1,7 @@
 # app/routers/cash.py
 from pathlib import Path
-from typing import Annotated, List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import extract
 from starlette import status
@@ -10,6 +10,8 @@ from ..database import SessionLocal
 from datetime import date
 from ..schemas import ExpenseResponse, ExpenseCreate, ExpenseUpdate
 from ..utils.generate_references import get_expense_reference
+from ..utils.query_filters import apply_filters
+from ..utils.versioning import conditional_update, etag, load_updated
 
 router = APIRouter(prefix="/expenses", tags=["Expenses"])
 
@@ -24,10 +26,23 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+# Columns that can be used in ?field=, ?field__op= and ?order_by=
+FILTER_FIELDS = {
+    "id",
+    "reference",
+    "date",
+    "type_expense",
+    "user_id",
+    "invoice_id",
+}
+
 
 @router.get("/", response_model=List[ExpenseResponse])
-async def read_all(db: db_dependency):
-    return db.query(Expense).all()
+async def read_all(db: db_dependency, request: Request):
+    query = apply_filters(
+        db.query(Expense), Expense, request.query_params, FILTER_FIELDS
+    )
+    return query.all()
 
 
 @router.get("/{expense_id}", response_model=ExpenseResponse)
@@ -60,19 +75,16 @@ async def create_expense(db: db_dependency, db_request: ExpenseCreate):
 async def update_expense(
     db: db_dependency,
     db_request: ExpenseUpdate,
+    response: Response,
     expense_id: int = Path(gt=0),
+    if_match: Optional[str] = Header(None),
 ):
-
-    request_model = db.query(Expense).filter(Expense.id == expense_id).first()
-    if request_model is None:
-        raise HTTPException(status_code=404, detail="Data not found.")
-
     update_data = db_request.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(request_model, key, value)
-
+    conditional_update(db, Expense, expense_id, update_data, if_match)
     db.commit()
-    db.refresh(request_model)
+
+    request_model = load_updated(db, Expense, expense_id)
+    response.headers["ETag"] = etag(request_model.version)
     return request_model
 
 
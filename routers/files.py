@@ -0,0 +1,65 @@
+import mimetypes
+import re
+from typing import Literal
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from ..utils.storage import UPLOAD_ROOT
+from ..utils.images import resolve_variant, variant_name
+
+
+router = APIRouter(prefix="/files", tags=["Files"])
+
+# `<sha256>.<ext>` and its `<sha256>.<size>.jpg` variants never change content
+HASHED_NAME = re.compile(r"^[0-9a-f]{64}(\.[a-z]+)?(\.[a-z0-9]+)?$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Served inline; anything else (SVG included, it can run scripts) is a download
+INLINE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+
+def _locate(file_path: str, size: str):
+    """
+    The stored file to send, None when there is none, and whether it is the
+    requested variant rather than the original standing in for it (runs in a
+    thread).
+    """
+    root = UPLOAD_ROOT.resolve()
+    served = resolve_variant(file_path, size)
+    target = (root / served).resolve()
+    # No way out of UPLOAD_ROOT, and no half-written `.part` files
+    if (
+        not target.is_relative_to(root)
+        or target.name.startswith(".")
+        or not target.is_file()
+    ):
+        return None, False
+    return target, served == variant_name(file_path, size)
+
+
+@router.get("/{file_path:path}")
+async def read_file(
+    file_path: str, size: Literal["thumb", "medium", "original"] = "original"
+):
+    """
+    Serve a stored upload (report images, payment attachments, ...).
+
+    Range requests, ETag and Last-Modified are handled by FileResponse.
+    """
+    target, exact = await run_in_threadpool(_locate, file_path, size)
+    if target is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # The original sent while the variant is being generated must not stick
+    # in caches under the variant's URL
+    immutable = exact and HASHED_NAME.match(target.name)
+    cache_control = IMMUTABLE if immutable else "no-cache"
+    headers = {"Cache-Control": cache_control, "X-Content-Type-Options": "nosniff"}
+    media_type = mimetypes.guess_type(target.name)[0]
+    if media_type in INLINE_TYPES:
+        return FileResponse(target, media_type=media_type, headers=headers)
+    return FileResponse(
+        target,
+        headers=headers,
+        filename=target.name,
+        content_disposition_type="attachment",
+    )
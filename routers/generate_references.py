@@ -29,6 +29,7 @@ def get_next_reference(db: db_dependency):
     # Récupérer la dernière commande de l'année courante
     last_order = (
         db.query(PurchaseOrder)
+        .execution_options(include_deleted=True)
         .filter(extract("year", PurchaseOrder.date_op) == current_year)
         .order_by(PurchaseOrder.id.desc())
         .first()
@@ -56,6 +57,7 @@ def get_next_reference_pro(db: db_dependency):
     # Récupérer la dernière commande de l'année courante
     last_order = (
         db.query(Quotation)
+        .execution_options(include_deleted=True)
         .filter(extract("year", Quotation.date_op) == current_year)
         .order_by(Quotation.id.desc())
         .first()
@@ -83,6 +85,7 @@ def get_next_reference_invoice(db: db_dependency):
     # Récupérer la dernière commande de l'année courante
     last_order = (
         db.query(Invoice)
+        .execution_options(include_deleted=True)
         .filter(extract("year", Invoice.date_op) == current_year)
         .order_by(Invoice.id.desc())
         .first()
@@ -110,6 +113,7 @@ def get_next_reference_payment(db: db_dependency):
     # Récupérer la dernière commande de l'année courante
     last_order = (
         db.query(Payment)
+        .execution_options(include_deleted=True)
         .filter(extract("year", Payment.date_op) == current_year)
         .order_by(Payment.id.desc())
         .first()
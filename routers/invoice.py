@@ -1,17 +1,26 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy import select, func, case, and_
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, Response
 from starlette import status
-from ..models import Invoice
+from ..models import Invoice, InvoiceProduct, InvoiceTechnician, InvoiceJob, Payment
 from ..database import SessionLocal
 from ..schemas import (
     InvoiceResponse,
     InvoiceCreate,
     InvoiceUpdate,
     InvoicePaymentResponse,
+    InvoiceDocumentCreate,
+    InvoiceDocumentUpdate,
+    InvoiceReceivableResponse,
 )
-from typing import List
+from typing import List, Optional
 from ..utils.generate_references import get_next_reference_invoice
+from ..utils.query_filters import apply_filters
+from ..utils.soft_delete import is_live
+from ..utils.versioning import conditional_update, etag, load_updated
+from ..utils.documents import save_document, insert_lines, replace_lines
 
 
 router = APIRouter(prefix="/invoices", tags=["Invoices"])
@@ -27,15 +36,108 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+INVOICE_LINES = {
+    "products": InvoiceProduct,
+    "technicians": InvoiceTechnician,
+    "jobs": InvoiceJob,
+}
+
+# Columns that can be used in ?field=, ?field__op= and ?order_by=
+FILTER_FIELDS = {
+    "id",
+    "reference",
+    "client_id",
+    "purchase_order_id",
+    "type_id",
+    "company_id",
+    "status",
+    "date_op",
+}
+
 
 @router.get("/", response_model=List[InvoicePaymentResponse])
-async def read_all(db: db_dependency):
-    return db.query(Invoice).all()
+async def read_all(db: db_dependency, request: Request, include_deleted: bool = False):
+    query = apply_filters(
+        db.query(Invoice).execution_options(include_deleted=include_deleted),
+        Invoice,
+        request.query_params,
+        FILTER_FIELDS,
+    )
+    return query.all()
+
+
+@router.get("/receivables", response_model=List[InvoiceReceivableResponse])
+async def read_receivables(
+    db: db_dependency,
+    client_id: Optional[int] = None,
+    as_of: Optional[date] = None,
+    outstanding_only: bool = True,
+):
+    as_of = as_of or date.today()
+    paid = func.coalesce(func.sum(Payment.amount), 0.0)
+    balance = func.coalesce(Invoice.amount, 0.0) - paid
+    # Age buckets from date_op, as date comparisons so date_op stays indexable
+    aging_bucket = case(
+        (Invoice.date_op >= as_of - timedelta(days=30), "0-30"),
+        (Invoice.date_op >= as_of - timedelta(days=60), "31-60"),
+        (Invoice.date_op >= as_of - timedelta(days=90), "61-90"),
+        else_="90+",
+    )
+
+    query = (
+        select(
+            Invoice.id,
+            Invoice.reference,
+            Invoice.client_id,
+            Invoice.date_op,
+            func.coalesce(Invoice.amount, 0.0).label("amount"),
+            paid.label("paid"),
+            balance.label("balance"),
+            aging_bucket.label("aging_bucket"),
+        )
+        .outerjoin(
+            Payment,
+            and_(
+                Payment.invoice_id == Invoice.id,
+                is_live(Payment),
+                # Later payments don't settle anything at as_of
+                Payment.date_op <= as_of,
+            ),
+        )
+        .where(
+            is_live(Invoice),
+            Invoice.date_op <= as_of,
+        )
+        .group_by(
+            Invoice.id,
+            Invoice.reference,
+            Invoice.client_id,
+            Invoice.date_op,
+            Invoice.amount,
+        )
+        .order_by(Invoice.date_op)
+    )
+    if client_id is not None:
+        query = query.where(Invoice.client_id == client_id)
+    if outstanding_only:
+        query = query.having(func.round(balance, 2) > 0)
+
+    return [
+        {**row, "age_days": (as_of - row["date_op"]).days}
+        for row in db.execute(query).mappings()
+    ]
 
 
 @router.get("/{invoice_id}", response_model=InvoicePaymentResponse)
-async def read_invoice(db: db_dependency, invoice_id: int = Path(gt=0)):
-    query = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+async def read_invoice(
+    db: db_dependency, invoice_id: int = Path(gt=0), include_deleted: bool = False
+):
+    query = (
+        db.query(Invoice)
+        .execution_options(include_deleted=include_deleted)
+        .filter(Invoice.id == invoice_id)
+        .first()
+    )
     if not query:
         raise HTTPException(status_code=404, detail="Data not found")
     return query
@@ -59,30 +161,72 @@ async def create_invoice(db: db_dependency, invoice_request: InvoiceCreate):
     return query
 
 
+@router.post("/create-full", status_code=status.HTTP_201_CREATED)
+async def create_invoice_document(
+    db: db_dependency, invoice_request: InvoiceDocumentCreate
+):
+    # Header, products, technicians and jobs are committed together or not at all
+    header = invoice_request.model_dump(exclude=set(INVOICE_LINES))
+    header["reference"] = get_next_reference_invoice(db)
+    query = save_document(db, Invoice, header)
+
+    for field, model in INVOICE_LINES.items():
+        insert_lines(db, model, "invoice_id", query.id, getattr(invoice_request, field))
+
+    db.commit()
+    db.refresh(query)
+    return query
+
+
+@router.put("/replace/{invoice_id}", status_code=status.HTTP_206_PARTIAL_CONTENT)
+async def replace_invoice_document(
+    db: db_dependency,
+    invoice_request: InvoiceDocumentUpdate,
+    response: Response,
+    invoice_id: int = Path(gt=0),
+    if_match: Optional[str] = Header(None),
+):
+    header = invoice_request.model_dump(exclude_unset=True, exclude=set(INVOICE_LINES))
+    conditional_update(db, Invoice, invoice_id, header, if_match)
+
+    # Line lists that are sent replace the stored ones, omitted ones are kept
+    for field, model in INVOICE_LINES.items():
+        lines = getattr(invoice_request, field)
+        if lines is not None:
+            replace_lines(db, model, "invoice_id", invoice_id, lines)
+
+    db.commit()
+    request_model = load_updated(db, Invoice, invoice_id)
+    response.headers["ETag"] = etag(request_model.version)
+    return request_model
+
+
 @router.put("/update/{invoice_id}", status_code=status.HTTP_206_PARTIAL_CONTENT)
 async def update_invoice(
     db: db_dependency,
     invoice_request: InvoiceUpdate,
+    response: Response,
     invoice_id: int = Path(gt=0),
+    if_match: Optional[str] = Header(None),
 ):
-
-    request_model = db.query(Invoice).filter(Invoice.id == invoice_id).first()
-    if request_model is None:
-        raise HTTPException(status_code=404, detail="Data not found.")
-
     update_data = invoice_request.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(request_model, key, value)
-
+    conditional_update(db, Invoice, invoice_id, update_data, if_match)
     db.commit()
-    db.refresh(request_model)
+
+    request_model = load_updated(db, Invoice, invoice_id)
+    response.headers["ETag"] = etag(request_model.version)
     return request_model
 
 
 @router.delete("/delete/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_invoice(db: db_dependency, invoice_id: int = Path(gt=0)):
 
-    db_model = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    db_model = (
+        db.query(Invoice)
+        .execution_options(include_deleted=True)
+        .filter(Invoice.id == invoice_id)
+        .first()
+    )
     if not db_model:
         raise HTTPException(status_code=404, detail="Data not found")
 
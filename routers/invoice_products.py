@@ -4,8 +4,14 @@ from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
 from ..models import InvoiceProduct
 from ..database import SessionLocal
-from ..schemas import InvoiceProductResponse, InvoiceProductCreate, InvoiceProductUpdate
+from ..schemas import (
+    InvoiceProductResponse,
+    InvoiceProductCreate,
+    InvoiceProductUpdate,
+    BulkCreateResponse,
+)
 from typing import List
+from ..utils.bulk import bulk_insert
 
 
 router = APIRouter(prefix="/invoices-products", tags=["Invoices Products"])
@@ -49,6 +55,21 @@ async def create_invoice_product(
     return request_model
 
 
+@router.post(
+    "/create-bulk",
+    response_model=BulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_invoice_products(
+    db: db_dependency, invoice_products_request: List[InvoiceProductCreate]
+):
+    ids = bulk_insert(
+        db, InvoiceProduct, [item.model_dump() for item in invoice_products_request]
+    )
+    db.commit()
+    return {"ids": ids}
+
+
 @router.put("/update/{invoice_pruduct_id}", status_code=status.HTTP_206_PARTIAL_CONTENT)
 async def update_invoice_product(
     db: db_dependency,
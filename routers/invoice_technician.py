@@ -8,8 +8,10 @@ from ..schemas import (
     InvoiceTechnicianResponse,
     InvoiceTechnicianCreate,
     InvoiceTechnicianUpdate,
+    BulkCreateResponse,
 )
 from typing import List
+from ..utils.bulk import bulk_insert
 
 
 router = APIRouter(prefix="/invoices-technicians", tags=["Invoices Technicians"])
@@ -57,6 +59,23 @@ async def create_invoice_technician(
     return request_model
 
 
+@router.post(
+    "/create-bulk",
+    response_model=BulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_invoice_technicians(
+    db: db_dependency, invoice_technicians_request: List[InvoiceTechnicianCreate]
+):
+    ids = bulk_insert(
+        db,
+        InvoiceTechnician,
+        [item.model_dump() for item in invoice_technicians_request],
+    )
+    db.commit()
+    return {"ids": ids}
+
+
 @router.put(
     "/update/{invoice_technician_id}", status_code=status.HTTP_206_PARTIAL_CONTENT
 )
@@ -1,12 +1,26 @@
 from typing import Annotated
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import text, select, func
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from starlette import status
-from ..models import Job
+from datetime import date
+from ..models import (
+    Job,
+    JobAssign,
+    JobReport,
+    ExpenseTask,
+    Invoice,
+    InvoiceJob,
+)
 from ..database import SessionLocal
-from ..schemas import JobResponse, JobCreate
-from typing import List
+from ..schemas import (
+    JobResponse,
+    JobCreate,
+    JobReportWithImagesResponse,
+    JobProfitabilityResponse,
+)
+from ..utils.soft_delete import is_live
+from typing import List, Optional
 
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
@@ -23,12 +37,104 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+def _profitability_query(job_ids):
+    """
+    Costs and invoiced amount of the jobs in `job_ids` (ids or a select),
+    each source summed in its own grouped subquery.
+    """
+    labour = (
+        select(
+            JobAssign.job_id,
+            func.sum(func.coalesce(JobAssign.amount, 0.0)).label("cost"),
+        )
+        .where(JobAssign.job_id.in_(job_ids))
+        .group_by(JobAssign.job_id)
+        .subquery()
+    )
+
+    # Expense tasks point at the job directly or through its assignment
+    expense_job_id = func.coalesce(ExpenseTask.job_id, JobAssign.job_id)
+    expenses = (
+        select(
+            expense_job_id.label("job_id"),
+            func.sum(func.coalesce(ExpenseTask.amount, 0.0)).label("cost"),
+        )
+        .outerjoin(JobAssign, ExpenseTask.job_assign_id == JobAssign.id)
+        .where(expense_job_id.in_(job_ids))
+        .group_by(expense_job_id)
+        .subquery()
+    )
+
+    # An invoice covering several jobs is split evenly between them
+    jobs_per_invoice = (
+        select(InvoiceJob.invoice_id, func.count().label("jobs"))
+        .group_by(InvoiceJob.invoice_id)
+        .subquery()
+    )
+    invoiced = (
+        select(
+            InvoiceJob.job_id,
+            func.sum(
+                func.coalesce(Invoice.amount, 0.0) / jobs_per_invoice.c.jobs
+            ).label("amount"),
+        )
+        .join(Invoice, InvoiceJob.invoice_id == Invoice.id)
+        .join(jobs_per_invoice, jobs_per_invoice.c.invoice_id == Invoice.id)
+        .where(InvoiceJob.job_id.in_(job_ids), is_live(Invoice))
+        .group_by(InvoiceJob.job_id)
+        .subquery()
+    )
+
+    labour_cost = func.coalesce(labour.c.cost, 0.0)
+    expense_cost = func.coalesce(expenses.c.cost, 0.0)
+    invoiced_amount = func.coalesce(invoiced.c.amount, 0.0)
+    return (
+        select(
+            Job.id.label("job_id"),
+            Job.job_name,
+            Job.price,
+            labour_cost.label("labour_cost"),
+            expense_cost.label("expense_cost"),
+            (labour_cost + expense_cost).label("total_cost"),
+            invoiced_amount.label("invoiced"),
+            (invoiced_amount - labour_cost - expense_cost).label("margin"),
+        )
+        .outerjoin(labour, labour.c.job_id == Job.id)
+        .outerjoin(expenses, expenses.c.job_id == Job.id)
+        .outerjoin(invoiced, invoiced.c.job_id == Job.id)
+        .where(Job.id.in_(job_ids))
+        .order_by(Job.id)
+    )
+
+
+def _with_margin_rate(row):
+    invoiced = row["invoiced"]
+    return {**row, "margin_rate": row["margin"] / invoiced if invoiced else None}
+
+
 @router.get("/", response_model=List[JobResponse])
 async def read_all(db: db_dependency):
     # Query parcels with geometry as GeoJSON
     return db.query(Job).all()
 
 
+@router.get("/profitability", response_model=List[JobProfitabilityResponse])
+async def read_jobs_profitability(
+    db: db_dependency,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+):
+    # Jobs programmed in the period, all jobs when no period is given
+    job_ids = select(Job.id)
+    if date_from is not None:
+        job_ids = job_ids.where(Job.date_program >= date_from)
+    if date_to is not None:
+        job_ids = job_ids.where(Job.date_program <= date_to)
+
+    rows = db.execute(_profitability_query(job_ids)).mappings()
+    return [_with_margin_rate(row) for row in rows]
+
+
 @router.get("/{job_id}", response_model=JobResponse)
 async def read_job(db: db_dependency, job_id: int = Path(gt=0)):
     # Query parcels with geometry as GeoJSON
@@ -38,6 +144,28 @@ async def read_job(db: db_dependency, job_id: int = Path(gt=0)):
     return query
 
 
+@router.get("/{job_id}/profitability", response_model=JobProfitabilityResponse)
+async def read_job_profitability(db: db_dependency, job_id: int = Path(gt=0)):
+    row = db.execute(_profitability_query([job_id])).mappings().first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Data not found")
+    return _with_margin_rate(row)
+
+
+@router.get("/{job_id}/reports", response_model=List[JobReportWithImagesResponse])
+async def read_job_reports(db: db_dependency, job_id: int = Path(gt=0)):
+    if not db.query(Job.id).filter(Job.id == job_id).first():
+        raise HTTPException(status_code=404, detail="Data not found")
+
+    return (
+        db.query(JobReport)
+        .options(selectinload(JobReport.images))
+        .filter(JobReport.job_id == job_id)
+        .order_by(JobReport.id)
+        .all()
+    )
+
+
 @router.get("/filter/{status}", response_model=List[JobResponse])
 async def read_invoice(db: db_dependency, job_status: bool):
     query = db.query(Job).filter(Job.status == job_status).all()
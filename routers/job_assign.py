@@ -1,12 +1,19 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from starlette import status
-from ..models import JobAssign
+from datetime import date, timedelta
+from ..models import Job, JobAssign, Technician, RoleTechnician
 from ..database import SessionLocal
-from ..schemas import JobAssignResponse, JobAssignCreate, TechnicianResponse
-from typing import List
+from ..schemas import (
+    JobAssignResponse,
+    JobAssignCreate,
+    TechnicianResponse,
+    TechnicianCalendarResponse,
+)
+from ..utils.scheduling import check_period, check_technician_available, overlaps
+from typing import List, Optional
 
 
 router = APIRouter(prefix="/jobs_assign", tags=["Jobs Assign"])
@@ -22,70 +29,126 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+# Longest period a calendar can cover, in days
+CALENDAR_MAX_DAYS = 92
+
 
 @router.get("/", response_model=List[JobAssignResponse])
 async def read_all(db: db_dependency):
     return db.query(JobAssign).all()
 
 
+@router.get("/calendar", response_model=List[TechnicianCalendarResponse])
+async def read_calendar(
+    db: db_dependency,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    technician_id: Optional[int] = None,
+):
+    check_period(date_from, date_to)
+    if (date_to - date_from).days >= CALENDAR_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The calendar covers at most {CALENDAR_MAX_DAYS} days",
+        )
+
+    query = (
+        select(
+            JobAssign.id,
+            JobAssign.technician_id,
+            Technician.name.label("technician_name"),
+            JobAssign.job_id,
+            Job.job_name,
+            Job.status,
+            JobAssign.date_start,
+            JobAssign.date_end,
+        )
+        .join(Technician, JobAssign.technician_id == Technician.id)
+        .join(Job, JobAssign.job_id == Job.id)
+        .where(overlaps(date_from, date_to))
+        .order_by(Technician.name, JobAssign.technician_id, JobAssign.date_start)
+    )
+    if technician_id is not None:
+        query = query.where(JobAssign.technician_id == technician_id)
+
+    # Technician -> day -> assignments, only the days inside the period
+    calendars = {}
+    for row in db.execute(query).mappings():
+        calendar = calendars.setdefault(
+            row["technician_id"],
+            {
+                "technician_id": row["technician_id"],
+                "technician_name": row["technician_name"],
+                "days": {},
+            },
+        )
+        day = max(row["date_start"], date_from)
+        last_day = min(row["date_end"], date_to)
+        while day <= last_day:
+            calendar["days"].setdefault(day, []).append(row)
+            day += timedelta(days=1)
+
+    return [
+        {
+            **calendar,
+            "days": [
+                {"date": day, "assignments": assignments}
+                for day, assignments in sorted(calendar["days"].items())
+            ],
+        }
+        for calendar in calendars.values()
+    ]
+
+
+JOB_ASSIGNS = select(
+    JobAssign.id,
+    JobAssign.job_id,
+    JobAssign.technician_id,
+    JobAssign.date_start,
+    JobAssign.date_end,
+    JobAssign.amount,
+)
+
+JOB_TECHNICIANS = (
+    select(
+        Technician.id,
+        Technician.name,
+        Technician.email,
+        Technician.phone,
+        RoleTechnician.id.label("role_id"),
+        RoleTechnician.role,
+    )
+    .join(JobAssign, JobAssign.technician_id == Technician.id)
+    .join(RoleTechnician, Technician.role_id == RoleTechnician.id)
+)
+
+
 @router.get("/{job_assign_id}", response_model=JobAssignResponse)
 async def read_job(db: db_dependency, job_assign_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM jobs_assigns
-        WHERE id = :job_assign_id
-    """
-        ),
-        {"job_assign_id": job_assign_id},
-    ).fetchone()
-
+    result = (
+        db.execute(JOB_ASSIGNS.where(JobAssign.id == job_assign_id)).mappings().first()
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "job_id": result.job_id,
-        "technician_id": result.technician_id,
-        "date_start": result.date_start,
-        "date_end": result.date_end,
-    }
+    return result
 
 
 @router.get("/technicians/{job_id}", response_model=List[TechnicianResponse])
 async def read_technicians_assign_job(db: db_dependency, job_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT T.*, R.id as role_id, R.role AS role
-        FROM jobs_assigns J, technicians T, technicians_roles R
-        WHERE J.technician_id = T.id
-        AND T.role_id = R.id
-        AND job_id = :job_id
-    """
-        ),
-        {"job_id": job_id},
-    )
-
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "name": row.name,
-                "email": row.email,
-                "phone": row.phone,
-                "role": {"id": row.role_id, "role": row.role},
-            }
-        )
-    return data
+    rows = db.execute(JOB_TECHNICIANS.where(JobAssign.job_id == job_id)).mappings()
+    return [
+        {**row, "role": {"id": row["role_id"], "role": row["role"]}} for row in rows
+    ]
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
 async def create_job_assign(db: db_dependency, job_assign_request: JobAssignCreate):
+    check_technician_available(
+        db,
+        job_assign_request.technician_id,
+        job_assign_request.date_start,
+        job_assign_request.date_end,
+    )
     job_assign_model = JobAssign(**job_assign_request.model_dump())
 
     db.add(job_assign_model)
@@ -105,6 +168,14 @@ async def update_job_assign(
     if job_assign_model is None:
         raise HTTPException(status_code=404, detail="Data not found.")
 
+    check_technician_available(
+        db,
+        job_assign_request.technician_id,
+        job_assign_request.date_start,
+        job_assign_request.date_end,
+        exclude_id=job_assign_id,
+    )
+
     job_assign_model.job_id = job_assign_request.job_id
     job_assign_model.technician_id = job_assign_request.technician_id
     job_assign_model.date_start = job_assign_request.date_start
@@ -1,12 +1,12 @@
 from typing import Annotated
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
 from ..models import JobReport
 from ..database import SessionLocal
-from ..schemas import JobReportResponse, JobReportCreate
-from typing import List
+from ..schemas import JobReportResponse, JobReportCreate, JobReportWithImagesResponse
+from typing import List, Literal, Optional
 
 
 router = APIRouter(prefix="/jobs-report", tags=["Jobs Report"])
@@ -23,54 +23,48 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+JOB_REPORTS = select(
+    JobReport.id,
+    JobReport.job_id,
+    JobReport.technician_id,
+    JobReport.report_heading,
+    JobReport.report_description,
+)
+
+
 @router.get("/", response_model=List[JobReportResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT * FROM jobs_reports;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "job_id": row.job_id,
-                "technician_id": row.technician_id,
-                "report_heading": row.report_heading,
-                "report_description": row.report_description,
-            }
+    return db.execute(JOB_REPORTS).mappings().all()
+
+
+@router.get(
+    "/{job_report_id}",
+    response_model=JobReportWithImagesResponse,
+    response_model_exclude_unset=True,
+)
+async def read_job_report(
+    db: db_dependency,
+    job_report_id: int = Path(gt=0),
+    include: Optional[Literal["images"]] = None,
+):
+    if include == "images":
+        # Report and its images in two queries, whatever the number of images
+        job_report = (
+            db.query(JobReport)
+            .options(selectinload(JobReport.images))
+            .filter(JobReport.id == job_report_id)
+            .first()
         )
-    return data
-
-
-@router.get("/{job_report_id}", response_model=JobReportResponse)
-async def read_job_report(db: db_dependency, job_report_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM jobs_reports
-        WHERE id = :job_report_id
-    """
-        ),
-        {"job_report_id": job_report_id},
-    ).fetchone()
+        if not job_report:
+            raise HTTPException(status_code=404, detail="Data not found")
+        return job_report
 
+    result = (
+        db.execute(JOB_REPORTS.where(JobReport.id == job_report_id)).mappings().first()
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "job_id": result.job_id,
-        "technician_id": result.technician_id,
-        "report_heading": result.report_heading,
-        "report_description": result.report_description,
-    }
+    return result
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
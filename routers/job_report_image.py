@@ -1,14 +1,24 @@
-import os
-import shutil
+import asyncio
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from fastapi import APIRouter, Depends, HTTPException, Path, UploadFile, File
+from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Path,
+    UploadFile,
+    File,
+)
 from starlette import status
 from ..models import JobReportImage
 from ..database import SessionLocal
 from ..schemas import JobReportImageResponse, JobReportImageCreate
-from typing import List
+from typing import List, Literal
+from ..utils.storage import store_upload, remove_upload, REPORT_IMAGES
+from ..utils.images import generate_variants, resolve_variants
+from ..utils.bulk import bulk_insert
 
 
 router = APIRouter(prefix="/jobs-report-image", tags=["Jobs Report Image"])
@@ -24,77 +34,134 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+# Downscaled variants are generated in the background after each upload
+ImageSize = Literal["thumb", "medium", "original"]
+
+
+JOB_REPORT_IMAGES = select(
+    JobReportImage.id, JobReportImage.job_report_id, JobReportImage.file_path
+)
+
+
+async def _with_size(rows: list, size: str) -> list:
+    file_paths = await resolve_variants([row["file_path"] for row in rows], size)
+    return [{**row, "file_path": file_path} for row, file_path in zip(rows, file_paths)]
+
 
 @router.get("/", response_model=List[JobReportImageResponse])
-async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT * FROM jobs_reports_images;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "job_report_id": row.job_report_id,
-                "file_path": row.file_path,
-            }
-        )
-    return data
+async def read_all(db: db_dependency, size: ImageSize = "original"):
+    rows = db.execute(JOB_REPORT_IMAGES).mappings().all()
+    return await _with_size(rows, size)
 
 
 @router.get("/{job_report_image_id}", response_model=JobReportImageResponse)
 async def read_job_report_image(
-    db: db_dependency, job_report_image_id: int = Path(gt=0)
+    db: db_dependency,
+    job_report_image_id: int = Path(gt=0),
+    size: ImageSize = "original",
 ):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM jobs_reports_images
-        WHERE id = :job_report_image_id
-    """
-        ),
-        {"job_report_image_id": job_report_image_id},
-    ).fetchone()
-
+    result = (
+        db.execute(JOB_REPORT_IMAGES.where(JobReportImage.id == job_report_image_id))
+        .mappings()
+        .first()
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
+    return (await _with_size([result], size))[0]
+
+
+def _stored(task: asyncio.Task) -> bool:
+    return task.done() and not task.cancelled() and task.exception() is None
 
-    return {
-        "id": result.id,
-        "job_report_id": result.job_id,
-        "file_path": result.technician_id,
-    }
+
+async def _discard_orphans(db: Session, file_paths: list):
+    """
+    Remove the files of a failed upload. Content-addressed names may already
+    be used by earlier rows: only the files no row points to are removed.
+    """
+    if not file_paths:
+        return
+    referenced = set(
+        db.scalars(
+            select(JobReportImage.file_path).where(
+                JobReportImage.file_path.in_(file_paths)
+            )
+        )
+    )
+    for file_path in set(file_paths) - referenced:
+        await remove_upload(file_path)
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
 async def create_job_report_image(
-    db: db_dependency, job_report_id: str, file: UploadFile = File()
+    db: db_dependency,
+    background_tasks: BackgroundTasks,
+    job_report_id: int,
+    file: UploadFile = File(),
 ):
-    UPLOAD_DIR = "backend1/uploads/reports/images"
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    UPLOAD_PATH = "uploads/reports/images"
-    file_location = f"{UPLOAD_PATH}/{file.filename}"
-
-    # Save the uploaded image
-    with open(file_location, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    file_path = await store_upload(file, REPORT_IMAGES)
 
-    job_report_model = JobReportImage(
-        job_report_id=job_report_id, file_path=file_location
-    )
+    job_report_model = JobReportImage(job_report_id=job_report_id, file_path=file_path)
     db.add(job_report_model)
-    db.commit()
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        await _discard_orphans(db, [file_path])
+        raise
     db.refresh(job_report_model)  # refresh to get generated fields like id
+    background_tasks.add_task(generate_variants, file_path)
     return job_report_model
 
 
+@router.post(
+    "/create-batch",
+    response_model=List[JobReportImageResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_job_report_images(
+    db: db_dependency,
+    background_tasks: BackgroundTasks,
+    job_report_id: int,
+    files: List[UploadFile] = File(),
+):
+    # Files are written concurrently, rows inserted in one statement. The
+    # task group cancels the other writes as soon as one of them fails
+    tasks = []
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(store_upload(file, REPORT_IMAGES)) for file in files
+            ]
+    except BaseExceptionGroup as errors:
+        stored = [task.result() for task in tasks if _stored(task)]
+        await _discard_orphans(db, stored)
+        raise errors.exceptions[0]
+
+    file_paths = [task.result() for task in tasks]
+    try:
+        ids = bulk_insert(
+            db,
+            JobReportImage,
+            [
+                {"job_report_id": job_report_id, "file_path": file_path}
+                for file_path in file_paths
+            ],
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        await _discard_orphans(db, file_paths)
+        raise
+
+    for file_path in set(file_paths):
+        background_tasks.add_task(generate_variants, file_path)
+    return [
+        {"id": id, "job_report_id": job_report_id, "file_path": file_path}
+        for id, file_path in zip(ids, file_paths)
+    ]
+
+
 # @router.put("/update/{job_report_id}", status_code=status.HTTP_204_NO_CONTENT)
 # async def update_job_report(
 #     db: db_dependency,
@@ -1,6 +1,6 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, Response
 from starlette import status
 from ..models import Payment, Invoice
 from ..database import SessionLocal
@@ -10,7 +10,9 @@ from ..schemas import (
     PaymentUpdate,
     InvoicePaymentResponse,
 )
-from typing import List
+from typing import List, Optional
+from ..utils.query_filters import apply_filters
+from ..utils.versioning import conditional_update, etag, load_updated
 
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
@@ -26,17 +28,42 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+# Columns that can be used in ?field=, ?field__op= and ?order_by=
+FILTER_FIELDS = {
+    "id",
+    "reference",
+    "invoice_id",
+    "method_id",
+    "company_id",
+    "date_op",
+}
+
 
 # Read all
 @router.get("/", response_model=List[PaymentResponse])
-def get_purchase_orders(db: Session = Depends(get_db)):
-    return db.query(Payment).all()
+def get_purchase_orders(
+    request: Request, include_deleted: bool = False, db: Session = Depends(get_db)
+):
+    query = apply_filters(
+        db.query(Payment).execution_options(include_deleted=include_deleted),
+        Payment,
+        request.query_params,
+        FILTER_FIELDS,
+    )
+    return query.all()
 
 
 # Read by ID
 @router.get("/{po_id}", response_model=PaymentResponse, status_code=status.HTTP_200_OK)
-def get_payment(po_id: int, db: Session = Depends(get_db)):
-    query = db.query(Payment).filter(Payment.id == po_id).first()
+def get_payment(
+    po_id: int, include_deleted: bool = False, db: Session = Depends(get_db)
+):
+    query = (
+        db.query(Payment)
+        .execution_options(include_deleted=include_deleted)
+        .filter(Payment.id == po_id)
+        .first()
+    )
     if not query:
         raise HTTPException(status_code=404, detail="Purchase order not found")
     return query
@@ -73,23 +100,30 @@ def create_payment(po: PaymentCreate, db: db_dependency):
     response_model=PaymentResponse,
     status_code=status.HTTP_206_PARTIAL_CONTENT,
 )
-def update_payment(po_id: int, po: PaymentUpdate, db: db_dependency):
-    query = db.query(Payment).filter(Payment.id == po_id).first()
-    if not query:
-        raise HTTPException(status_code=404, detail="Purchase order not found")
-
-    for key, value in po.model_dump(exclude_unset=True).items():
-        setattr(query, key, value)
-
+def update_payment(
+    po_id: int,
+    po: PaymentUpdate,
+    response: Response,
+    db: db_dependency,
+    if_match: Optional[str] = Header(None),
+):
+    conditional_update(db, Payment, po_id, po.model_dump(exclude_unset=True), if_match)
     db.commit()
-    db.refresh(query)
+
+    query = load_updated(db, Payment, po_id, PaymentResponse)
+    response.headers["ETag"] = etag(query.version)
     return query
 
 
 # Delete
 @router.delete("/delete/{po_id}")
 def delete_payment(po_id: int, db: Session = Depends(get_db)):
-    query = db.query(Payment).filter(Payment.id == po_id).first()
+    query = (
+        db.query(Payment)
+        .execution_options(include_deleted=True)
+        .filter(Payment.id == po_id)
+        .first()
+    )
     if not query:
         raise HTTPException(status_code=404, detail="Purchase order not found")
 
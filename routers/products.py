@@ -1,6 +1,6 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
 from ..models import Product
@@ -23,54 +23,27 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+# Built once at import: SQLAlchemy caches its compiled form across requests
+PRODUCTS = select(
+    Product.id,
+    Product.name,
+    Product.description,
+    Product.unit,
+    Product.stock_security_level,
+)
+
+
 @router.get("/", response_model=List[ProductResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT * FROM products;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "name": row.name,
-                "description": row.description,
-                "unit": row.unit,
-                "stock_security_level": row.stock_security_level,
-            }
-        )
-    return data
+    return db.execute(PRODUCTS).mappings().all()
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
 async def read_product(db: db_dependency, product_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM products
-        WHERE id = :product_id
-    """
-        ),
-        {"product_id": product_id},
-    ).fetchone()
-
+    result = db.execute(PRODUCTS.where(Product.id == product_id)).mappings().first()
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "name": result.name,
-        "description": result.description,
-        "unit": result.unit,
-        "stock_security_level": result.stock_security_level,
-    }
+    return result
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
@@ -1,9 +1,9 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
-from ..models import ProductInput
+from ..models import ProductInput, Product, Vendor
 from ..database import SessionLocal
 from ..schemas import ProductInputResponse, ProductInputCreate
 from typing import List
@@ -23,63 +23,42 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+PRODUCT_INPUT_COLUMNS = select(
+    ProductInput.id,
+    ProductInput.product_id,
+    ProductInput.vendor_id,
+    Product.name.label("product"),
+    Vendor.name.label("vendor"),
+    ProductInput.user_id,
+    ProductInput.quantity,
+    ProductInput.price,
+    ProductInput.date_input,
+)
+# The list only shows inputs whose product and vendor exist; a single input
+# is returned even when one of them is gone
+PRODUCT_INPUTS = PRODUCT_INPUT_COLUMNS.join(
+    Product, ProductInput.product_id == Product.id
+).join(Vendor, ProductInput.vendor_id == Vendor.id)
+PRODUCT_INPUT = PRODUCT_INPUT_COLUMNS.outerjoin(
+    Product, ProductInput.product_id == Product.id
+).outerjoin(Vendor, ProductInput.vendor_id == Vendor.id)
+
+
 @router.get("/", response_model=List[ProductInputResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT P.name AS product, V.name AS vendor, PI.* 
-        FROM products_inputs PI, products P, vendors V
-        WHERE PI.product_id = P.id
-        AND PI.vendor_id = V.id;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "product_id": row.product_id,
-                "vendor_id": row.vendor_id,
-                "product": row.product,
-                "vendor": row.vendor,
-                "user_id": row.user_id,
-                "quantity": row.quantity,
-                "price": row.price,
-                "date_input": row.date_input,
-            }
-        )
-    return data
+    return db.execute(PRODUCT_INPUTS).mappings().all()
 
 
 @router.get("/{product_id}", response_model=ProductInputResponse)
 async def read_product(db: db_dependency, product_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM products_inputs
-        WHERE id = :product_id
-    """
-        ),
-        {"product_id": product_id},
-    ).fetchone()
-
+    result = (
+        db.execute(PRODUCT_INPUT.where(ProductInput.id == product_id))
+        .mappings()
+        .first()
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "product_id": result.product_id,
-        "vendor_id": result.vendor_id,
-        "user_id": result.user_id,
-        "quantity": result.quantity,
-        "price": result.price,
-        "date_input": result.date_input,
-    }
+    return result
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
@@ -1,9 +1,9 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
-from ..models import ProductOutput
+from ..models import ProductOutput, Product
 from ..database import SessionLocal
 from ..schemas import ProductOutputResponse, ProductOutputCreate
 from typing import List
@@ -23,59 +23,40 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+PRODUCT_OUTPUT_COLUMNS = select(
+    ProductOutput.id,
+    ProductOutput.product_id,
+    ProductOutput.user_id,
+    Product.name.label("product"),
+    ProductOutput.quantity,
+    ProductOutput.price,
+    ProductOutput.date_output,
+)
+# The list only shows outputs whose product exists; a single output is
+# returned even when its product is gone
+PRODUCT_OUTPUTS = PRODUCT_OUTPUT_COLUMNS.join(
+    Product, ProductOutput.product_id == Product.id
+)
+PRODUCT_OUTPUT = PRODUCT_OUTPUT_COLUMNS.outerjoin(
+    Product, ProductOutput.product_id == Product.id
+)
+
+
 @router.get("/", response_model=List[ProductOutputResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT P.name AS product, PO.* 
-        FROM products_outputs PO, products P
-        WHERE PO.product_id = P.id;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "product_id": row.product_id,
-                "user_id": row.user_id,
-                "product": row.product,
-                "quantity": row.quantity,
-                "price": row.price,
-                "date_output": row.date_output,
-            }
-        )
-    return data
+    return db.execute(PRODUCT_OUTPUTS).mappings().all()
 
 
 @router.get("/{product_output_id}", response_model=ProductOutputResponse)
 async def read_product(db: db_dependency, product_output_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM products_outputs
-        WHERE id = :product_output_id
-    """
-        ),
-        {"product_output_id": product_output_id},
-    ).fetchone()
-
+    result = (
+        db.execute(PRODUCT_OUTPUT.where(ProductOutput.id == product_output_id))
+        .mappings()
+        .first()
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "product_id": result.product_id,
-        "user_id": result.user_id,
-        "quantity": result.quantity,
-        "price": result.price,
-        "date_output": result.date_output,
-    }
+    return result
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
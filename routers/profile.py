@@ -1,6 +1,6 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
 from ..models import Profile
@@ -23,48 +23,20 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+PROFILES = select(Profile.id, Profile.name)
+
+
 @router.get("/", response_model=List[ProfileResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT * FROM profiles;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "name": row.name,
-            }
-        )
-    return data
+    return db.execute(PROFILES).mappings().all()
 
 
 @router.get("/{profile_id}", response_model=ProfileResponse)
 async def read_profile(db: db_dependency, profile_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM profiles
-        WHERE id = :profile_id
-    """
-        ),
-        {"profile_id": profile_id},
-    ).fetchone()
-
+    result = db.execute(PROFILES.where(Profile.id == profile_id)).mappings().first()
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "name": result.name,
-    }
+    return result
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
@@ -1,16 +1,22 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, Response
 from starlette import status
-from ..models import PurchaseOrder
+from ..models import PurchaseOrder, PurchaseOrderProduct
 from ..database import SessionLocal
 from ..schemas import (
     PurchaseOrderResponse,
     PurchaseOrderCreate,
     PurchaseOrderUpdate,
+    PurchaseOrderDocumentCreate,
+    PurchaseOrderDocumentUpdate,
 )
-from typing import List
+from typing import List, Optional
 from ..utils.generate_references import get_next_reference
+from ..utils.query_filters import apply_filters
+from ..utils.documents import save_document, insert_lines, replace_lines
+from ..utils.document_totals import refresh_purchase_order_totals
+from ..utils.versioning import conditional_update, etag, load_updated
 
 
 router = APIRouter(prefix="/purchase_orders", tags=["Purchase Orders"])
@@ -26,19 +32,45 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+# Columns that can be used in ?field=, ?field__op= and ?order_by=
+FILTER_FIELDS = {
+    "id",
+    "reference",
+    "vendor_id",
+    "company_id",
+    "status",
+    "date_op",
+    "amount",
+}
+
 
 # Read all
 @router.get("/", response_model=List[PurchaseOrderResponse])
-def get_purchase_orders(db: Session = Depends(get_db)):
-    return db.query(PurchaseOrder).all()
+def get_purchase_orders(
+    request: Request, include_deleted: bool = False, db: Session = Depends(get_db)
+):
+    query = apply_filters(
+        db.query(PurchaseOrder).execution_options(include_deleted=include_deleted),
+        PurchaseOrder,
+        request.query_params,
+        FILTER_FIELDS,
+    )
+    return query.all()
 
 
 # Read by ID
 @router.get(
     "/{po_id}", response_model=PurchaseOrderResponse, status_code=status.HTTP_200_OK
 )
-def get_purchase_order(po_id: int, db: Session = Depends(get_db)):
-    db_po = db.query(PurchaseOrder).filter(PurchaseOrder.id == po_id).first()
+def get_purchase_order(
+    po_id: int, include_deleted: bool = False, db: Session = Depends(get_db)
+):
+    db_po = (
+        db.query(PurchaseOrder)
+        .execution_options(include_deleted=include_deleted)
+        .filter(PurchaseOrder.id == po_id)
+        .first()
+    )
     if not db_po:
         raise HTTPException(status_code=404, detail="Purchase order not found")
     return db_po
@@ -59,34 +91,92 @@ def create_purchase_order(po: PurchaseOrderCreate, db: db_dependency):
     # print(updated_order.model_dump())
     query = PurchaseOrder(**updated_data.model_dump())
     db.add(query)
+    db.flush()
+    refresh_purchase_order_totals(db, query.id)
     db.commit()
     db.refresh(query)
     return query
 
 
-# Update
+# Create header and lines in one transaction
+@router.post(
+    "/create-full",
+    response_model=PurchaseOrderResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_purchase_order_document(po: PurchaseOrderDocumentCreate, db: db_dependency):
+    header = po.model_dump(exclude={"products"})
+    header["reference"] = get_next_reference(db)
+    db_po = save_document(db, PurchaseOrder, header)
+    insert_lines(db, PurchaseOrderProduct, "po_id", db_po.id, po.products)
+    refresh_purchase_order_totals(db, db_po.id)
+
+    db.commit()
+    db.refresh(db_po)
+    return db_po
+
+
+# Replace header and lines in one transaction
 @router.put(
-    "/update/{po_id}",
+    "/replace/{po_id}",
     response_model=PurchaseOrderResponse,
     status_code=status.HTTP_206_PARTIAL_CONTENT,
 )
-def update_purchase_order(po_id: int, po: PurchaseOrderUpdate, db: db_dependency):
-    db_po = db.query(PurchaseOrder).filter(PurchaseOrder.id == po_id).first()
-    if not db_po:
-        raise HTTPException(status_code=404, detail="Purchase order not found")
+def replace_purchase_order_document(
+    po_id: int,
+    po: PurchaseOrderDocumentUpdate,
+    response: Response,
+    db: db_dependency,
+    if_match: Optional[str] = Header(None),
+):
+    header = po.model_dump(exclude_unset=True, exclude={"products"})
+    header.pop("reference", None)
+    conditional_update(db, PurchaseOrder, po_id, header, if_match)
+
+    # Products replace the stored ones when sent, otherwise they are kept
+    if po.products is not None:
+        replace_lines(db, PurchaseOrderProduct, "po_id", po_id, po.products)
+    refresh_purchase_order_totals(db, po_id)
+
+    db.commit()
+    db_po = load_updated(db, PurchaseOrder, po_id, PurchaseOrderResponse)
+    response.headers["ETag"] = etag(db_po.version)
+    return db_po
 
-    for key, value in po.model_dump(exclude_unset=True).items():
-        setattr(db_po, key, value)
 
+# Update
+@router.put(
+    "/update/{po_id}",
+    response_model=PurchaseOrderResponse,
+    status_code=status.HTTP_206_PARTIAL_CONTENT,
+)
+def update_purchase_order(
+    po_id: int,
+    po: PurchaseOrderUpdate,
+    response: Response,
+    db: db_dependency,
+    if_match: Optional[str] = Header(None),
+):
+    conditional_update(
+        db, PurchaseOrder, po_id, po.model_dump(exclude_unset=True), if_match
+    )
+    refresh_purchase_order_totals(db, po_id)
     db.commit()
-    db.refresh(db_po)
+
+    db_po = load_updated(db, PurchaseOrder, po_id, PurchaseOrderResponse)
+    response.headers["ETag"] = etag(db_po.version)
     return db_po
 
 
 # Delete
 @router.delete("/delete/{po_id}")
 def delete_purchase_order(po_id: int, db: Session = Depends(get_db)):
-    db_po = db.query(PurchaseOrder).filter(PurchaseOrder.id == po_id).first()
+    db_po = (
+        db.query(PurchaseOrder)
+        .execution_options(include_deleted=True)
+        .filter(PurchaseOrder.id == po_id)
+        .first()
+    )
     if not db_po:
         raise HTTPException(status_code=404, detail="Purchase order not found")
 
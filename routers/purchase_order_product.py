@@ -8,8 +8,11 @@ from ..schemas import (
     PurchaseOrderProductResponse,
     PurchaseOrderProductCreate,
     PurchaseOrderProductUpdate,
+    BulkCreateResponse,
 )
 from typing import List
+from ..utils.bulk import bulk_insert
+from ..utils.document_totals import refresh_purchase_order_totals
 
 
 router = APIRouter(
@@ -59,11 +62,31 @@ def create_purchase_order_product(
 ):
     db_product = PurchaseOrderProduct(**product.model_dump())
     db.add(db_product)
+    db.flush()
+    refresh_purchase_order_totals(db, db_product.po_id)
     db.commit()
     db.refresh(db_product)
     return db_product
 
 
+# Create many in one statement
+@router.post(
+    "/create-bulk",
+    response_model=BulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_purchase_order_products(
+    products: List[PurchaseOrderProductCreate], db: Session = Depends(get_db)
+):
+    ids = bulk_insert(
+        db, PurchaseOrderProduct, [item.model_dump() for item in products]
+    )
+    for po_id in {item.po_id for item in products}:
+        refresh_purchase_order_totals(db, po_id)
+    db.commit()
+    return {"ids": ids}
+
+
 # Update
 @router.put("/update/{product_id}", response_model=PurchaseOrderProductResponse)
 def update_purchase_order_product(
@@ -83,6 +106,8 @@ def update_purchase_order_product(
     for key, value in update_data.items():
         setattr(db_product, key, value)
 
+    db.flush()
+    refresh_purchase_order_totals(db, db_product.po_id)
     db.commit()
     db.refresh(db_product)
     return db_product
@@ -100,5 +125,7 @@ def delete_purchase_order_product(product_id: int, db: Session = Depends(get_db)
         raise HTTPException(status_code=404, detail="PurchaseOrderProduct not found")
 
     db.delete(db_product)
+    db.flush()
+    refresh_purchase_order_totals(db, db_product.po_id)
     db.commit()
     return {"ok": True, "message": "PurchaseOrderProduct deleted"}
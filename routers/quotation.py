@@ -1,17 +1,36 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy import text, insert, select, literal
+from datetime import date
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, Response
 from starlette import status
-from ..models import Quotation
+from ..models import (
+    Quotation,
+    QuotationProduct,
+    QuotationService,
+    QuotationType,
+    Invoice,
+    InvoiceProduct,
+    InvoiceType,
+)
 from ..database import SessionLocal
 from ..schemas import (
     QuotationResponse,
     QuotationCreate,
     QuotationUpdate,
+    QuotationDocumentCreate,
+    QuotationDocumentUpdate,
+    QuotationConvert,
+)
+from typing import List, Optional
+from ..utils.generate_references import (
+    get_next_reference_pro,
+    get_next_reference_invoice,
 )
-from typing import List
-from ..utils.generate_references import get_next_reference_pro
+from ..utils.query_filters import apply_filters
+from ..utils.documents import save_document, insert_lines, replace_lines
+from ..utils.document_totals import refresh_quotation_totals
+from ..utils.versioning import conditional_update, etag, load_updated
 
 
 router = APIRouter(
@@ -30,17 +49,49 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+QUOTATION_LINES = {
+    "products": QuotationProduct,
+    "services": QuotationService,
+}
+
+# Columns that can be used in ?field=, ?field__op= and ?order_by=
+FILTER_FIELDS = {
+    "id",
+    "reference",
+    "client_id",
+    "type_id",
+    "company_id",
+    "status",
+    "date_op",
+    "amount",
+}
+
 
 # Get all
 @router.get("/", response_model=List[QuotationResponse])
-def read_all(db: Session = Depends(get_db)):
-    return db.query(Quotation).all()
+def read_all(
+    request: Request, include_deleted: bool = False, db: Session = Depends(get_db)
+):
+    query = apply_filters(
+        db.query(Quotation).execution_options(include_deleted=include_deleted),
+        Quotation,
+        request.query_params,
+        FILTER_FIELDS,
+    )
+    return query.all()
 
 
 # Get by id
 @router.get("/{quotation_id}", response_model=QuotationResponse)
-def read_quotation(quotation_id: int, db: Session = Depends(get_db)):
-    db_quotation = db.query(Quotation).filter(Quotation.id == quotation_id).first()
+def read_quotation(
+    quotation_id: int, include_deleted: bool = False, db: Session = Depends(get_db)
+):
+    db_quotation = (
+        db.query(Quotation)
+        .execution_options(include_deleted=include_deleted)
+        .filter(Quotation.id == quotation_id)
+        .first()
+    )
     if not db_quotation:
         raise HTTPException(status_code=404, detail="Data not found")
     return db_quotation
@@ -63,11 +114,157 @@ def create_quotation(quotation: QuotationCreate, db: Session = Depends(get_db)):
     # print(updated_order.model_dump())
     query = Quotation(**updated_expense.model_dump())
     db.add(query)
+    db.flush()
+    refresh_quotation_totals(db, query.id)
     db.commit()
     db.refresh(query)
     return query
 
 
+# Create header and lines in one transaction
+@router.post(
+    "/create-full",
+    response_model=QuotationResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_quotation_document(
+    quotation: QuotationDocumentCreate, db: Session = Depends(get_db)
+):
+    header = quotation.model_dump(exclude=set(QUOTATION_LINES))
+    header["reference"] = get_next_reference_pro(db)
+    query = save_document(db, Quotation, header)
+
+    for field, model in QUOTATION_LINES.items():
+        insert_lines(db, model, "quotation_id", query.id, getattr(quotation, field))
+    refresh_quotation_totals(db, query.id)
+
+    db.commit()
+    db.refresh(query)
+    return query
+
+
+# Replace header and lines in one transaction
+@router.put(
+    "/replace/{quotation_id}",
+    response_model=QuotationResponse,
+    status_code=status.HTTP_206_PARTIAL_CONTENT,
+)
+def replace_quotation_document(
+    quotation_id: int,
+    quotation: QuotationDocumentUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    header = quotation.model_dump(exclude_unset=True, exclude=set(QUOTATION_LINES))
+    header.pop("reference", None)
+    conditional_update(db, Quotation, quotation_id, header, if_match)
+
+    # Line lists that are sent replace the stored ones, omitted ones are kept
+    for field, model in QUOTATION_LINES.items():
+        lines = getattr(quotation, field)
+        if lines is not None:
+            replace_lines(db, model, "quotation_id", quotation_id, lines)
+    refresh_quotation_totals(db, quotation_id)
+
+    db.commit()
+    db_quotation = load_updated(db, Quotation, quotation_id, QuotationResponse)
+    response.headers["ETag"] = etag(db_quotation.version)
+    return db_quotation
+
+
+def _invoice_type_for(db: Session, quotation_type_id: Optional[int]):
+    """The invoice type named like the quotation's type, None without one."""
+    if quotation_type_id is None:
+        return None
+    return db.scalar(
+        select(InvoiceType.id)
+        .join(QuotationType, QuotationType.type == InvoiceType.type)
+        .where(QuotationType.id == quotation_type_id)
+        .limit(1)
+    )
+
+
+# Convert to invoice: header and product lines copied in one transaction
+@router.post(
+    "/{quotation_id}/convert-to-invoice",
+    status_code=status.HTTP_201_CREATED,
+)
+def convert_quotation_to_invoice(
+    quotation_id: int,
+    convert: QuotationConvert = QuotationConvert(),
+    db: Session = Depends(get_db),
+):
+    # Locked until the commit: a concurrent conversion waits, then sees the link
+    db_quotation = (
+        db.query(Quotation)
+        .filter(Quotation.id == quotation_id)
+        .with_for_update()
+        .first()
+    )
+    if not db_quotation:
+        raise HTTPException(status_code=404, detail="Data not found")
+    if db_quotation.invoice_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Quotation already converted to invoice {db_quotation.invoice_id}",
+        )
+    # status is set once the client accepted the quotation
+    if not db_quotation.status:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only an accepted quotation can be converted to an invoice",
+        )
+
+    # Invoice and quotation types are separate tables: matched by name
+    type_id = convert.type_id or _invoice_type_for(db, db_quotation.type_id)
+    if type_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="No invoice type matches the quotation's type, send type_id",
+        )
+
+    # Services have no invoice line counterpart, they stay in the amount
+    invoice = Invoice(
+        reference=get_next_reference_invoice(db),
+        client_id=db_quotation.client_id,
+        user_id=convert.user_id or db_quotation.user_id,
+        type_id=type_id,
+        company_id=db_quotation.company_id,
+        date_op=convert.date_op or date.today(),
+        amount=db_quotation.amount,
+        tva_status=db_quotation.tva_status,
+        status=False,
+        has_heading=False,
+        has_po=False,
+        currency_used=db_quotation.currency_used,
+        locale_currency=db_quotation.locale_currency,
+    )
+    db.add(invoice)
+    db.flush()
+
+    # INSERT ... SELECT: one statement whatever the number of lines
+    db.execute(
+        insert(InvoiceProduct).from_select(
+            ["product_id", "invoice_id", "unit_price", "quantity"],
+            select(
+                QuotationProduct.product_id,
+                literal(invoice.id),
+                QuotationProduct.unit_price,
+                QuotationProduct.quantity,
+            ).where(
+                QuotationProduct.quotation_id == quotation_id,
+                QuotationProduct.status.isnot(False),
+            ),
+        )
+    )
+    db_quotation.invoice_id = invoice.id
+
+    db.commit()
+    db.refresh(invoice)
+    return invoice
+
+
 # Update
 @router.put(
     "/update/{quotation_id}",
@@ -77,25 +274,29 @@ def create_quotation(quotation: QuotationCreate, db: Session = Depends(get_db)):
 def update_quotation(
     quotation_id: int,
     quotation_update: QuotationUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
-    db_quotation = db.query(Quotation).filter(Quotation.id == quotation_id).first()
-    if not db_quotation:
-        raise HTTPException(status_code=404, detail="Data not found")
-
     update_data = quotation_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_quotation, key, value)
-
+    conditional_update(db, Quotation, quotation_id, update_data, if_match)
+    refresh_quotation_totals(db, quotation_id)
     db.commit()
-    db.refresh(db_quotation)
+
+    db_quotation = load_updated(db, Quotation, quotation_id, QuotationResponse)
+    response.headers["ETag"] = etag(db_quotation.version)
     return db_quotation
 
 
 # Delete
 @router.delete("/delete/{quotation_id}")
 def delete_quotation(quotation_id: int, db: Session = Depends(get_db)):
-    db_quotation = db.query(Quotation).filter(Quotation.id == quotation_id).first()
+    db_quotation = (
+        db.query(Quotation)
+        .execution_options(include_deleted=True)
+        .filter(Quotation.id == quotation_id)
+        .first()
+    )
     if not db_quotation:
         raise HTTPException(status_code=404, detail="Data not found")
 
@@ -9,8 +9,11 @@ from ..schemas import (
     QuotationProductResponse,
     QuotationProductCreate,
     QuotationProductUpdate,
+    BulkCreateResponse,
 )
 from typing import List
+from ..utils.bulk import bulk_insert
+from ..utils.document_totals import refresh_quotation_totals
 
 
 router = APIRouter(
@@ -60,11 +63,31 @@ def create_quotation_product(
 ):
     db_quotation_product = QuotationProduct(**quotation_product.model_dump())
     db.add(db_quotation_product)
+    db.flush()
+    refresh_quotation_totals(db, db_quotation_product.quotation_id)
     db.commit()
     db.refresh(db_quotation_product)
     return db_quotation_product
 
 
+# Create many in one statement
+@router.post(
+    "/create-bulk",
+    response_model=BulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_quotation_products(
+    quotation_products: List[QuotationProductCreate], db: Session = Depends(get_db)
+):
+    ids = bulk_insert(
+        db, QuotationProduct, [item.model_dump() for item in quotation_products]
+    )
+    for quotation_id in {item.quotation_id for item in quotation_products}:
+        refresh_quotation_totals(db, quotation_id)
+    db.commit()
+    return {"ids": ids}
+
+
 # Update
 @router.put("/update/{quotation_product_id}", response_model=QuotationProductResponse)
 def update_quotation_product(
@@ -84,6 +107,8 @@ def update_quotation_product(
     for key, value in update_data.items():
         setattr(db_quotation_product, key, value)
 
+    db.flush()
+    refresh_quotation_totals(db, db_quotation_product.quotation_id)
     db.commit()
     db.refresh(db_quotation_product)
     return db_quotation_product
@@ -101,5 +126,7 @@ def delete_quotation_product(quotation_product_id: int, db: Session = Depends(ge
         raise HTTPException(status_code=404, detail="Data not found")
 
     db.delete(db_quotation_product)
+    db.flush()
+    refresh_quotation_totals(db, db_quotation_product.quotation_id)
     db.commit()
     return {"ok": True, "message": "Data deleted"}
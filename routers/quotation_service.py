@@ -9,8 +9,11 @@ from ..schemas import (
     QuotationServiceResponse,
     QuotationServiceCreate,
     QuotationServiceUpdate,
+    BulkCreateResponse,
 )
 from typing import List
+from ..utils.bulk import bulk_insert
+from ..utils.document_totals import refresh_quotation_totals
 
 
 router = APIRouter(
@@ -60,11 +63,31 @@ def create_quotation_service(
 ):
     db_quotation_service = QuotationService(**quotation_service.model_dump())
     db.add(db_quotation_service)
+    db.flush()
+    refresh_quotation_totals(db, db_quotation_service.quotation_id)
     db.commit()
     db.refresh(db_quotation_service)
     return db_quotation_service
 
 
+# Create many in one statement
+@router.post(
+    "/create-bulk",
+    response_model=BulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_quotation_services(
+    quotation_services: List[QuotationServiceCreate], db: Session = Depends(get_db)
+):
+    ids = bulk_insert(
+        db, QuotationService, [item.model_dump() for item in quotation_services]
+    )
+    for quotation_id in {item.quotation_id for item in quotation_services}:
+        refresh_quotation_totals(db, quotation_id)
+    db.commit()
+    return {"ids": ids}
+
+
 # Update
 @router.put("/update/{quotation_service_id}", response_model=QuotationServiceResponse)
 def update_quotation_service(
@@ -84,6 +107,8 @@ def update_quotation_service(
     for key, value in update_data.items():
         setattr(db_quotation_service, key, value)
 
+    db.flush()
+    refresh_quotation_totals(db, db_quotation_service.quotation_id)
     db.commit()
     db.refresh(db_quotation_service)
     return db_quotation_service
@@ -91,15 +116,17 @@ def update_quotation_service(
 
 # Delete
 @router.delete("/delete/{quotation_service_id}")
-def delete_quotation_service(QuotationService: int, db: Session = Depends(get_db)):
+def delete_quotation_service(quotation_service_id: int, db: Session = Depends(get_db)):
     db_quotation_service = (
         db.query(QuotationService)
-        .filter(QuotationService.id == QuotationService)
+        .filter(QuotationService.id == quotation_service_id)
         .first()
     )
     if not db_quotation_service:
         raise HTTPException(status_code=404, detail="Data not found")
 
     db.delete(db_quotation_service)
+    db.flush()
+    refresh_quotation_totals(db, db_quotation_service.quotation_id)
     db.commit()
     return {"ok": True, "message": "Data deleted"}
@@ -1,12 +1,25 @@
 from typing import Annotated
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import exists, select, func, extract
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from starlette import status
-from ..models import Technician
+from datetime import date
+from ..models import (
+    Technician,
+    RoleTechnician,
+    JobAssign,
+    Invoice,
+    InvoiceTechnician,
+)
 from ..database import SessionLocal
-from ..schemas import TechnicianResponse, TechnicianCreate
-from typing import List
+from ..schemas import (
+    TechnicianResponse,
+    TechnicianCreate,
+    TechnicianTimesheetResponse,
+)
+from ..utils.scheduling import check_period, overlaps
+from ..utils.soft_delete import is_live
+from typing import List, Literal, Optional
 
 
 router = APIRouter(prefix="/technicians", tags=["Technicians"])
@@ -22,56 +35,165 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+# Hour columns (added together) and unit price of each billed category
+HOUR_CATEGORIES = {
+    "normal": (
+        InvoiceTechnician.normal_hour1,
+        InvoiceTechnician.normal_hour2,
+        InvoiceTechnician.normal_unit_price,
+    ),
+    "overtime": (
+        InvoiceTechnician.overtime_hour1,
+        InvoiceTechnician.overtime_hour2,
+        InvoiceTechnician.overtime_unit_price,
+    ),
+    "allowance": (
+        InvoiceTechnician.allowance_hour1,
+        InvoiceTechnician.allowance_hour2,
+        InvoiceTechnician.allowance_unit_price,
+    ),
+}
+
+TimesheetPeriod = Literal["day", "month", "year", "total"]
+
+
+def _timesheet_query(period: str, date_from, date_to, technician_id=None):
+    """Hours and billed amounts per technician (and period) on live invoices."""
+    columns = [Technician.id.label("technician_id"), Technician.name]
+    hours, amounts = [], []
+    for category, (hour1, hour2, unit_price) in HOUR_CATEGORIES.items():
+        category_hours = func.coalesce(hour1, 0) + func.coalesce(hour2, 0)
+        hours.append(func.sum(category_hours))
+        amounts.append(func.sum(category_hours * func.coalesce(unit_price, 0.0)))
+        columns.append(hours[-1].label(f"{category}_hours"))
+        columns.append(amounts[-1].label(f"{category}_amount"))
+
+    period_columns = {
+        "day": [Invoice.date_op.label("day")],
+        "month": [
+            extract("year", Invoice.date_op).label("year"),
+            extract("month", Invoice.date_op).label("month"),
+        ],
+        "year": [extract("year", Invoice.date_op).label("year")],
+        "total": [],
+    }[period]
+
+    query = (
+        select(
+            *columns,
+            *period_columns,
+            func.count(func.distinct(Invoice.id)).label("invoices"),
+            sum(hours[1:], hours[0]).label("total_hours"),
+            sum(amounts[1:], amounts[0]).label("billed_amount"),
+        )
+        .join(Invoice, InvoiceTechnician.invoice_id == Invoice.id)
+        .join(Technician, InvoiceTechnician.technician_id == Technician.id)
+        .where(is_live(Invoice))
+        .group_by(Technician.id, Technician.name, *period_columns)
+        .order_by(Technician.name, Technician.id, *period_columns)
+    )
+    if date_from is not None:
+        query = query.where(Invoice.date_op >= date_from)
+    if date_to is not None:
+        query = query.where(Invoice.date_op <= date_to)
+    if technician_id is not None:
+        query = query.where(InvoiceTechnician.technician_id == technician_id)
+    return query
+
+
+def _timesheet_row(row, period: str):
+    labels = {
+        "day": lambda: row["day"].isoformat(),
+        "month": lambda: f"{int(row['year']):04d}-{int(row['month']):02d}",
+        "year": lambda: f"{int(row['year']):04d}",
+        "total": lambda: None,
+    }
+    return {
+        **row,
+        "technician_name": row["name"],
+        "period": labels[period](),
+    }
+
+
+TECHNICIAN_COLUMNS = (
+    Technician.id,
+    Technician.name,
+    Technician.email,
+    Technician.phone,
+    RoleTechnician.id.label("role_id"),
+    RoleTechnician.role,
+)
+
+
+def _with_role(row):
+    role = {"id": row["role_id"], "role": row["role"]} if row["role_id"] else None
+    return {**row, "role": role}
+
 
 @router.get("/", response_model=List[TechnicianResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT T.*, R.id as role_id, R.role AS role FROM technicians T, technicians_roles R
-        WHERE T.role_id = R.id;
-    """
-        )
+    query = select(*TECHNICIAN_COLUMNS).outerjoin(
+        RoleTechnician, Technician.role_id == RoleTechnician.id
     )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "name": row.name,
-                "email": row.email,
-                "phone": row.phone,
-                "role": {"id": row.role_id, "role": row.role},
-            }
-        )
-    return data
+    return [_with_role(row) for row in db.execute(query).mappings()]
+
+
+@router.get("/available", response_model=List[TechnicianResponse])
+async def read_available_technicians(
+    db: db_dependency,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+):
+    check_period(date_from, date_to)
+    # One anti-join probing ix_jobs_assigns_technician_period per technician
+    busy = exists().where(
+        JobAssign.technician_id == Technician.id, overlaps(date_from, date_to)
+    )
+    return (
+        db.query(Technician)
+        .options(joinedload(Technician.role))
+        .filter(~busy)
+        .order_by(Technician.name)
+        .all()
+    )
+
+
+@router.get("/timesheet", response_model=List[TechnicianTimesheetResponse])
+async def read_timesheets(
+    db: db_dependency,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    period: TimesheetPeriod = "month",
+):
+    rows = db.execute(_timesheet_query(period, date_from, date_to)).mappings()
+    return [_timesheet_row(row, period) for row in rows]
+
+
+@router.get(
+    "/{technician_id}/timesheet", response_model=List[TechnicianTimesheetResponse]
+)
+async def read_technician_timesheet(
+    db: db_dependency,
+    technician_id: int = Path(gt=0),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    period: TimesheetPeriod = "month",
+):
+    query = _timesheet_query(period, date_from, date_to, technician_id)
+    return [_timesheet_row(row, period) for row in db.execute(query).mappings()]
 
 
 @router.get("/{technician_id}", response_model=TechnicianResponse)
 async def read_technician(db: db_dependency, technician_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM technicians
-        WHERE id = :technician_id
-    """
-        ),
-        {"technician_id": technician_id},
-    ).fetchone()
-
+    query = (
+        select(*TECHNICIAN_COLUMNS)
+        .outerjoin(RoleTechnician, Technician.role_id == RoleTechnician.id)
+        .where(Technician.id == technician_id)
+    )
+    result = db.execute(query).mappings().first()
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "name": result.name,
-        "email": result.email,
-        "phone": result.phone,
-        "role_id": result.role_id,
-    }
+    return _with_role(result)
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
@@ -1,6 +1,6 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
 from ..models import RoleTechnician
@@ -23,48 +23,20 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+ROLES = select(RoleTechnician.id, RoleTechnician.role)
+
+
 @router.get("/", response_model=List[TechnicianRoleResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT * FROM technicians_roles;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "role": row.role,
-            }
-        )
-    return data
+    return db.execute(ROLES).mappings().all()
 
 
 @router.get("/{role_id}", response_model=TechnicianRoleResponse)
-async def read_role(db: db_dependency, technician_role_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM technicians_roles
-        WHERE id = :technician_role_id
-    """
-        ),
-        {"technician_role_id": technician_role_id},
-    ).fetchone()
-
+async def read_role(db: db_dependency, role_id: int = Path(gt=0)):
+    result = db.execute(ROLES.where(RoleTechnician.id == role_id)).mappings().first()
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "role": result.role,
-    }
+    return result
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
@@ -1,6 +1,6 @@
 from typing import Annotated
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
 from ..models import Vendor
@@ -23,54 +23,20 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+VENDORS = select(Vendor.id, Vendor.name, Vendor.email, Vendor.phone, Vendor.address)
+
+
 @router.get("/", response_model=List[VendorResponse])
 async def read_all(db: db_dependency):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT * FROM vendors;
-    """
-        )
-    )
-    data = []
-    for row in result:
-        data.append(
-            {
-                "id": row.id,
-                "name": row.name,
-                "email": row.email,
-                "phone": row.phone,
-                "address": row.address,
-            }
-        )
-    return data
+    return db.execute(VENDORS).mappings().all()
 
 
 @router.get("/{vendor_id}", response_model=VendorResponse)
 async def read_vendor(db: db_dependency, vendor_id: int = Path(gt=0)):
-    # Query parcels with geometry as GeoJSON
-    result = db.execute(
-        text(
-            """
-        SELECT *
-        FROM vendors
-        WHERE id = :vendor_id
-    """
-        ),
-        {"vendor_id": vendor_id},
-    ).fetchone()
-
+    result = db.execute(VENDORS.where(Vendor.id == vendor_id)).mappings().first()
     if not result:
         raise HTTPException(status_code=404, detail="Data not found")
-
-    return {
-        "id": result.id,
-        "name": result.name,
-        "email": result.email,
-        "phone": result.phone,
-        "address": result.address,
-    }
+    return result
 
 
 @router.post("/create", status_code=status.HTTP_201_CREATED)
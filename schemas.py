@@ -174,9 +174,9 @@ class ProductInputCreate(ProductInputBase):
 class ProductInputResponse(ProductInputBase):
     id: int
     product_id: int
-    vendor_id: int
-    product: str
-    vendor: str
+    vendor_id: Optional[int] = None
+    product: Optional[str] = None
+    vendor: Optional[str] = None
     user_id: int
     quantity: float
     price: float
@@ -201,7 +201,7 @@ class ProductOutputCreate(ProductInputBase):
 class ProductOutputResponse(ProductInputBase):
     id: int
     product_id: int
-    product: str
+    product: Optional[str] = None
     user_id: int
     quantity: float
     price: float
@@ -334,6 +334,10 @@ class JobReportImageResponse(JobReportImageBase):
         from_attributes = True
 
 
+class JobReportWithImagesResponse(JobReportResponse):
+    images: Optional[List[JobReportImageResponse]] = None
+
+
 class CompanyDetailBase(BaseModel):
     name: str
     address: str
@@ -427,6 +431,10 @@ class PurchaseOrderUpdate(PurchaseOrderBase):
 
 class PurchaseOrderResponse(PurchaseOrderBase):
     id: int
+    version: Optional[int] = None
+    subtotal: Optional[float] = None
+    discount_amount: Optional[float] = None
+    tva_amount: Optional[float] = None
     vendor: Optional[VendorResponse]
     company: Optional[CompanyDetailResponse]
     products: Optional[List[PurchaseOrderProductResponse]] = []
@@ -538,6 +546,11 @@ class QuotationUpdate(QuotationBase):
 
 class QuotationResponse(QuotationBase):
     id: int
+    version: Optional[int] = None
+    invoice_id: Optional[int] = None
+    subtotal: Optional[float] = None
+    discount_amount: Optional[float] = None
+    tva_amount: Optional[float] = None
     type: Optional[QuotationTypeResponse]
     client: Optional[ClientResponse]
     company: Optional[CompanyDetailResponse]
@@ -694,6 +707,7 @@ class InvoiceUpdate(BaseModel):
 
 class InvoiceResponse(InvoiceBase):
     id: int
+    version: Optional[int] = None
     technicians: Optional[List[InvoiceTechnicianResponse]] = []
     products: Optional[List[InvoiceProductResponse]] = []
     jobs: Optional[List[InvoiceJobResponse]] = []
@@ -757,6 +771,7 @@ class PaymentUpdate(BaseModel):
 
 class PaymentResponse(PaymentBase):
     id: int
+    version: Optional[int] = None
     invoice: Optional[InvoiceResponse]
     company: Optional[CompanyDetailResponse]
     user: Optional[UserResponse]
@@ -775,6 +790,7 @@ class PaymentSimpleResponse(PaymentBase):
 
 class InvoicePaymentResponse(InvoiceBase):
     id: int
+    version: Optional[int] = None
     payments: Optional[List[PaymentSimpleResponse]] = []
     technicians: Optional[List[InvoiceTechnicianResponse]] = []
     products: Optional[List[InvoiceProductResponse]] = []
@@ -902,6 +918,7 @@ class TransactionUpdate(TransactionBase):
 
 class TransactionResponse(TransactionBase):
     id: int
+    version: Optional[int] = None
     cash: Optional[CashRegisterResponse]
     user: Optional[UserResponse]
 
@@ -965,9 +982,195 @@ class ExpenseTaskResponse(ExpenseTaskBase):
 
 class ExpenseResponse(ExpenseBase):
     id: int
+    version: Optional[int] = None
     invoice: Optional[InvoiceResponse]
     user: Optional[UserResponse]
     tasks: Optional[List[ExpenseTaskResponse]] = []
 
     class Config:
         from_attributes = True
+
+
+class BulkCreateResponse(BaseModel):
+    ids: List[int]
+
+
+# Whole documents (header + lines) created or replaced in one call
+
+
+class PurchaseOrderProductLine(BaseModel):
+    product_id: int
+    unit_price: float = 0.0
+    quantity: float = 0.0
+    status: Optional[bool] = True
+
+
+class PurchaseOrderDocumentCreate(PurchaseOrderBase):
+    reference: Optional[str] = None
+    products: List[PurchaseOrderProductLine] = []
+
+
+class PurchaseOrderDocumentUpdate(PurchaseOrderBase):
+    reference: Optional[str] = None
+    products: Optional[List[PurchaseOrderProductLine]] = None
+
+
+class QuotationProductLine(QuotationProductUpdate):
+    product_id: int
+
+
+class QuotationServiceLine(QuotationServiceUpdate):
+    service: str
+
+
+class QuotationDocumentCreate(QuotationBase):
+    reference: Optional[str] = None
+    products: List[QuotationProductLine] = []
+    services: List[QuotationServiceLine] = []
+
+
+class QuotationDocumentUpdate(QuotationBase):
+    reference: Optional[str] = None
+    products: Optional[List[QuotationProductLine]] = None
+    services: Optional[List[QuotationServiceLine]] = None
+
+
+class InvoiceProductLine(InvoiceProductUpdate):
+    product_id: int
+
+
+class InvoiceTechnicianLine(InvoiceTechnicianUpdate):
+    technician_id: int
+
+
+class InvoiceJobLine(BaseModel):
+    job_id: int
+
+
+class InvoiceDocumentCreate(InvoiceBase):
+    reference: Optional[str] = None
+    products: List[InvoiceProductLine] = []
+    technicians: List[InvoiceTechnicianLine] = []
+    jobs: List[InvoiceJobLine] = []
+
+
+class InvoiceDocumentUpdate(InvoiceUpdate):
+    products: Optional[List[InvoiceProductLine]] = None
+    technicians: Optional[List[InvoiceTechnicianLine]] = None
+    jobs: Optional[List[InvoiceJobLine]] = None
+
+
+class QuotationConvert(BaseModel):
+    type_id: Optional[int] = None
+    user_id: Optional[int] = None
+    date_op: Optional[date] = None
+
+
+class InvoiceReceivableResponse(BaseModel):
+    id: int
+    reference: str
+    client_id: Optional[int]
+    date_op: date
+    amount: float
+    paid: float
+    balance: float
+    age_days: int
+    aging_bucket: str
+
+
+class ClientStatementLine(BaseModel):
+    date_op: date
+    kind: str
+    id: int
+    reference: str
+    debit: float
+    credit: float
+    balance: float
+
+
+class ClientStatementResponse(BaseModel):
+    client_id: int
+    date_from: Optional[date]
+    date_to: Optional[date]
+    opening_balance: float
+    closing_balance: float
+    lines: List[ClientStatementLine]
+
+
+class CashJournalLine(BaseModel):
+    id: int
+    type: Optional[str]
+    amount: float
+    description: Optional[str]
+    date: date
+    user_id: Optional[int]
+    balance: float
+
+
+class CashJournalResponse(BaseModel):
+    cash_id: int
+    date: date
+    status: Optional[str]
+    opening_balance: float
+    closing_balance: float
+    lines: List[CashJournalLine]
+
+
+class CashSnapshotResponse(BaseModel):
+    id: int
+    cash_id: int
+    date: date
+    opening_balance: float
+    total_in: float
+    total_out: float
+    closing_balance: float
+
+    class Config:
+        from_attributes = True
+
+
+class CalendarAssignment(BaseModel):
+    id: int
+    job_id: int
+    job_name: str
+    status: Optional[bool]
+    date_start: date
+    date_end: date
+
+
+class CalendarDay(BaseModel):
+    date: date
+    assignments: List[CalendarAssignment]
+
+
+class TechnicianCalendarResponse(BaseModel):
+    technician_id: int
+    technician_name: str
+    days: List[CalendarDay]
+
+
+class JobProfitabilityResponse(BaseModel):
+    job_id: int
+    job_name: str
+    price: Optional[float]
+    labour_cost: float
+    expense_cost: float
+    total_cost: float
+    invoiced: float
+    margin: float
+    margin_rate: Optional[float]
+
+
+class TechnicianTimesheetResponse(BaseModel):
+    technician_id: int
+    technician_name: str
+    period: Optional[str]
+    invoices: int
+    normal_hours: float
+    overtime_hours: float
+    allowance_hours: float
+    total_hours: float
+    normal_amount: float
+    overtime_amount: float
+    allowance_amount: float
+    billed_amount: float
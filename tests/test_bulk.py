@@ -0,0 +1,75 @@
+import os
+import unittest
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import PurchaseOrder, PurchaseOrderProduct
+from ..routers.purchase_order_product import create_purchase_order_products
+from ..schemas import PurchaseOrderProductCreate
+from ..utils.bulk import bulk_insert
+
+
+class BulkInsertTest(unittest.TestCase):
+    url = "sqlite://"
+
+    def setUp(self):
+        engine = create_engine(self.url, poolclass=StaticPool)
+        run_migrations(engine)
+        self.statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        purchase_order = PurchaseOrder(
+            reference="PO-1", vendor_id=1, user_id=1, date_op=date(2025, 1, 2)
+        )
+        self.db.add(purchase_order)
+        self.db.commit()
+        self.po_id = purchase_order.id
+
+    def lines(self, count: int):
+        return [
+            {"po_id": self.po_id, "product_id": n, "unit_price": 2.0, "quantity": n}
+            for n in range(1, count + 1)
+        ]
+
+    def test_ids_follow_the_rows(self):
+        self.statements.clear()
+        ids = bulk_insert(self.db, PurchaseOrderProduct, self.lines(40))
+        self.db.commit()
+
+        inserts = [s for s in self.statements if s.lstrip().startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        stored = dict(
+            self.db.query(PurchaseOrderProduct.id, PurchaseOrderProduct.product_id)
+        )
+        self.assertEqual([stored[id] for id in ids], list(range(1, 41)))
+
+    def test_nothing_to_insert(self):
+        self.statements.clear()
+        self.assertEqual(bulk_insert(self.db, PurchaseOrderProduct, []), [])
+        self.assertEqual(self.statements, [])
+
+    def test_create_bulk_route(self):
+        products = [PurchaseOrderProductCreate(**line) for line in self.lines(3)]
+        result = create_purchase_order_products(products, self.db)
+
+        self.assertEqual(len(result["ids"]), 3)
+        purchase_order = self.db.get(PurchaseOrder, self.po_id)
+        self.db.refresh(purchase_order)
+        # The header totals follow the new lines: 2 * (1 + 2 + 3)
+        self.assertEqual(purchase_order.subtotal, 12.0)
+
+
+@unittest.skipUnless(
+    os.getenv("TEST_MYSQL_URL"), "TEST_MYSQL_URL points to an empty MySQL database"
+)
+class MySQLBulkInsertTest(BulkInsertTest):
+    """No RETURNING on MySQL: ids derived from LAST_INSERT_ID()."""
+
+    url = os.getenv("TEST_MYSQL_URL", "")
@@ -0,0 +1,192 @@
+import asyncio
+import unittest
+from datetime import date
+from unittest import mock
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import CashRegister, CashSnapshot, Transaction
+from ..routers import cash
+from ..schemas import TransactionCreate
+
+
+class CashTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+
+    def add_register(self, day: date, opening_balance: float, **columns):
+        register = CashRegister(date=day, opening_balance=opening_balance, **columns)
+        self.db.add(register)
+        self.db.flush()
+        return register
+
+    def move(self, register, kind: str, amount: float, day: date = None):
+        self.db.add(
+            Transaction(
+                type=kind, amount=amount, date=day or register.date, cash_id=register.id
+            )
+        )
+
+
+class CashJournalTest(CashTest):
+    def test_running_balance_from_the_opening_balance(self):
+        register = self.add_register(date(2025, 3, 1), 100)
+        self.move(register, "in", 50, date(2025, 3, 2))
+        # Earlier date, later id: the journal goes by date first
+        self.move(register, "out", 30, date(2025, 3, 1))
+        self.move(register, "in", 5, date(2025, 3, 2))
+        self.db.commit()
+
+        journal = asyncio.run(cash.read_cash_journal(self.db, register.id))
+
+        self.assertEqual(
+            [(line["type"], line["balance"]) for line in journal["lines"]],
+            [("out", 70.0), ("in", 120.0), ("in", 125.0)],
+        )
+        self.assertEqual(journal["closing_balance"], 125.0)
+
+    def test_empty_journal_closes_on_the_opening_balance(self):
+        register = self.add_register(date(2025, 3, 1), 100)
+        self.db.commit()
+
+        journal = asyncio.run(cash.read_cash_journal(self.db, register.id))
+
+        self.assertEqual((journal["lines"], journal["closing_balance"]), ([], 100))
+
+    def test_unknown_register(self):
+        with self.assertRaises(HTTPException) as raised:
+            asyncio.run(cash.read_cash_journal(self.db, 1))
+
+        self.assertEqual(raised.exception.status_code, 404)
+
+    def test_close_writes_the_daily_snapshot(self):
+        register = self.add_register(date(2025, 3, 1), 100)
+        self.move(register, "in", 50)
+        self.move(register, "out", 30)
+        self.move(register, "out", 5)
+        self.db.commit()
+
+        self.assertEqual(
+            cash.close_cash(self.db), {"closing_balance": 115.0, "status": "closed"}
+        )
+
+        snapshot = asyncio.run(cash.read_cash_snapshot(self.db, date(2025, 3, 1)))
+        self.assertEqual(
+            (snapshot.total_in, snapshot.total_out, snapshot.closing_balance),
+            (50.0, 35.0, 115.0),
+        )
+        self.assertEqual(snapshot.cash_id, register.id)
+
+    def test_snapshots_by_range(self):
+        for day, closing_balance in [(1, 10), (2, 20), (3, 30)]:
+            register = self.add_register(date(2025, 3, day), 0, status="closed")
+            self.db.add(
+                CashSnapshot(
+                    cash_id=register.id,
+                    date=register.date,
+                    opening_balance=0,
+                    closing_balance=closing_balance,
+                )
+            )
+        self.db.commit()
+
+        snapshots = asyncio.run(
+            cash.read_cash_snapshots(self.db, date(2025, 3, 2), date(2025, 3, 3))
+        )
+
+        self.assertEqual([s.closing_balance for s in snapshots], [20.0, 30.0])
+        with self.assertRaises(HTTPException) as raised:
+            asyncio.run(cash.read_cash_snapshot(self.db, date(2025, 3, 4)))
+        self.assertEqual(raised.exception.status_code, 404)
+
+
+class CashRegisterOpenCloseTest(CashTest):
+    def test_opening_twice_returns_the_same_register(self):
+        first = cash.open_cash(100, self.db)
+        second = cash.open_cash(500, self.db)
+
+        self.assertEqual(second.id, first.id)
+        self.assertEqual(second.opening_balance, 100)
+        self.assertEqual(self.db.query(CashRegister).count(), 1)
+
+    def test_opening_closes_the_previous_register(self):
+        previous = self.add_register(date(2025, 3, 1), 100)
+        self.move(previous, "in", 40)
+        self.db.commit()
+
+        today = cash.open_cash(0, self.db)
+
+        self.db.refresh(previous)
+        self.assertEqual((previous.status, previous.closing_balance), ("closed", 140))
+        self.assertEqual(today.opening_balance, 140)
+        self.assertEqual(self.db.query(CashSnapshot).count(), 1)
+
+    def test_opening_carries_the_last_closing_balance(self):
+        self.add_register(date(2025, 3, 1), 0, status="closed", closing_balance=75)
+        self.db.commit()
+
+        self.assertEqual(cash.open_cash(0, self.db).opening_balance, 75)
+
+    def test_closing_twice_returns_the_closed_state(self):
+        cash.open_cash(100, self.db)
+
+        first = cash.close_cash(self.db)
+        second = cash.close_cash(self.db)
+
+        self.assertEqual(first, {"closing_balance": 100, "status": "closed"})
+        self.assertEqual(second, first)
+        self.assertEqual(self.db.query(CashSnapshot).count(), 1)
+
+    def test_closing_without_any_register(self):
+        with self.assertRaises(HTTPException) as raised:
+            cash.close_cash(self.db)
+
+        self.assertEqual(raised.exception.status_code, 404)
+
+    def test_closed_register_refuses_movements(self):
+        register = self.add_register(date(2025, 3, 1), 0, status="closed")
+        self.move(register, "in", 10)
+        self.db.commit()
+        movement = TransactionCreate(
+            type="in", amount=5, date=date(2025, 3, 1), cash_id=register.id, user_id=1
+        )
+
+        for call in [
+            cash.create_transaction(self.db, movement),
+            cash.update_transaction(self.db, movement, Response(), 1),
+            cash.delete_transaction(self.db, 1),
+        ]:
+            with self.subTest(call=call.__name__):
+                with self.assertRaises(HTTPException) as raised:
+                    asyncio.run(call)
+                self.assertEqual(raised.exception.status_code, 409)
+                self.db.rollback()
+        self.assertEqual(self.db.query(Transaction.amount).scalar(), 10)
+
+    def test_lost_lock_race_answers_409(self):
+        deadlock = OperationalError("SELECT", {}, Exception(1213, "Deadlock found"))
+
+        with mock.patch.object(cash, "_lock_open_register", side_effect=deadlock):
+            for name, route in [
+                ("open", lambda: cash.open_cash(0, self.db)),
+                ("close", lambda: cash.close_cash(self.db)),
+            ]:
+                with self.subTest(route=name):
+                    with self.assertRaises(HTTPException) as raised:
+                        route()
+                    self.assertEqual(raised.exception.status_code, 409)
+
+    def test_other_operational_errors_propagate(self):
+        gone = OperationalError(
+            "SELECT", {}, Exception(2006, "MySQL server has gone away")
+        )
+
+        with mock.patch.object(cash, "_lock_open_register", side_effect=gone):
+            with self.assertRaises(OperationalError):
+                cash.open_cash(0, self.db)
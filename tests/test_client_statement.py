@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Client, Invoice, Payment
+from ..routers.clients import read_client_statement
+
+
+class ClientStatementTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        self.db.add_all(
+            [Client(name="Acme", address="Douala"), Client(name="Other", address="")]
+        )
+        self.db.flush()
+        january = self.add_invoice("INV-1", date(2025, 1, 10), 100)
+        self.pay(january, "PAY-1", date(2025, 1, 20), 60)
+        february = self.add_invoice("INV-2", date(2025, 2, 5), 50)
+        # Paid on the invoice's day: listed after it
+        self.pay(february, "PAY-2", date(2025, 2, 5), 20)
+        self.pay(february, "PAY-3", date(2025, 3, 1), 30)
+        # Neither deleted documents nor other clients' ones show
+        deleted = self.add_invoice("INV-3", date(2025, 2, 6), 999, on_delete=True)
+        self.pay(deleted, "PAY-4", date(2025, 2, 7), 999)
+        self.pay(january, "PAY-5", date(2025, 2, 8), 999, on_delete=True)
+        self.add_invoice("INV-4", date(2025, 2, 9), 999, client_id=2)
+        self.db.commit()
+
+    def add_invoice(self, reference, date_op, amount, client_id=1, **columns):
+        invoice = Invoice(
+            reference=reference,
+            client_id=client_id,
+            user_id=1,
+            date_op=date_op,
+            amount=amount,
+            **columns,
+        )
+        self.db.add(invoice)
+        self.db.flush()
+        return invoice
+
+    def pay(self, invoice, reference, date_op, amount, **columns):
+        self.db.add(
+            Payment(
+                reference=reference,
+                invoice_id=invoice.id,
+                date_op=date_op,
+                amount=amount,
+                **columns,
+            )
+        )
+
+    def statement(self, client_id=1, date_from=None, date_to=None):
+        return asyncio.run(
+            read_client_statement(self.db, client_id, date_from, date_to)
+        )
+
+    def test_full_ledger(self):
+        statement = self.statement()
+
+        self.assertEqual(
+            [(line["reference"], line["balance"]) for line in statement["lines"]],
+            [
+                ("INV-1", 100.0),
+                ("PAY-1", 40.0),
+                ("INV-2", 90.0),
+                ("PAY-2", 70.0),
+                ("PAY-3", 40.0),
+            ],
+        )
+        self.assertEqual(statement["opening_balance"], 0.0)
+        self.assertEqual(statement["closing_balance"], 40.0)
+
+    def test_range_starts_from_the_opening_balance(self):
+        statement = self.statement(
+            date_from=date(2025, 2, 1), date_to=date(2025, 2, 28)
+        )
+
+        self.assertEqual(statement["opening_balance"], 40.0)
+        self.assertEqual(
+            [(line["reference"], line["balance"]) for line in statement["lines"]],
+            [("INV-2", 90.0), ("PAY-2", 70.0)],
+        )
+        self.assertEqual(statement["closing_balance"], 70.0)
+
+    def test_empty_range_closes_on_the_opening_balance(self):
+        statement = self.statement(date_from=date(2025, 4, 1))
+
+        self.assertEqual(statement["lines"], [])
+        self.assertEqual(statement["closing_balance"], 40.0)
+
+    def test_unknown_client(self):
+        with self.assertRaises(HTTPException) as raised:
+            self.statement(client_id=99)
+
+        self.assertEqual(raised.exception.status_code, 404)
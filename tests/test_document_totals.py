@@ -0,0 +1,195 @@
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import (
+    PurchaseOrder,
+    PurchaseOrderProduct,
+    Quotation,
+    QuotationProduct,
+    QuotationService,
+)
+from ..routers.quotation_product import (
+    create_quotation_product,
+    delete_quotation_product,
+    update_quotation_product,
+)
+from ..schemas import QuotationProductCreate, QuotationProductUpdate
+from ..utils.document_totals import (
+    TVA_RATE,
+    refresh_purchase_order_totals,
+    refresh_quotation_totals,
+)
+
+
+class DocumentTotalsTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+
+    def add_quotation(self, reference: str, **columns):
+        quotation = Quotation(
+            reference=reference,
+            client_id=4,
+            user_id=1,
+            company_id=1,
+            date_op=date(2025, 1, 2),
+            **columns,
+        )
+        self.db.add(quotation)
+        self.db.flush()
+        return quotation
+
+    def refreshed(self, quotation):
+        self.db.flush()
+        refresh_quotation_totals(self.db, quotation.id)
+        self.db.commit()
+        self.db.refresh(quotation)
+        return quotation
+
+    def test_quotation_totals(self):
+        quotation = self.add_quotation(
+            "PRO-1",
+            discount_status=True,
+            discount_percent=10,
+            tva_status=True,
+            delivery_status=True,
+            delivery_amount=4,
+        )
+        self.db.add_all(
+            [
+                QuotationProduct(
+                    quotation_id=quotation.id, product_id=1, unit_price=10, quantity=2
+                ),
+                QuotationService(
+                    quotation_id=quotation.id,
+                    service="Setup",
+                    unit_price=30,
+                    quantity=1,
+                ),
+                # Struck out lines don't count
+                QuotationService(
+                    quotation_id=quotation.id,
+                    service="Travel",
+                    unit_price=50,
+                    quantity=1,
+                    status=False,
+                ),
+            ]
+        )
+
+        quotation = self.refreshed(quotation)
+
+        self.assertEqual(quotation.subtotal, 50.0)
+        self.assertEqual(quotation.discount_amount, 5.0)
+        self.assertAlmostEqual(quotation.tva_amount, 45 * TVA_RATE)
+        self.assertAlmostEqual(quotation.amount, 45 * (1 + TVA_RATE) + 4)
+
+    def test_flags_off_leave_the_subtotal(self):
+        quotation = self.add_quotation(
+            "PRO-1", discount_percent=10, delivery_amount=4, tva_status=False
+        )
+        self.db.add(
+            QuotationProduct(
+                quotation_id=quotation.id, product_id=1, unit_price=10, quantity=2
+            )
+        )
+
+        quotation = self.refreshed(quotation)
+
+        self.assertEqual(
+            (quotation.discount_amount, quotation.tva_amount, quotation.amount),
+            (0.0, 0.0, 20.0),
+        )
+
+    def test_line_routes_keep_the_header_in_step(self):
+        quotation = self.add_quotation("PRO-1")
+        self.db.commit()
+
+        line = create_quotation_product(
+            QuotationProductCreate(
+                product_id=1,
+                quotation_id=quotation.id,
+                market_price=None,
+                unit_price=10,
+                quantity=2,
+                status=True,
+            ),
+            self.db,
+        )
+        self.db.refresh(quotation)
+        self.assertEqual(quotation.amount, 20.0)
+
+        update_quotation_product(
+            line.id,
+            QuotationProductUpdate(
+                market_price=None, unit_price=10, quantity=5, status=True
+            ),
+            self.db,
+        )
+        self.db.refresh(quotation)
+        self.assertEqual(quotation.amount, 50.0)
+
+        delete_quotation_product(line.id, self.db)
+        self.db.refresh(quotation)
+        self.assertEqual(quotation.amount, 0.0)
+
+    def test_lists_sort_and_filter_by_the_sql_total(self):
+        small, large, empty = (
+            self.add_quotation(reference) for reference in ("PRO-1", "PRO-2", "PRO-3")
+        )
+        for quotation, quantity in [(small, 1), (large, 9)]:
+            self.db.add(
+                QuotationProduct(
+                    quotation_id=quotation.id,
+                    product_id=1,
+                    unit_price=10,
+                    quantity=quantity,
+                )
+            )
+        self.db.commit()
+
+        ordered = self.db.query(Quotation.reference).order_by(
+            Quotation.computed_amount.desc()
+        )
+        self.assertEqual([ref for ref, in ordered], ["PRO-2", "PRO-1", "PRO-3"])
+        above = self.db.query(Quotation.id).filter(Quotation.computed_amount > 50)
+        self.assertEqual([id for id, in above], [large.id])
+
+    def test_purchase_order_sql_total_matches_the_python_one(self):
+        purchase_order = PurchaseOrder(
+            reference="PO-1",
+            vendor_id=1,
+            user_id=1,
+            date_op=date(2025, 1, 2),
+            shipping_status=True,
+            shipping_amount=7,
+        )
+        self.db.add(purchase_order)
+        self.db.flush()
+        self.db.add_all(
+            [
+                PurchaseOrderProduct(
+                    po_id=purchase_order.id, product_id=1, unit_price=3, quantity=4
+                ),
+                PurchaseOrderProduct(
+                    po_id=purchase_order.id,
+                    product_id=2,
+                    unit_price=100,
+                    quantity=1,
+                    status=False,
+                ),
+            ]
+        )
+        self.db.flush()
+        refresh_purchase_order_totals(self.db, purchase_order.id)
+        self.db.commit()
+        self.db.refresh(purchase_order)
+
+        self.assertEqual(purchase_order.computed_amount, 12.0)
+        self.assertEqual(purchase_order.subtotal, 12.0)
+        self.assertEqual(purchase_order.amount, 19.0)
@@ -0,0 +1,180 @@
+import asyncio
+import unittest
+from datetime import date
+from unittest import mock
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import (
+    Invoice,
+    InvoiceJob,
+    InvoiceProduct,
+    InvoiceTechnician,
+    PurchaseOrder,
+    PurchaseOrderProduct,
+)
+from ..routers import invoice as invoice_router
+from ..routers import purchase_order as purchase_order_router
+from ..schemas import (
+    InvoiceDocumentCreate,
+    PurchaseOrderDocumentCreate,
+    PurchaseOrderDocumentUpdate,
+)
+
+TODAY = date.today()
+
+
+def _session():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    run_migrations(engine)
+    return SessionLocal(bind=engine)
+
+
+def _purchase_order(**body):
+    return {
+        "vendor_id": 1,
+        "user_id": 1,
+        "company_id": 1,
+        "date_op": TODAY,
+        **body,
+    }
+
+
+def _line(product_id: int, unit_price: float, quantity: float):
+    return {"product_id": product_id, "unit_price": unit_price, "quantity": quantity}
+
+
+class PurchaseOrderDocumentTest(unittest.TestCase):
+    def setUp(self):
+        self.db = _session()
+        self.addCleanup(self.db.close)
+
+    def create(self, **body):
+        return purchase_order_router.create_purchase_order_document(
+            PurchaseOrderDocumentCreate(**_purchase_order(**body)), self.db
+        )
+
+    def replace(self, po_id: int, if_match=None, **body):
+        response = Response()
+        result = purchase_order_router.replace_purchase_order_document(
+            po_id,
+            PurchaseOrderDocumentUpdate(**_purchase_order(**body)),
+            response,
+            self.db,
+            if_match,
+        )
+        return result, response
+
+    def lines(self, po_id: int):
+        return sorted(
+            self.db.query(
+                PurchaseOrderProduct.product_id, PurchaseOrderProduct.quantity
+            )
+            .filter(PurchaseOrderProduct.po_id == po_id)
+            .all()
+        )
+
+    def test_create_allocates_the_reference_and_saves_the_lines(self):
+        db_po = self.create(
+            reference="ignored", products=[_line(1, 10, 2), _line(2, 5, 1)]
+        )
+
+        self.assertEqual(db_po.reference, f"PO-{TODAY.year}-001")
+        self.assertEqual(self.lines(db_po.id), [(1, 2), (2, 1)])
+        self.assertEqual(db_po.amount, 25.0)
+        self.assertEqual(self.create().reference, f"PO-{TODAY.year}-002")
+
+    def test_failed_lines_leave_no_header(self):
+        with mock.patch.object(
+            purchase_order_router,
+            "insert_lines",
+            side_effect=RuntimeError("lost connection"),
+        ):
+            with self.assertRaises(RuntimeError):
+                self.create(products=[_line(1, 10, 2)])
+        self.db.rollback()
+
+        self.assertEqual(self.db.query(PurchaseOrder).count(), 0)
+
+    def test_replace_swaps_the_lines_and_keeps_the_reference(self):
+        db_po = self.create(products=[_line(1, 10, 2), _line(2, 5, 1)])
+
+        result, response = self.replace(
+            db_po.id, '"1"', reference="PO-OTHER", products=[_line(3, 4, 3)]
+        )
+
+        self.assertEqual(result.reference, f"PO-{TODAY.year}-001")
+        self.assertEqual(self.lines(db_po.id), [(3, 3)])
+        self.assertEqual(result.amount, 12.0)
+        self.assertEqual(response.headers["ETag"], '"2"')
+
+    def test_replace_without_products_keeps_the_lines(self):
+        db_po = self.create(products=[_line(1, 10, 2)])
+
+        result, _ = self.replace(db_po.id, shipping_status=True, shipping_amount=3)
+
+        self.assertEqual(self.lines(db_po.id), [(1, 2)])
+        self.assertEqual(result.amount, 23.0)
+
+    def test_stale_replace_changes_nothing(self):
+        db_po = self.create(products=[_line(1, 10, 2)])
+        self.replace(db_po.id, '"1"', products=[_line(2, 1, 1)])
+
+        with self.assertRaises(HTTPException) as raised:
+            self.replace(db_po.id, '"1"', products=[_line(3, 1, 1)])
+        self.db.rollback()
+
+        self.assertEqual(raised.exception.status_code, 412)
+        self.assertEqual(self.lines(db_po.id), [(2, 1)])
+
+
+class InvoiceDocumentTest(unittest.TestCase):
+    def setUp(self):
+        self.db = _session()
+        self.addCleanup(self.db.close)
+
+    def create(self, **lines):
+        body = InvoiceDocumentCreate(
+            client_id=4,
+            user_id=1,
+            type_id=None,
+            company_id=1,
+            date_op=TODAY,
+            **lines,
+        )
+        return asyncio.run(invoice_router.create_invoice_document(self.db, body))
+
+    def test_header_products_technicians_and_jobs_together(self):
+        invoice = self.create(
+            products=[_line(1, 10, 2)],
+            technicians=[{"technician_id": 7, "normal_hour1": 8}],
+            jobs=[{"job_id": 3}, {"job_id": 5}],
+        )
+
+        self.assertEqual(invoice.reference[:4], "INV-")
+        for model, count in [(InvoiceProduct, 1), (InvoiceTechnician, 1)]:
+            with self.subTest(model=model.__name__):
+                self.assertEqual(
+                    self.db.query(model).filter_by(invoice_id=invoice.id).count(),
+                    count,
+                )
+        jobs = self.db.query(InvoiceJob.job_id).filter_by(invoice_id=invoice.id)
+        self.assertEqual(sorted(job_id for job_id, in jobs), [3, 5])
+
+    def test_failed_jobs_leave_no_partial_invoice(self):
+        insert_lines = invoice_router.insert_lines
+
+        def fail_on_jobs(db, model, *args):
+            if model is InvoiceJob:
+                raise RuntimeError("lost connection")
+            return insert_lines(db, model, *args)
+
+        with mock.patch.object(invoice_router, "insert_lines", fail_on_jobs):
+            with self.assertRaises(RuntimeError):
+                self.create(products=[_line(1, 10, 2)], jobs=[{"job_id": 3}])
+        self.db.rollback()
+
+        self.assertEqual(self.db.query(Invoice).count(), 0)
+        self.assertEqual(self.db.query(InvoiceProduct).count(), 0)
@@ -0,0 +1,96 @@
+from unittest import mock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from ..routers import files
+from ..utils.images import render_variants, variant_name
+from ..utils.storage import REPORT_IMAGES
+from .test_images import _photo
+from .test_uploads import UploadStorageTest
+
+
+class ReadFileTest(UploadStorageTest):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(files, "UPLOAD_ROOT", self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        app = FastAPI()
+        app.include_router(files.router)
+        self.client = TestClient(app)
+        self.content = _photo(800, 600)
+        self.path = self.store(self.content, "photo.png")
+
+    def get(self, path: str, **kwargs):
+        return self.client.get(f"/files/{path}", **kwargs)
+
+    def test_content_addressed_files_are_immutable(self):
+        response = self.get(self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.content)
+        self.assertEqual(response.headers["content-type"], "image/png")
+        self.assertEqual(response.headers["cache-control"], files.IMMUTABLE)
+        self.assertEqual(response.headers["x-content-type-options"], "nosniff")
+        self.assertIn("etag", response.headers)
+
+    def test_range_requests(self):
+        response = self.get(self.path, headers={"Range": "bytes=0-7"})
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, self.content[:8])
+        self.assertEqual(
+            response.headers["content-range"], f"bytes 0-7/{len(self.content)}"
+        )
+
+    def test_missing_variant_falls_back_to_an_uncached_original(self):
+        response = self.get(self.path, params={"size": "thumb"})
+
+        self.assertEqual(response.content, self.content)
+        self.assertEqual(response.headers["cache-control"], "no-cache")
+
+        render_variants(str(self.root / self.path))
+        response = self.get(self.path, params={"size": "thumb"})
+
+        thumb = (self.root / variant_name(self.path, "thumb")).read_bytes()
+        self.assertEqual(response.content, thumb)
+        self.assertEqual(response.headers["content-type"], "image/jpeg")
+        self.assertEqual(response.headers["cache-control"], files.IMMUTABLE)
+
+    def test_unnamed_by_content_is_not_immutable(self):
+        (self.root / REPORT_IMAGES / "logo.png").write_bytes(self.content)
+
+        response = self.get(f"{REPORT_IMAGES}/logo.png")
+
+        self.assertEqual(response.headers["cache-control"], "no-cache")
+
+    def test_other_types_are_downloads(self):
+        (self.root / "receipt.svg").write_text("<svg><script/></svg>")
+
+        response = self.get("receipt.svg")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response.headers["content-disposition"].startswith("attachment")
+        )
+
+    def test_nothing_outside_the_stored_files(self):
+        (self.root / REPORT_IMAGES / ".upload.part").write_bytes(self.content)
+        for path in [
+            f"{REPORT_IMAGES}/missing.png",
+            f"{REPORT_IMAGES}/.upload.part",
+            REPORT_IMAGES,
+            "../../etc/passwd",
+            "%2E%2E/%2E%2E/etc/passwd",
+        ]:
+            with self.subTest(path=path):
+                self.assertEqual(self.get(path).status_code, 404)
+        # Clients normalise `..` away, the route must not rely on it
+        outside = self.root.parent / "secret.png"
+        outside.write_bytes(self.content)
+        self.addCleanup(outside.unlink)
+        self.assertEqual(files._locate("../secret.png", "original"), (None, False))
+
+    def test_unknown_size(self):
+        response = self.get(self.path, params={"size": "huge"})
+
+        self.assertEqual(response.status_code, 422)
@@ -0,0 +1,122 @@
+import unittest
+from unittest import mock
+from fastapi import FastAPI, File, Response, UploadFile
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
+from .. import database
+from ..migrations import run_migrations
+from ..utils import idempotency
+from ..utils.idempotency import IdempotencyMiddleware
+
+
+class Thing(BaseModel):
+    name: str
+
+
+def _app(calls: list):
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware)
+
+    @app.post("/things/create", status_code=201)
+    async def create_thing(thing: Thing, response: Response):
+        calls.append(thing.name)
+        response.headers["ETag"] = '"1"'
+        return {"id": len(calls), "name": thing.name}
+
+    @app.post("/images/create", status_code=201)
+    async def create_image(file: UploadFile = File()):
+        content = await file.read()
+        calls.append(content)
+        return {"id": len(calls), "size": len(content)}
+
+    return app
+
+
+class IdempotencyTest(unittest.TestCase):
+    def setUp(self):
+        # Shared with the threadpool running the middleware's queries
+        engine = create_engine(
+            "sqlite://",
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+        run_migrations(engine)
+        patcher = mock.patch.object(database, "engine", engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = []
+        self.client = TestClient(_app(self.calls))
+
+    def post(self, key: str, **kwargs):
+        path = "/images/create" if "files" in kwargs else "/things/create"
+        return self.client.post(path, headers={"Idempotency-Key": key}, **kwargs)
+
+    def test_retry_replays_the_first_response(self):
+        first = self.post("k1", json={"name": "a"})
+        retry = self.post("k1", json={"name": "a"})
+
+        self.assertEqual(self.calls, ["a"])
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.headers["ETag"], '"1"')
+        self.assertEqual(retry.headers["Content-Type"], "application/json")
+
+    def test_other_body_with_the_same_key_is_rejected(self):
+        self.post("k1", json={"name": "a"})
+        retry = self.post("k1", json={"name": "b"})
+
+        self.assertEqual(retry.status_code, 422)
+        self.assertEqual(self.calls, ["a"])
+
+    def test_rejected_request_can_be_corrected_with_the_same_key(self):
+        invalid = self.post("k1", json={"title": "a"})
+        corrected = self.post("k1", json={"name": "a"})
+
+        self.assertEqual(invalid.status_code, 422)
+        self.assertEqual(corrected.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", corrected.headers)
+        self.assertEqual(self.calls, ["a"])
+
+    def test_multipart_retry_with_a_new_boundary_is_replayed(self):
+        # httpx draws a new random boundary for every request
+        first = self.post("k1", files={"file": ("a.jpg", b"same bytes")})
+        retry = self.post("k1", files={"file": ("a.jpg", b"same bytes")})
+        other = self.post("k1", files={"file": ("a.jpg", b"other bytes")})
+
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(other.status_code, 422)
+        self.assertEqual(self.calls, [b"same bytes"])
+
+    def test_request_in_flight_gets_a_409(self):
+        idempotency._claim(idempotency._key_hash("POST", "/things/create", b"k1"))
+        retry = self.post("k1", json={"name": "a"})
+
+        self.assertEqual(retry.status_code, 409)
+        self.assertEqual(self.calls, [])
+
+    def test_claim_lost_to_an_unseen_insert_is_not_owned(self):
+        # The concurrent INSERT won but its row isn't visible: never a claim
+        conflict = IntegrityError("INSERT", {}, Exception("Duplicate entry"))
+        with mock.patch.object(idempotency, "_claim_in", side_effect=conflict):
+            self.assertEqual(idempotency._claim("key"), (None, None))
+            retry = self.post("k1", json={"name": "a"})
+
+        self.assertEqual(retry.status_code, 409)
+        self.assertEqual(self.calls, [])
+
+    def test_claim_lost_to_a_concurrent_insert_reads_its_row(self):
+        key_hash = idempotency._key_hash("POST", "/things/create", b"k1")
+        idempotency._claim(key_hash)
+        conflict = IntegrityError("INSERT", {}, Exception("Duplicate entry"))
+        with mock.patch.object(idempotency, "_claim_in", side_effect=conflict):
+            row, lease = idempotency._claim(key_hash)
+
+        self.assertIsNone(lease)
+        self.assertEqual(row.key_hash, key_hash)
+        self.assertIsNone(row.status_code)
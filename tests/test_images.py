@@ -0,0 +1,94 @@
+import asyncio
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import JobReportImage
+from ..routers import job_report_image
+from ..utils import images
+from ..utils.images import VARIANTS, render_variants, resolve_variant, variant_name
+from ..utils.storage import REPORT_IMAGES
+from .test_uploads import UploadStorageTest
+
+
+def _photo(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "teal").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class VariantsTest(UploadStorageTest):
+    def setUp(self):
+        super().setUp()
+        self.path = self.store(_photo(2000, 1500), "photo.png")
+
+    def test_variant_names(self):
+        self.assertEqual(
+            variant_name("reports/images/abc.png", "thumb"),
+            "reports/images/abc.thumb.jpg",
+        )
+        self.assertEqual(
+            variant_name("reports/images/abc.png", "original"),
+            "reports/images/abc.png",
+        )
+
+    def test_render_downscales_and_skips_existing_variants(self):
+        source = str(self.root / self.path)
+
+        self.assertEqual(
+            sorted(render_variants(source)),
+            sorted(Path(variant_name(self.path, size)).name for size in VARIANTS),
+        )
+        for size, pixels in VARIANTS.items():
+            with self.subTest(size=size):
+                with Image.open(self.root / variant_name(self.path, size)) as image:
+                    self.assertEqual(image.format, "JPEG")
+                    self.assertEqual(max(image.size), pixels)
+        self.assertEqual(render_variants(source), [])
+
+    def test_original_stands_in_until_the_variant_exists(self):
+        self.assertEqual(resolve_variant(self.path, "thumb"), self.path)
+
+        render_variants(str(self.root / self.path))
+
+        self.assertEqual(
+            resolve_variant(self.path, "thumb"), variant_name(self.path, "thumb")
+        )
+        self.assertEqual(resolve_variant(self.path, "original"), self.path)
+
+    def test_generate_variants_in_the_pool(self):
+        with ThreadPoolExecutor(1) as pool:
+            with mock.patch.object(images, "_pool", return_value=pool):
+                asyncio.run(images.generate_variants(self.path))
+
+        self.assertTrue((self.root / variant_name(self.path, "medium")).exists())
+
+    def test_failed_generation_is_logged_not_raised(self):
+        broken = f"{REPORT_IMAGES}/broken.png"
+        (self.root / broken).write_bytes(b"\x89PNG\r\n\x1a\n")
+
+        with ThreadPoolExecutor(1) as pool:
+            with mock.patch.object(images, "_pool", return_value=pool):
+                with self.assertLogs(images.logger, logging.ERROR):
+                    asyncio.run(images.generate_variants(broken))
+
+    def test_read_routes_take_a_size(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        db = SessionLocal(bind=engine)
+        self.addCleanup(db.close)
+        db.add(JobReportImage(job_report_id=1, file_path=self.path))
+        db.commit()
+        render_variants(str(self.root / self.path))
+
+        rows = asyncio.run(job_report_image.read_all(db, "thumb"))
+        row = asyncio.run(job_report_image.read_job_report_image(db, 1, "medium"))
+
+        self.assertEqual(rows[0]["file_path"], variant_name(self.path, "thumb"))
+        self.assertEqual(row["file_path"], variant_name(self.path, "medium"))
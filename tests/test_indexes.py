@@ -0,0 +1,36 @@
+import os
+import unittest
+from unittest import mock
+from sqlalchemy import create_engine, select
+from sqlalchemy.pool import StaticPool
+from ..migrations import run_migrations
+from ..models import Invoice
+from ..utils import db_indexes
+
+
+class QueryPlanTest(unittest.TestCase):
+    """Every hot query must read through an index on the migrated schema."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(self.engine)
+
+    def test_hot_queries_search_an_index(self):
+        self.assertEqual(db_indexes.check_query_plans(self.engine), {})
+
+    def test_full_scan_is_reported(self):
+        scan = {"invoices_by_tva": select(Invoice.id).where(Invoice.tva_status == 1)}
+        with mock.patch.dict(db_indexes.HOT_QUERIES, scan, clear=True):
+            regressions = db_indexes.check_query_plans(self.engine)
+        self.assertEqual(list(regressions), ["invoices_by_tva"])
+        self.assertTrue(regressions["invoices_by_tva"]["detail"].startswith("SCAN"))
+
+
+@unittest.skipUnless(
+    os.getenv("TEST_MYSQL_URL"), "TEST_MYSQL_URL points to an empty MySQL database"
+)
+class MySQLQueryPlanTest(unittest.TestCase):
+    def test_hot_queries_can_use_an_index(self):
+        engine = create_engine(os.environ["TEST_MYSQL_URL"])
+        run_migrations(engine)
+        self.assertEqual(db_indexes.check_query_plans(engine), {})
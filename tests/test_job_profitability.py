@@ -0,0 +1,114 @@
+import asyncio
+import unittest
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Expense, ExpenseTask, Invoice, InvoiceJob, Job, JobAssign
+from ..routers import job
+
+
+class JobProfitabilityTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        self.db.add_all(
+            [
+                Job(job_name="Install", price=400, date_program=date(2025, 3, 1)),
+                Job(job_name="Repair", price=200, date_program=date(2025, 3, 15)),
+                Job(job_name="Audit", date_program=date(2025, 5, 1)),
+            ]
+        )
+        self.db.flush()
+        self.db.add_all(
+            [
+                JobAssign(
+                    job_id=1,
+                    technician_id=1,
+                    date_start=date(2025, 3, 1),
+                    date_end=date(2025, 3, 2),
+                    amount=100,
+                ),
+                JobAssign(
+                    job_id=1,
+                    technician_id=2,
+                    date_start=date(2025, 3, 1),
+                    date_end=date(2025, 3, 1),
+                    amount=50,
+                ),
+                Expense(reference="EXP-1", amount=50, label="Fuel"),
+            ]
+        )
+        self.db.flush()
+        self.db.add_all(
+            [
+                # Linked to the job directly, then through its assignment
+                ExpenseTask(expense_id=1, job_id=1, task="Fuel", amount=20),
+                ExpenseTask(expense_id=1, job_assign_id=1, task="Meals", amount=30),
+            ]
+        )
+        for reference, amount, job_ids, on_delete in [
+            ("INV-1", 300, [1, 2], None),
+            ("INV-2", 100, [1], False),
+            ("INV-3", 999, [1], True),
+        ]:
+            invoice = Invoice(
+                reference=reference,
+                client_id=4,
+                user_id=1,
+                date_op=date(2025, 3, 20),
+                amount=amount,
+                on_delete=on_delete,
+            )
+            self.db.add(invoice)
+            self.db.flush()
+            self.db.add_all(
+                InvoiceJob(invoice_id=invoice.id, job_id=job_id) for job_id in job_ids
+            )
+        self.db.commit()
+
+    def test_one_job(self):
+        row = asyncio.run(job.read_job_profitability(self.db, 1))
+
+        self.assertEqual(
+            {key: row[key] for key in ("labour_cost", "expense_cost", "total_cost")},
+            {"labour_cost": 150.0, "expense_cost": 50.0, "total_cost": 200.0},
+        )
+        # Half of the invoice shared with the other job, deleted one left out
+        self.assertEqual(row["invoiced"], 250.0)
+        self.assertEqual(row["margin"], 50.0)
+        self.assertEqual(row["margin_rate"], 0.2)
+
+    def test_period_in_one_query(self):
+        statements = []
+        event.listen(
+            self.db.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        rows = asyncio.run(
+            job.read_jobs_profitability(self.db, date(2025, 3, 1), date(2025, 3, 31))
+        )
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual([row["job_id"] for row in rows], [1, 2])
+        self.assertEqual(
+            (rows[1]["total_cost"], rows[1]["invoiced"], rows[1]["margin"]),
+            (0.0, 150.0, 150.0),
+        )
+
+    def test_nothing_invoiced_has_no_margin_rate(self):
+        row = asyncio.run(job.read_job_profitability(self.db, 3))
+
+        self.assertEqual((row["invoiced"], row["margin_rate"]), (0.0, None))
+
+    def test_unknown_job(self):
+        with self.assertRaises(HTTPException) as raised:
+            asyncio.run(job.read_job_profitability(self.db, 9))
+
+        self.assertEqual(raised.exception.status_code, 404)
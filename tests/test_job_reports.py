@@ -0,0 +1,84 @@
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Job, JobReport, JobReportImage
+from ..routers import job, job_report
+
+
+class JobReportImagesTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine(
+            "sqlite://",
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        self.db.add_all([Job(job_name="Install"), Job(job_name="Repair")])
+        self.db.flush()
+        for job_id, images in [(1, 3), (1, 0), (2, 1)]:
+            report = JobReport(
+                job_id=job_id,
+                technician_id=1,
+                report_heading="Done",
+                report_description="All good",
+            )
+            self.db.add(report)
+            self.db.flush()
+            self.db.add_all(
+                JobReportImage(job_report_id=report.id, file_path=f"{report.id}-{n}")
+                for n in range(images)
+            )
+        self.db.commit()
+
+        self.statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+        app = FastAPI()
+        app.include_router(job.router)
+        app.include_router(job_report.router)
+        for get_db in (job.get_db, job_report.get_db):
+            app.dependency_overrides[get_db] = lambda: self.db
+        self.client = TestClient(app)
+
+    def test_report_with_its_images(self):
+        response = self.client.get("/jobs-report/1", params={"include": "images"})
+
+        self.assertEqual(
+            [image["file_path"] for image in response.json()["images"]],
+            ["1-0", "1-1", "1-2"],
+        )
+        self.assertEqual(len(self.statements), 2)
+
+    def test_report_alone_by_default(self):
+        response = self.client.get("/jobs-report/2")
+
+        self.assertEqual(response.json()["report_heading"], "Done")
+        self.assertNotIn("images", response.json())
+
+    def test_job_reports_with_their_images(self):
+        response = self.client.get("/jobs/1/reports")
+
+        self.assertEqual(
+            [(report["id"], len(report["images"])) for report in response.json()],
+            [(1, 3), (2, 0)],
+        )
+        # Job check, reports, then every image in one go
+        self.assertEqual(len(self.statements), 3)
+
+    def test_unknown_ids(self):
+        for path in [
+            "/jobs-report/9?include=images",
+            "/jobs-report/9",
+            "/jobs/9/reports",
+        ]:
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
@@ -0,0 +1,49 @@
+import unittest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
+from ..migrations import load_migrations, pending_migrations, run_migrations
+from ..models import Base
+
+
+def _engine():
+    return create_engine("sqlite://", poolclass=StaticPool)
+
+
+class MigrationsTest(unittest.TestCase):
+    def test_replay_builds_the_schema_of_the_models(self):
+        engine = _engine()
+        applied = run_migrations(engine)
+
+        self.assertEqual(applied, [name for name, _ in load_migrations()])
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            with self.subTest(table=table.name):
+                columns = {
+                    column["name"] for column in inspector.get_columns(table.name)
+                }
+                self.assertEqual(columns, {column.name for column in table.columns})
+                indexes = {
+                    index["name"]: tuple(index["column_names"])
+                    for index in inspector.get_indexes(table.name)
+                }
+                self.assertEqual(
+                    indexes,
+                    {
+                        index.name: tuple(column.name for column in index.columns)
+                        for index in table.indexes
+                    },
+                )
+
+    def test_applied_migrations_are_not_run_again(self):
+        engine = _engine()
+        run_migrations(engine)
+
+        self.assertEqual(pending_migrations(engine), [])
+        self.assertEqual(run_migrations(engine), [])
+
+    def test_database_created_by_create_all_is_brought_under_migrations(self):
+        engine = _engine()
+        Base.metadata.create_all(engine)
+
+        self.assertEqual(len(run_migrations(engine)), len(load_migrations()))
+        self.assertEqual(pending_migrations(engine), [])
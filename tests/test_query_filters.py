@@ -0,0 +1,117 @@
+import unittest
+from datetime import date, datetime
+from fastapi import HTTPException
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
+from starlette.datastructures import QueryParams
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Expense, Invoice, Payment, PurchaseOrder, Quotation, Transaction
+from ..routers import cash, expense, invoice, payment, purchase_order, quotation
+from ..utils.query_filters import apply_filters
+
+
+ALLOW_LISTS = [
+    (Invoice, invoice.FILTER_FIELDS),
+    (Quotation, quotation.FILTER_FIELDS),
+    (PurchaseOrder, purchase_order.FILTER_FIELDS),
+    (Payment, payment.FILTER_FIELDS),
+    (Expense, expense.FILTER_FIELDS),
+    (Transaction, cash.TRANSACTION_FILTER_FIELDS),
+]
+
+
+class AllowListTest(unittest.TestCase):
+    def test_every_filterable_column_leads_an_index(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        inspector = inspect(engine)
+        for model, fields in ALLOW_LISTS:
+            table = model.__tablename__
+            leading = {
+                index["column_names"][0] for index in inspector.get_indexes(table)
+            }
+            leading.update(inspector.get_pk_constraint(table)["constrained_columns"])
+            leading.update(
+                constraint["column_names"][0]
+                for constraint in inspector.get_unique_constraints(table)
+            )
+            for field in fields:
+                with self.subTest(table=table, field=field):
+                    self.assertIn(field, leading)
+
+
+class ApplyFiltersTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        now = datetime(2025, 1, 1)
+        for reference, client_id, status, date_op in [
+            ("INV-1", 12, False, date(2025, 1, 10)),
+            ("INV-2", 12, True, date(2025, 2, 10)),
+            ("INV-3", 12, False, date(2025, 3, 10)),
+            ("INV-4", 7, False, date(2025, 2, 1)),
+        ]:
+            self.db.add(
+                Invoice(
+                    reference=reference,
+                    client_id=client_id,
+                    status=status,
+                    date_op=date_op,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def references(self, query_string: str, default_order=None):
+        query = apply_filters(
+            self.db.query(Invoice),
+            Invoice,
+            QueryParams(query_string),
+            invoice.FILTER_FIELDS,
+            default_order=default_order,
+        )
+        return [row.reference for row in query]
+
+    def test_filters_and_sorts(self):
+        self.assertEqual(
+            self.references(
+                "client_id=12&status=false&date_op__gte=2025-01-01"
+                "&date_op__lt=2025-04-01&order_by=-date_op"
+            ),
+            ["INV-3", "INV-1"],
+        )
+
+    def test_in_operator_and_several_sort_keys(self):
+        self.assertEqual(
+            self.references("client_id__in=7,12,&order_by=-client_id,date_op"),
+            ["INV-1", "INV-2", "INV-3", "INV-4"],
+        )
+
+    def test_trailing_comma_keeps_the_default_order(self):
+        self.assertEqual(
+            self.references("order_by=,", default_order=Invoice.date_op.desc()),
+            ["INV-3", "INV-2", "INV-4", "INV-1"],
+        )
+
+    def test_unknown_parameters_are_ignored(self):
+        self.assertEqual(
+            self.references("_=1700000000&amount=3&client_id=7"), ["INV-4"]
+        )
+
+    def test_invalid_requests_are_rejected(self):
+        for query_string in [
+            "date_op__like=2025",
+            "client_id=twelve",
+            "status=maybe",
+            "order_by=amount",
+        ]:
+            with self.subTest(query_string=query_string):
+                with self.assertRaises(HTTPException) as raised:
+                    self.references(query_string)
+                self.assertEqual(raised.exception.status_code, 400)
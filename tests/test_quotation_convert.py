@@ -0,0 +1,122 @@
+import unittest
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import (
+    Invoice,
+    InvoiceProduct,
+    InvoiceType,
+    Quotation,
+    QuotationProduct,
+    QuotationType,
+)
+from ..routers.quotation import convert_quotation_to_invoice
+from ..schemas import QuotationConvert
+
+
+class ConvertQuotationTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        quotation_type = QuotationType(type="Installation")
+        self.invoice_type = InvoiceType(type="Installation")
+        self.other_type = InvoiceType(type="Maintenance")
+        self.db.add_all([quotation_type, self.invoice_type, self.other_type])
+        self.db.flush()
+        self.quotation = self.add_quotation("PRO-1", quotation_type.id)
+        self.db.add_all(
+            [
+                QuotationProduct(
+                    quotation_id=self.quotation.id,
+                    product_id=1,
+                    unit_price=10,
+                    quantity=2,
+                ),
+                QuotationProduct(
+                    quotation_id=self.quotation.id,
+                    product_id=2,
+                    unit_price=5,
+                    quantity=1,
+                ),
+                # Struck out of the quotation: not invoiced
+                QuotationProduct(
+                    quotation_id=self.quotation.id,
+                    product_id=3,
+                    unit_price=99,
+                    quantity=1,
+                    status=False,
+                ),
+            ]
+        )
+        self.db.commit()
+
+    def add_quotation(self, reference: str, type_id=None, **columns):
+        columns = {"status": True, **columns}
+        quotation = Quotation(
+            reference=reference,
+            client_id=4,
+            user_id=1,
+            company_id=1,
+            type_id=type_id,
+            date_op=date(2025, 1, 2),
+            amount=25.0,
+            **columns,
+        )
+        self.db.add(quotation)
+        self.db.flush()
+        return quotation
+
+    def convert(self, quotation_id: int, **body):
+        return convert_quotation_to_invoice(
+            quotation_id, QuotationConvert(**body), self.db
+        )
+
+    def test_copies_header_and_live_lines(self):
+        invoice = self.convert(self.quotation.id, date_op=date(2025, 2, 1))
+
+        self.assertEqual(invoice.client_id, 4)
+        self.assertEqual(invoice.amount, 25.0)
+        self.assertEqual(invoice.date_op, date(2025, 2, 1))
+        self.assertIs(invoice.status, False)
+        self.assertIs(invoice.has_heading, False)
+        self.assertIs(invoice.has_po, False)
+        # The invoice type named like the quotation's type
+        self.assertEqual(invoice.type_id, self.invoice_type.id)
+        lines = self.db.query(InvoiceProduct).filter_by(invoice_id=invoice.id).all()
+        self.assertEqual(
+            sorted((line.product_id, line.quantity) for line in lines),
+            [(1, 2), (2, 1)],
+        )
+        self.db.refresh(self.quotation)
+        self.assertEqual(self.quotation.invoice_id, invoice.id)
+
+    def test_type_from_the_body_wins(self):
+        invoice = self.convert(self.quotation.id, type_id=self.other_type.id)
+
+        self.assertEqual(invoice.type_id, self.other_type.id)
+
+    def test_refused_conversions_create_no_invoice(self):
+        self.convert(self.quotation.id)
+        pending = self.add_quotation("PRO-2", status=False)
+        untyped = self.add_quotation("PRO-3")
+        deleted = self.add_quotation("PRO-4", on_delete=True)
+        self.db.commit()
+
+        for quotation_id, status_code in [
+            (self.quotation.id, 409),
+            (pending.id, 409),
+            (untyped.id, 422),
+            (deleted.id, 404),
+            (deleted.id + 1, 404),
+        ]:
+            with self.subTest(quotation_id=quotation_id):
+                with self.assertRaises(HTTPException) as raised:
+                    self.convert(quotation_id)
+                self.assertEqual(raised.exception.status_code, status_code)
+                self.db.rollback()
+        self.assertEqual(self.db.query(Invoice).count(), 1)
@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Invoice, Payment
+from ..routers.invoice import read_receivables
+
+AS_OF = date(2025, 6, 30)
+
+
+class ReceivablesTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+
+    def add_invoice(self, reference: str, date_op: date, amount: float, **columns):
+        columns = {"client_id": 4, **columns}
+        invoice = Invoice(
+            reference=reference, user_id=1, date_op=date_op, amount=amount, **columns
+        )
+        self.db.add(invoice)
+        self.db.flush()
+        return invoice
+
+    def pay(self, invoice, date_op: date, amount: float, **columns):
+        self.db.add(
+            Payment(
+                reference=f"PAY-{invoice.id}-{date_op:%m%d}",
+                invoice_id=invoice.id,
+                date_op=date_op,
+                amount=amount,
+                **columns,
+            )
+        )
+
+    def receivables(self, **params):
+        self.db.commit()
+        rows = asyncio.run(read_receivables(self.db, as_of=AS_OF, **params))
+        return {row["reference"]: row for row in rows}
+
+    def test_paid_balance_and_aging(self):
+        recent = self.add_invoice("INV-1", date(2025, 6, 20), 100)
+        self.add_invoice("INV-2", date(2025, 5, 15), 50)
+        self.add_invoice("INV-3", date(2025, 4, 10), 80)
+        self.add_invoice("INV-4", date(2025, 1, 2), 30)
+        self.pay(recent, date(2025, 6, 25), 40)
+        self.pay(recent, date(2025, 6, 26), 10)
+
+        rows = self.receivables()
+
+        self.assertEqual(rows["INV-1"]["paid"], 50.0)
+        self.assertEqual(rows["INV-1"]["balance"], 50.0)
+        self.assertEqual(rows["INV-1"]["age_days"], 10)
+        self.assertEqual(
+            {reference: row["aging_bucket"] for reference, row in rows.items()},
+            {"INV-1": "0-30", "INV-2": "31-60", "INV-3": "61-90", "INV-4": "90+"},
+        )
+
+    def test_settled_invoices_are_left_out_unless_asked(self):
+        invoice = self.add_invoice("INV-1", date(2025, 6, 1), 100)
+        self.pay(invoice, date(2025, 6, 2), 100)
+
+        self.assertEqual(self.receivables(), {})
+        rows = self.receivables(outstanding_only=False)
+        self.assertEqual(rows["INV-1"]["balance"], 0.0)
+
+    def test_deleted_and_later_payments_settle_nothing(self):
+        invoice = self.add_invoice("INV-1", date(2025, 6, 1), 100)
+        self.pay(invoice, date(2025, 6, 2), 30, on_delete=True)
+        self.pay(invoice, date(2025, 7, 1), 70)
+
+        self.assertEqual(self.receivables()["INV-1"]["paid"], 0.0)
+
+    def test_deleted_later_and_other_clients_invoices_are_left_out(self):
+        self.add_invoice("INV-1", date(2025, 6, 1), 100)
+        self.add_invoice("INV-2", date(2025, 6, 1), 100, on_delete=True)
+        self.add_invoice("INV-3", date(2025, 7, 1), 100)
+        self.add_invoice("INV-4", date(2025, 6, 1), 100, client_id=5)
+
+        self.assertEqual(list(self.receivables(client_id=4)), ["INV-1"])
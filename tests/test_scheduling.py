@@ -0,0 +1,156 @@
+import asyncio
+import unittest
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Job, JobAssign, Technician
+from ..routers import job_assign, technicians
+from ..schemas import JobAssignCreate
+
+
+def _day(day: int) -> date:
+    return date(2025, 3, day)
+
+
+class SchedulingTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        self.db.add_all(
+            [
+                Technician(name=name, email=f"{name}@example.com", phone="")
+                for name in ("Bruno", "Alice", "Chloe")
+            ]
+        )
+        self.db.add_all([Job(job_name="Install", status=True), Job(job_name="Repair")])
+        self.db.flush()
+        # Bruno works 3-5 March, Alice 10 March
+        self.db.add_all(
+            [
+                JobAssign(
+                    job_id=1, technician_id=1, date_start=_day(3), date_end=_day(5)
+                ),
+                JobAssign(
+                    job_id=2, technician_id=2, date_start=_day(10), date_end=_day(10)
+                ),
+            ]
+        )
+        self.db.commit()
+
+    def assign(self, technician_id: int, start: int, end: int, job_id: int = 2):
+        body = JobAssignCreate(
+            job_id=job_id,
+            technician_id=technician_id,
+            date_start=_day(start),
+            date_end=_day(end),
+        )
+        return asyncio.run(job_assign.create_job_assign(self.db, body))
+
+    def assertStatus(self, status_code: int, call):
+        with self.assertRaises(HTTPException) as raised:
+            call()
+        self.db.rollback()
+        self.assertEqual(raised.exception.status_code, status_code)
+        return raised.exception
+
+
+class TechnicianAvailabilityTest(SchedulingTest):
+    def test_overlapping_assignment_is_refused(self):
+        # Sharing only the first or the last day is an overlap too
+        for start, end in [(1, 3), (5, 8), (4, 4), (1, 9)]:
+            with self.subTest(period=(start, end)):
+                error = self.assertStatus(409, lambda: self.assign(1, start, end))
+                self.assertEqual(error.detail["job_assign_ids"], [1])
+        self.assertEqual(self.db.query(JobAssign).count(), 2)
+
+    def test_adjacent_assignments_are_accepted(self):
+        self.assign(1, 1, 2)
+        self.assign(1, 6, 6)
+
+        self.assertEqual(self.db.query(JobAssign).count(), 4)
+
+    def test_moving_an_assignment_ignores_itself(self):
+        body = JobAssignCreate(
+            job_id=1, technician_id=1, date_start=_day(4), date_end=_day(7)
+        )
+        asyncio.run(job_assign.update_job_assign(self.db, body, 1))
+
+        self.assertEqual(self.db.get(JobAssign, 1).date_end, _day(7))
+        body.technician_id = 2
+        body.date_end = _day(12)
+        self.assertStatus(
+            409, lambda: asyncio.run(job_assign.update_job_assign(self.db, body, 1))
+        )
+
+    def test_unknown_technician_and_reversed_period(self):
+        self.assertStatus(404, lambda: self.assign(9, 1, 2))
+        self.assertStatus(400, lambda: self.assign(3, 5, 1))
+
+    def test_available_technicians(self):
+        for start, end, names in [
+            (1, 2, ["Alice", "Bruno", "Chloe"]),
+            (5, 10, ["Chloe"]),
+            (6, 9, ["Alice", "Bruno", "Chloe"]),
+            (10, 20, ["Bruno", "Chloe"]),
+        ]:
+            with self.subTest(period=(start, end)):
+                available = asyncio.run(
+                    technicians.read_available_technicians(
+                        self.db, _day(start), _day(end)
+                    )
+                )
+                self.assertEqual([t.name for t in available], names)
+
+        self.assertStatus(
+            400,
+            lambda: asyncio.run(
+                technicians.read_available_technicians(self.db, _day(2), _day(1))
+            ),
+        )
+
+
+class CalendarTest(SchedulingTest):
+    def calendar(self, start: int, end: int, technician_id=None):
+        return asyncio.run(
+            job_assign.read_calendar(self.db, _day(start), _day(end), technician_id)
+        )
+
+    def test_assignments_per_technician_per_day(self):
+        calendar = self.calendar(4, 10)
+
+        self.assertEqual(
+            [entry["technician_name"] for entry in calendar], ["Alice", "Bruno"]
+        )
+        alice, bruno = calendar
+        # Clipped to the requested period
+        self.assertEqual([day["date"] for day in bruno["days"]], [_day(4), _day(5)])
+        assignment = bruno["days"][0]["assignments"][0]
+        self.assertEqual(
+            (assignment["job_name"], assignment["status"]), ("Install", True)
+        )
+        self.assertEqual(
+            [(day["date"], len(day["assignments"])) for day in alice["days"]],
+            [(_day(10), 1)],
+        )
+
+    def test_one_technician(self):
+        calendar = self.calendar(1, 31, technician_id=2)
+
+        self.assertEqual([entry["technician_id"] for entry in calendar], [2])
+
+    def test_free_period_and_bad_periods(self):
+        self.assertEqual(self.calendar(20, 25), [])
+        self.assertStatus(400, lambda: self.calendar(5, 1))
+        self.assertStatus(
+            400,
+            lambda: asyncio.run(
+                job_assign.read_calendar(
+                    self.db, date(2025, 1, 1), date(2025, 12, 31), None
+                )
+            ),
+        )
@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+from datetime import date
+from sqlalchemy import create_engine, select
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Invoice, Payment
+from ..routers import invoice as invoice_router
+
+
+def _request(query_string: bytes = b""):
+    return Request({"type": "http", "query_string": query_string, "headers": []})
+
+
+class SoftDeleteScopeTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        # on_delete is NULL on rows written before the column existed
+        for reference, on_delete in [
+            ("INV-1", None),
+            ("INV-2", False),
+            ("INV-3", True),
+        ]:
+            self.db.add(
+                Invoice(
+                    reference=reference,
+                    client_id=4,
+                    user_id=1,
+                    date_op=date(2025, 1, 2),
+                    on_delete=on_delete,
+                )
+            )
+        self.db.flush()
+        self.db.add_all(
+            [
+                Payment(reference="PAY-1", invoice_id=1, date_op=date(2025, 1, 3)),
+                Payment(
+                    reference="PAY-2",
+                    invoice_id=1,
+                    date_op=date(2025, 1, 4),
+                    on_delete=True,
+                ),
+            ]
+        )
+        self.db.commit()
+
+    def references(self, query):
+        return sorted(row.reference for row in query)
+
+    def test_deleted_rows_are_hidden_by_default(self):
+        self.assertEqual(self.references(self.db.query(Invoice)), ["INV-1", "INV-2"])
+        self.assertEqual(
+            self.references(self.db.scalars(select(Invoice))), ["INV-1", "INV-2"]
+        )
+        self.assertIsNone(self.db.query(Invoice).filter(Invoice.id == 3).first())
+
+    def test_include_deleted_shows_them(self):
+        query = self.db.query(Invoice).execution_options(include_deleted=True)
+
+        self.assertEqual(self.references(query), ["INV-1", "INV-2", "INV-3"])
+
+    def test_relationship_loads_follow_the_scope(self):
+        invoice = self.db.query(Invoice).filter(Invoice.id == 1).one()
+
+        self.assertEqual(self.references(invoice.payments), ["PAY-1"])
+
+    def test_list_route_takes_include_deleted(self):
+        for include_deleted, expected in [
+            (False, ["INV-1", "INV-2"]),
+            (True, ["INV-1", "INV-2", "INV-3"]),
+        ]:
+            with self.subTest(include_deleted=include_deleted):
+                request = _request(f"include_deleted={include_deleted}".encode())
+                rows = asyncio.run(
+                    invoice_router.read_all(self.db, request, include_deleted)
+                )
+                self.assertEqual(self.references(rows), expected)
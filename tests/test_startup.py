@@ -0,0 +1,36 @@
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from ..utils.startup import ROUTERS, LazyRouterMiddleware, import_report
+
+
+class LazyRouterTest(unittest.TestCase):
+    def setUp(self):
+        self.app = FastAPI()
+        self.app.add_middleware(LazyRouterMiddleware, fastapi_app=self.app)
+        self.client = TestClient(self.app)
+
+    def loaded(self):
+        return self.app.middleware_stack.app.loaded
+
+    def test_router_is_registered_by_its_first_request(self):
+        # Path(gt=0) answers 422 once the route exists, 404 before
+        response = self.client.get("/products-input/0")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.loaded(), {"products_input"})
+        self.assertIn("routers.products_input", import_report)
+
+        self.assertEqual(self.client.get("/vendors/0").status_code, 422)
+        self.assertEqual(self.loaded(), {"products_input", "vendors"})
+
+    def test_unknown_paths_load_nothing(self):
+        self.assertEqual(self.client.get("/nowhere").status_code, 404)
+        self.assertEqual(self.loaded(), set())
+
+    def test_openapi_schema_lists_every_router(self):
+        schema = self.client.get("/openapi.json").json()
+
+        self.assertEqual(self.loaded(), set(ROUTERS))
+        self.assertIn("/products-input/{product_id}", schema["paths"])
+        self.assertIn("/cash/open", schema["paths"])
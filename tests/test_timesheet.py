@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Invoice, InvoiceTechnician, Technician
+from ..routers import technicians
+
+
+class TimesheetTest(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        self.db.add_all(
+            [
+                Technician(name=name, email=f"{name}@example.com", phone="")
+                for name in ("Bruno", "Alice")
+            ]
+        )
+        self.db.flush()
+        for date_op, on_delete, lines in [
+            (date(2025, 1, 10), None, [(1, 8, 2, 0), (2, 4, 0, 1)]),
+            (date(2025, 1, 20), False, [(1, 6, 0, 0)]),
+            (date(2025, 2, 3), None, [(1, 5, 1, 0)]),
+            # Deleted invoices bill nothing
+            (date(2025, 2, 4), True, [(1, 100, 100, 100)]),
+        ]:
+            invoice = Invoice(
+                reference=f"INV-{date_op:%m%d}",
+                client_id=4,
+                user_id=1,
+                date_op=date_op,
+                on_delete=on_delete,
+            )
+            self.db.add(invoice)
+            self.db.flush()
+            self.db.add_all(
+                InvoiceTechnician(
+                    invoice_id=invoice.id,
+                    technician_id=technician_id,
+                    # Morning and afternoon hours add up
+                    normal_hour1=normal // 2,
+                    normal_hour2=normal - normal // 2,
+                    normal_unit_price=10,
+                    overtime_hour1=overtime,
+                    overtime_unit_price=15,
+                    allowance_hour1=allowance,
+                    allowance_unit_price=5,
+                )
+                for technician_id, normal, overtime, allowance in lines
+            )
+        self.db.commit()
+
+    def timesheet(self, technician_id=1, date_from=None, date_to=None, period="month"):
+        return asyncio.run(
+            technicians.read_technician_timesheet(
+                self.db, technician_id, date_from, date_to, period
+            )
+        )
+
+    def test_monthly_hours_and_amounts(self):
+        january, february = self.timesheet()
+
+        self.assertEqual(january["period"], "2025-01")
+        self.assertEqual(january["invoices"], 2)
+        self.assertEqual((january["normal_hours"], january["overtime_hours"]), (14, 2))
+        self.assertEqual(january["total_hours"], 16)
+        self.assertEqual(january["billed_amount"], 14 * 10 + 2 * 15)
+        self.assertEqual((february["period"], february["total_hours"]), ("2025-02", 6))
+
+    def test_periods(self):
+        for period, labels in [
+            ("day", ["2025-01-10", "2025-01-20", "2025-02-03"]),
+            ("year", ["2025"]),
+            ("total", [None]),
+        ]:
+            with self.subTest(period=period):
+                rows = self.timesheet(period=period)
+                self.assertEqual([row["period"] for row in rows], labels)
+        self.assertEqual(self.timesheet(period="total")[0]["total_hours"], 22)
+
+    def test_date_range(self):
+        rows = self.timesheet(date_from=date(2025, 1, 15), date_to=date(2025, 1, 31))
+
+        self.assertEqual(
+            [(row["period"], row["total_hours"]) for row in rows], [("2025-01", 6)]
+        )
+
+    def test_company_wide(self):
+        rows = asyncio.run(technicians.read_timesheets(self.db, None, None, "total"))
+
+        self.assertEqual(
+            [(row["technician_name"], row["total_hours"]) for row in rows],
+            [("Alice", 5), ("Bruno", 22)],
+        )
+        self.assertEqual(rows[0]["billed_amount"], 4 * 10 + 1 * 5)
@@ -0,0 +1,181 @@
+import asyncio
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request, UploadFile
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import JobReportImage
+from ..routers import job_report_image
+from ..utils import storage
+from ..utils.storage import REPORT_IMAGES, RequestSizeLimitMiddleware, store_upload
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 64
+
+
+def _upload(content: bytes, filename: str = "photo.jpg"):
+    return UploadFile(io.BytesIO(content), filename=filename)
+
+
+class UploadStorageTest(unittest.TestCase):
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = Path(root.name)
+        patcher = mock.patch.object(storage, "UPLOAD_ROOT", self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stored_files(self):
+        return sorted(path.name for path in (self.root / REPORT_IMAGES).iterdir())
+
+    def store(self, content: bytes, filename: str = "photo.jpg", **kwargs):
+        return asyncio.run(
+            store_upload(_upload(content, filename), REPORT_IMAGES, **kwargs)
+        )
+
+
+class StoreUploadTest(UploadStorageTest):
+    def test_named_after_content_with_the_detected_suffix(self):
+        # The client's `.html` suffix is never reused
+        path = self.store(PNG, "page.html")
+        again = self.store(PNG, "copy.png")
+
+        self.assertEqual(path, again)
+        self.assertRegex(path, rf"^{REPORT_IMAGES}/[0-9a-f]{{64}}\.png$")
+        self.assertEqual((self.root / path).read_bytes(), PNG)
+        self.assertEqual(self.stored_files(), [Path(path).name])
+
+    def test_rejections_leave_no_file(self):
+        for content, max_bytes, status_code in [
+            (b"<html><script>alert(1)</script></html>", 1024, 415),
+            (b"", 1024, 400),
+            (JPEG, 16, 413),
+        ]:
+            with self.subTest(status_code=status_code):
+                with self.assertRaises(HTTPException) as raised:
+                    self.store(content, max_bytes=max_bytes)
+                self.assertEqual(raised.exception.status_code, status_code)
+                self.assertEqual(self.stored_files(), [])
+
+
+class RequestSizeLimitTest(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.add_middleware(RequestSizeLimitMiddleware, max_bytes=100)
+        self.bodies = []
+
+        @app.post("/echo")
+        async def echo(request: Request):
+            self.bodies.append(await request.body())
+            return {"size": len(self.bodies[-1])}
+
+        self.client = TestClient(app)
+
+    def test_declared_length_over_the_limit(self):
+        response = self.client.post("/echo", content=b"x" * 101)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.bodies, [])
+
+    def test_streamed_body_over_the_limit(self):
+        # No Content-Length: the limit is enforced while the body comes in
+        chunks = iter([b"x" * 60, b"x" * 60])
+        response = self.client.post("/echo", content=chunks)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.bodies, [])
+
+    def test_body_within_the_limit(self):
+        response = self.client.post("/echo", content=iter([b"x" * 50, b"x" * 50]))
+
+        self.assertEqual(response.json(), {"size": 100})
+
+
+class CreateJobReportImageTest(UploadStorageTest):
+    def setUp(self):
+        super().setUp()
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+
+    def create(self, content: bytes):
+        return asyncio.run(
+            job_report_image.create_job_report_image(
+                self.db, BackgroundTasks(), 1, _upload(content)
+            )
+        )
+
+    def test_failed_insert_removes_the_new_file(self):
+        failure = OperationalError("INSERT", {}, Exception("gone away"))
+        with mock.patch.object(self.db, "commit", side_effect=failure):
+            with self.assertRaises(OperationalError):
+                self.create(PNG)
+
+        self.assertEqual(self.stored_files(), [])
+
+    def test_failed_insert_keeps_a_file_other_rows_use(self):
+        stored = self.create(PNG)
+        failure = OperationalError("INSERT", {}, Exception("gone away"))
+        with mock.patch.object(self.db, "commit", side_effect=failure):
+            with self.assertRaises(OperationalError):
+                self.create(PNG)
+
+        self.assertEqual(self.stored_files(), [Path(stored.file_path).name])
+        self.assertEqual(self.db.query(JobReportImage).count(), 1)
+
+
+class CreateJobReportImagesTest(CreateJobReportImageTest):
+    def create_batch(self, *contents: bytes, background_tasks=None):
+        return asyncio.run(
+            job_report_image.create_job_report_images(
+                self.db,
+                background_tasks or BackgroundTasks(),
+                1,
+                [_upload(content) for content in contents],
+            )
+        )
+
+    def test_one_insert_for_the_whole_batch(self):
+        background_tasks = BackgroundTasks()
+        rows = self.create_batch(PNG, JPEG, PNG, background_tasks=background_tasks)
+
+        self.assertEqual([row["id"] for row in rows], [1, 2, 3])
+        self.assertEqual(rows[0]["file_path"], rows[2]["file_path"])
+        self.assertEqual(len(self.stored_files()), 2)
+        self.assertEqual(self.db.query(JobReportImage).count(), 3)
+        # One variants job per distinct file
+        self.assertEqual(len(background_tasks.tasks), 2)
+
+    def test_rejected_file_fails_the_whole_batch(self):
+        with self.assertRaises(HTTPException) as raised:
+            self.create_batch(PNG, b"<html></html>", JPEG)
+
+        self.assertEqual(raised.exception.status_code, 415)
+        self.assertEqual(self.stored_files(), [])
+        self.assertEqual(self.db.query(JobReportImage).count(), 0)
+
+    def test_failed_batch_keeps_files_other_rows_use(self):
+        stored = self.create(PNG)
+
+        with self.assertRaises(HTTPException):
+            self.create_batch(PNG, JPEG, b"")
+
+        self.assertEqual(self.stored_files(), [Path(stored.file_path).name])
+
+    def test_failed_insert_removes_the_batch_files(self):
+        failure = OperationalError("INSERT", {}, Exception("gone away"))
+        with mock.patch.object(self.db, "commit", side_effect=failure):
+            with self.assertRaises(OperationalError):
+                self.create_batch(PNG, JPEG)
+
+        self.assertEqual(self.stored_files(), [])
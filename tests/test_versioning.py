@@ -0,0 +1,157 @@
+import asyncio
+import unittest
+from datetime import date, datetime
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from ..database import SessionLocal
+from ..migrations import run_migrations
+from ..models import Invoice, Product, PurchaseOrder, PurchaseOrderProduct, Vendor
+from ..routers.invoice import update_invoice
+from ..routers.purchase_order import update_purchase_order
+from ..schemas import InvoiceUpdate, PurchaseOrderResponse, PurchaseOrderUpdate
+from ..utils.versioning import conditional_update, load_updated
+
+
+class SoftDeletingUpdateTest(unittest.TestCase):
+    """An update setting `on_delete` must still answer with the row it wrote."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.previous_bind = SessionLocal.kw.get("bind")
+        SessionLocal.configure(bind=engine)
+        self.db = SessionLocal()
+        now = datetime(2025, 1, 1)
+        invoice = Invoice(
+            reference="INV-2025-001",
+            date_op=date(2025, 1, 2),
+            amount=100.0,
+            created_at=now,
+            updated_at=now,
+        )
+        self.db.add(invoice)
+        self.db.commit()
+        self.invoice_id = invoice.id
+
+    def tearDown(self):
+        self.db.close()
+        SessionLocal.configure(bind=self.previous_bind)
+
+    def test_conditional_update_bumps_the_version(self):
+        conditional_update(
+            self.db, Invoice, self.invoice_id, {"on_delete": True}, '"1"'
+        )
+        self.db.commit()
+
+        invoice = load_updated(self.db, Invoice, self.invoice_id)
+        self.assertTrue(invoice.on_delete)
+        self.assertEqual(invoice.version, 2)
+        # Hidden from the default, soft-delete filtered queries
+        self.db.expunge_all()
+        self.assertIsNone(self.db.get(Invoice, self.invoice_id))
+
+    def test_update_route_soft_deleting_the_invoice(self):
+        response = Response()
+        request = InvoiceUpdate.model_validate(
+            {
+                "client_id": 1,
+                "date_op": date(2025, 1, 2),
+                "on_delete": True,
+                "reason_delete": "duplicate",
+            }
+        )
+        invoice = asyncio.run(
+            update_invoice(
+                self.db, request, response, invoice_id=self.invoice_id, if_match='"1"'
+            )
+        )
+
+        self.assertEqual(response.headers["ETag"], '"2"')
+        self.assertEqual(invoice.id, self.invoice_id)
+        self.assertTrue(invoice.on_delete)
+
+    def test_stale_or_missing_rows_are_rejected(self):
+        for row_id, if_match, status_code in [
+            (self.invoice_id, '"7"', 412),
+            (self.invoice_id + 1, None, 404),
+        ]:
+            with self.subTest(status_code=status_code):
+                with self.assertRaises(HTTPException) as raised:
+                    conditional_update(self.db, Invoice, row_id, {}, if_match)
+                self.assertEqual(raised.exception.status_code, status_code)
+
+
+class UpdateRoundTripsTest(unittest.TestCase):
+    """The updated document and its relationships come back in one SELECT."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        run_migrations(engine)
+        self.statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+        self.db = SessionLocal(bind=engine)
+        self.addCleanup(self.db.close)
+        vendor = Vendor(name="Acme", email="a@x", phone="1", address="Main St")
+        product = Product(name="Cable", description="3G2.5", unit="m")
+        self.db.add_all([vendor, product])
+        self.db.flush()
+        purchase_order = PurchaseOrder(
+            reference="PO-1",
+            vendor_id=vendor.id,
+            user_id=1,
+            company_id=1,
+            date_op=date(2025, 1, 2),
+        )
+        self.db.add(purchase_order)
+        self.db.flush()
+        self.db.add_all(
+            PurchaseOrderProduct(
+                po_id=purchase_order.id, product_id=product.id, unit_price=2, quantity=q
+            )
+            for q in (1, 3)
+        )
+        self.db.commit()
+        self.po_id = purchase_order.id
+        self.request = PurchaseOrderUpdate(
+            reference="PO-1",
+            vendor_id=vendor.id,
+            user_id=1,
+            company_id=1,
+            date_op=date(2025, 1, 3),
+        )
+
+    def test_update_route_answers_from_a_single_select(self):
+        response = Response()
+        purchase_order = update_purchase_order(
+            self.po_id, self.request, response, self.db, if_match='"1"'
+        )
+
+        self.statements.clear()
+        body = PurchaseOrderResponse.model_validate(purchase_order)
+        self.assertEqual(self.statements, [])
+        self.assertEqual(response.headers["ETag"], '"2"')
+        self.assertEqual(body.version, 2)
+        self.assertEqual(body.vendor.name, "Acme")
+        self.assertEqual([line.quantity for line in body.products], [1, 3])
+        self.assertEqual(body.products[0].product.name, "Cable")
+
+    def test_load_updated_is_one_statement(self):
+        conditional_update(self.db, PurchaseOrder, self.po_id, {}, None)
+        self.db.commit()
+
+        self.statements.clear()
+        purchase_order = load_updated(
+            self.db, PurchaseOrder, self.po_id, PurchaseOrderResponse
+        )
+        PurchaseOrderResponse.model_validate(purchase_order)
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(self.statements[0].lstrip().startswith("SELECT"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+from sqlalchemy import insert, text
+
+
+def bulk_insert(db, model, rows: list) -> list:
+    """
+    Insert all `rows` with a single multi-row INSERT and return their ids, in
+    the order of `rows`.
+
+    The ids come from INSERT ... RETURNING where the database supports it.
+    Nothing is committed: the caller decides where the transaction ends.
+    """
+    if not rows:
+        return []
+
+    dialect = db.get_bind().dialect
+    if dialect.insert_returning:
+        statement = insert(model).values(rows).returning(model.id)
+        return list(db.execute(statement).scalars())
+
+    if dialect.name in ("mysql", "mariadb"):
+        # LAST_INSERT_ID() is the id of the first row. InnoDB hands the rows
+        # of a multi-row INSERT ... VALUES consecutive ids, in any
+        # innodb_autoinc_lock_mode, spaced by auto_increment_increment
+        first = db.execute(insert(model).values(rows)).lastrowid
+        step = db.execute(text("SELECT @@auto_increment_increment")).scalar_one()
+        return [first + index * step for index in range(len(rows))]
+
+    # Any other database without RETURNING: row by row, each reports its id
+    return [db.execute(insert(model).values(row)).lastrowid for row in rows]
@@ -0,0 +1,103 @@
+import sys
+from datetime import date
+from sqlalchemy import false, select, text
+from ..database import engine
+from .soft_delete import is_live
+from ..models import (
+    User,
+    Invoice,
+    InvoiceProduct,
+    Payment,
+    Transaction,
+    JobAssign,
+    ExpenseTask,
+    Expense,
+    PurchaseOrder,
+    Quotation,
+)
+
+
+# Queries behind the hot list/detail screens. Each one must be able to use an
+# index on the table it filters, otherwise it scans the whole table.
+HOT_QUERIES = {
+    "transactions_by_cash": select(Transaction.id).where(Transaction.cash_id == 1),
+    "payments_by_invoice": select(Payment.id).where(Payment.invoice_id == 1),
+    "invoice_products_by_invoice": select(InvoiceProduct.id).where(
+        InvoiceProduct.invoice_id == 1
+    ),
+    "jobs_assigns_by_job_technician": select(JobAssign.id).where(
+        JobAssign.job_id == 1, JobAssign.technician_id == 1
+    ),
+    "jobs_assigns_by_technician": select(JobAssign.id).where(
+        JobAssign.technician_id == 1
+    ),
+    "jobs_assigns_technician_overlap": select(JobAssign.id).where(
+        JobAssign.technician_id == 1,
+        JobAssign.date_start <= date(2025, 1, 7),
+        JobAssign.date_end >= date(2025, 1, 1),
+    ),
+    "expense_tasks_by_expense": select(ExpenseTask.id).where(
+        ExpenseTask.expense_id == 1
+    ),
+    "invoices_by_client_period": select(Invoice.id).where(
+        Invoice.client_id == 1,
+        Invoice.date_op >= date(2025, 1, 1),
+        Invoice.date_op < date(2025, 4, 1),
+    ),
+    "invoices_live_by_period": select(Invoice.id).where(
+        is_live(Invoice), Invoice.date_op >= date(2025, 1, 1)
+    ),
+    "invoices_by_status_period": select(Invoice.id).where(
+        Invoice.status == false(), Invoice.date_op >= date(2025, 1, 1)
+    ),
+    "quotations_by_client_period": select(Quotation.id).where(
+        Quotation.client_id == 1, Quotation.date_op >= date(2025, 1, 1)
+    ),
+    "purchase_orders_by_vendor_period": select(PurchaseOrder.id).where(
+        PurchaseOrder.vendor_id == 1, PurchaseOrder.date_op >= date(2025, 1, 1)
+    ),
+    "invoices_by_period": select(Invoice.id).where(Invoice.date_op >= date(2025, 1, 1)),
+    "expenses_by_period": select(Expense.id).where(Expense.date >= date(2025, 1, 1)),
+    "users_by_email": select(User.id).where(User.email == "user@example.com"),
+}
+
+
+def _scans(connection, dialect, query):
+    """The plan rows of `query` reading a whole table without any index."""
+    sql = query.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    if dialect.name == "sqlite":
+        plan = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).mappings()
+        return [dict(row) for row in plan if row["detail"].startswith("SCAN")]
+    plan = connection.execute(text(f"EXPLAIN {sql}")).mappings()
+    return [
+        dict(row) for row in plan if row["type"] == "ALL" and not row["possible_keys"]
+    ]
+
+
+def check_query_plans(bind=engine):
+    """
+    EXPLAIN each hot query and return the ones that can't use any index.
+
+    MySQL plans are checked on `possible_keys` rather than the chosen access
+    type because the optimizer may still prefer a scan on a near-empty
+    table. SQLite plans must SEARCH through an index, never SCAN the table.
+    """
+    if bind.dialect.name not in ("mysql", "sqlite"):
+        return {}
+
+    regressions = {}
+    with bind.connect() as connection:
+        for name, query in HOT_QUERIES.items():
+            scans = _scans(connection, bind.dialect, query)
+            if scans:
+                regressions[name] = scans[0]
+    return regressions
+
+
+if __name__ == "__main__":
+    regressions = check_query_plans()
+    for name, plan in regressions.items():
+        print(f"❌ {name}: full table scan: {plan}")
+    if regressions:
+        sys.exit(1)
+    print("✅ All hot queries can use an index")
@@ -0,0 +1,60 @@
+import os
+from sqlalchemy import case, func, update
+from ..models import PurchaseOrder, Quotation
+
+
+# Cameroon VAT (TVA) applied when a document's tva_status is set
+TVA_RATE = float(os.getenv("TVA_RATE", "0.1925"))
+
+
+def _totals(model, extra_status, extra_amount):
+    """
+    Header totals as SQL expressions evaluated inside the UPDATE itself.
+
+    subtotal - discount (% of subtotal) + TVA (on the discounted amount)
+    + shipping/delivery = amount
+    """
+    subtotal = model.computed_amount
+    discount = case(
+        (
+            model.discount_status.is_(True),
+            subtotal * func.coalesce(model.discount_percent, 0) / 100,
+        ),
+        else_=0.0,
+    )
+    tva = case(
+        (model.tva_status.is_(True), (subtotal - discount) * TVA_RATE), else_=0.0
+    )
+    extra = case((extra_status.is_(True), func.coalesce(extra_amount, 0)), else_=0.0)
+    return {
+        "subtotal": subtotal,
+        "discount_amount": discount,
+        "tva_amount": tva,
+        "amount": subtotal - discount + tva + extra,
+    }
+
+
+def refresh_purchase_order_totals(db, po_id: int):
+    db.execute(
+        update(PurchaseOrder)
+        .where(PurchaseOrder.id == po_id)
+        .values(
+            **_totals(
+                PurchaseOrder,
+                PurchaseOrder.shipping_status,
+                PurchaseOrder.shipping_amount,
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_quotation_totals(db, quotation_id: int):
+    db.execute(
+        update(Quotation)
+        .where(Quotation.id == quotation_id)
+        .values(
+            **_totals(Quotation, Quotation.delivery_status, Quotation.delivery_amount)
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import delete
+from .bulk import bulk_insert
+
+
+def insert_lines(db, model, parent_column: str, parent_id: int, lines: list):
+    rows = [{**line.model_dump(), parent_column: parent_id} for line in lines]
+    return bulk_insert(db, model, rows)
+
+
+def replace_lines(db, model, parent_column: str, parent_id: int, lines: list):
+    db.execute(delete(model).where(getattr(model, parent_column) == parent_id))
+    return insert_lines(db, model, parent_column, parent_id, lines)
+
+
+def save_document(db, model, header: dict, instance=None):
+    """Add or update a document header and flush it so lines can reference its id."""
+    if instance is None:
+        instance = model(**header)
+        db.add(instance)
+    else:
+        for key, value in header.items():
+            setattr(instance, key, value)
+    db.flush()
+    return instance
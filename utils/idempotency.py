@@ -0,0 +1,327 @@
+import datetime
+import hashlib
+import json
+import os
+import re
+import time
+from sqlalchemy import and_, delete, insert, select, update
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+
+HEADER = b"idempotency-key"
+# POST /create, /create-bulk, /create-full, /transactions/create, ...
+CREATE_PATH = re.compile(r"/create(-[a-z]+)?/?$")
+TTL = datetime.timedelta(hours=float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24")))
+# A request still in flight after this long is taken to be dead (its worker
+# crashed): a retry takes its key over instead of getting a 409
+LEASE = datetime.timedelta(seconds=float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "120")))
+# Response headers sent again with a replayed body
+REPLAYED_HEADERS = {b"content-type", b"etag", b"location", b"last-modified"}
+# Expired keys are purged at most this often (seconds)
+EVICT_EVERY = 300
+
+
+def _backend():
+    """
+    Engine and table of the keys, imported on first use: this module is
+    imported with main.py, models.py must stay out of the startup path.
+    """
+    from ..database import engine
+    from ..models import IdempotencyKey
+
+    return engine, IdempotencyKey.__table__
+
+
+def _now():
+    # Whole seconds: DATETIME columns drop the fraction, and locked_until is
+    # compared for equality
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return now.replace(tzinfo=None, microsecond=0)
+
+
+def _key_hash(method: str, path: str, key: bytes) -> str:
+    return hashlib.sha256(b"\n".join([method.encode(), path.encode(), key])).hexdigest()
+
+
+def _row(connection, table, key_hash: str, lock: bool = False):
+    query = select(table).where(table.c.key_hash == key_hash)
+    if lock:
+        query = query.with_for_update()
+    return connection.execute(query).first()
+
+
+def _claim(key_hash: str):
+    """
+    Insert the in-flight placeholder and return `(None, lease)`, or return
+    `(row, None)` with the row already stored for the key. Only a lease
+    means the key was won: a row of None is a claim still in flight.
+    """
+    engine, table = _backend()
+    try:
+        with engine.begin() as connection:
+            return _claim_in(connection, table, key_hash)
+    except IntegrityError:
+        # Claimed by a concurrent request in between. Re-read in a new
+        # transaction: under REPEATABLE READ the failed one still sees the
+        # snapshot without that row. FOR UPDATE waits for its commit.
+        pass
+    with engine.begin() as connection:
+        return _row(connection, table, key_hash, lock=True), None
+
+
+def _claim_in(connection, table, key_hash: str):
+    now = _now()
+    lease = now + LEASE
+    row = _row(connection, table, key_hash)
+    if row is None:
+        connection.execute(
+            insert(table).values(key_hash=key_hash, created_at=now, locked_until=lease)
+        )
+        return None, lease
+
+    expired = row.created_at < now - TTL
+    abandoned = row.status_code is None and (
+        row.locked_until is None or row.locked_until < now
+    )
+    if not expired and not abandoned:
+        return row, None
+    # Take the key over; the compare-and-set on locked_until lets a single
+    # one of concurrent retries win it
+    claimed = connection.execute(
+        update(table)
+        .where(
+            table.c.key_hash == key_hash,
+            table.c.created_at == row.created_at,
+            (
+                table.c.locked_until.is_(None)
+                if row.locked_until is None
+                else table.c.locked_until == row.locked_until
+            ),
+        )
+        .values(
+            fingerprint=None,
+            status_code=None,
+            content_type=None,
+            headers=None,
+            body=None,
+            created_at=now,
+            locked_until=lease,
+        )
+    )
+    if claimed.rowcount == 1:
+        return None, lease
+    # Lost to another retry, which is now in flight
+    return None, None
+
+
+def _owned(table, key_hash: str, lease):
+    # A request that outlived its lease lost the key to a retry: leave it be
+    return and_(table.c.key_hash == key_hash, table.c.locked_until == lease)
+
+
+def _save(key_hash: str, lease, fingerprint: str, status_code: int, headers, body):
+    engine, table = _backend()
+    with engine.begin() as connection:
+        connection.execute(
+            update(table)
+            .where(_owned(table, key_hash, lease))
+            .values(
+                fingerprint=fingerprint,
+                status_code=status_code,
+                content_type=dict(headers).get("content-type"),
+                headers=json.dumps(headers),
+                body=body,
+                locked_until=None,
+            )
+        )
+
+
+def _release(key_hash: str, lease):
+    engine, table = _backend()
+    with engine.begin() as connection:
+        connection.execute(delete(table).where(_owned(table, key_hash, lease)))
+
+
+def _evict():
+    engine, table = _backend()
+    with engine.begin() as connection:
+        connection.execute(delete(table).where(table.c.created_at < _now() - TTL))
+
+
+class _Fingerprint:
+    """
+    sha256 of a request body. Multipart bodies are hashed part by part,
+    headers and content, without the random boundary a retry changes.
+    """
+
+    def __init__(self, scope):
+        self.digest = hashlib.sha256()
+        self.parser = None
+        content_type = dict(scope["headers"]).get(b"content-type", b"")
+        media_type, params = parse_options_header(content_type)
+        if media_type == b"multipart/form-data" and params.get(b"boundary"):
+            self.header = []
+            self.parser = MultipartParser(
+                params[b"boundary"],
+                {
+                    "on_part_begin": lambda: self.digest.update(b"\0part\n"),
+                    "on_header_field": self._header_data,
+                    "on_header_value": self._header_data,
+                    "on_header_end": self._header_end,
+                    "on_headers_finished": lambda: self.digest.update(b"\n"),
+                    "on_part_data": self._part_data,
+                },
+            )
+
+    def _header_data(self, data: bytes, start: int, end: int):
+        self.header.append(data[start:end])
+
+    def _header_end(self):
+        self.digest.update(b"".join(self.header).lower() + b"\n")
+        self.header = []
+
+    def _part_data(self, data: bytes, start: int, end: int):
+        self.digest.update(data[start:end])
+
+    def update(self, chunk: bytes):
+        if self.parser is None:
+            self.digest.update(chunk)
+        else:
+            self.parser.write(chunk)
+
+    def hexdigest(self) -> str:
+        return self.digest.hexdigest()
+
+
+async def _send_json(send, status_code: int, detail: str):
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """
+    Replay the stored response of a create call retried with the same
+    `Idempotency-Key` header instead of running it again.
+
+    The key is claimed before the route runs, a retry arriving while the
+    first call is still in flight gets a 409. A claim left behind by a dead
+    worker lapses after IDEMPOTENCY_LEASE_SECONDS (120 by default). Keys
+    expire after IDEMPOTENCY_TTL_HOURS (24 by default).
+
+    Only responses below 400 are stored, with their REPLAYED_HEADERS: a
+    rejected or failed call releases the key for the next attempt.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.last_eviction = 0.0
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not CREATE_PATH.search(scope["path"])
+        ):
+            return await self.app(scope, receive, send)
+
+        key = dict(scope["headers"]).get(HEADER)
+        if not key:
+            return await self.app(scope, receive, send)
+
+        if time.monotonic() - self.last_eviction > EVICT_EVERY:
+            self.last_eviction = time.monotonic()
+            await run_in_threadpool(_evict)
+
+        key_hash = _key_hash(scope["method"], scope["path"], key)
+        stored, lease = await run_in_threadpool(_claim, key_hash)
+        if lease is None:
+            return await self._replay(scope, stored, receive, send)
+
+        digest = _Fingerprint(scope)
+
+        async def hashing_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                digest.update(message.get("body", b""))
+            return message
+
+        response = {"status": 500, "headers": [], "body": []}
+
+        async def capturing_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    [name.decode("latin-1").lower(), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                    if name.lower() in REPLAYED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, hashing_receive, capturing_send)
+        except Exception:
+            await run_in_threadpool(_release, key_hash, lease)
+            raise
+
+        if response["status"] >= 400:
+            # Nothing was created: a rejected request (422 included) can be
+            # corrected and sent again with the same key, a failed one retried
+            await run_in_threadpool(_release, key_hash, lease)
+        else:
+            await run_in_threadpool(
+                _save,
+                key_hash,
+                lease,
+                digest.hexdigest(),
+                response["status"],
+                response["headers"],
+                b"".join(response["body"]),
+            )
+
+    async def _replay(self, scope, stored, receive, send):
+        if stored is None or stored.status_code is None:
+            return await _send_json(
+                send, 409, "A request with this Idempotency-Key is in progress."
+            )
+
+        digest = _Fingerprint(scope)
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                return
+            digest.update(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        if digest.hexdigest() != stored.fingerprint:
+            return await _send_json(
+                send, 422, "Idempotency-Key already used with another request body."
+            )
+
+        headers = [(b"idempotent-replayed", b"true")]
+        if stored.headers is not None:
+            headers += [
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in json.loads(stored.headers)
+            ]
+        elif stored.content_type:
+            # Stored before the headers were
+            headers.append((b"content-type", stored.content_type.encode()))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": stored.status_code,
+                "headers": headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": stored.body or b""})
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+from PIL import Image, ImageOps
+from starlette.concurrency import run_in_threadpool
+from .storage import absolute_path
+
+
+logger = logging.getLogger("uvicorn.error")
+
+# Longest side, in pixels, of each downscaled variant
+VARIANTS = {"thumb": 320, "medium": 1280}
+
+_executor = None
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        # Resizing is CPU bound: separate processes keep it off the GIL.
+        # spawn, because forking a process that runs threads is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=int(os.getenv("IMAGE_WORKERS", "2")),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_pool():
+    """Stop the worker processes, on app shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def variant_name(relative_path: str, size: str) -> str:
+    """`reports/images/<sha>.png` -> `reports/images/<sha>.thumb.jpg`"""
+    if size == "original":
+        return relative_path
+    path = PurePosixPath(relative_path)
+    return str(path.with_name(f"{path.stem}.{size}.jpg"))
+
+
+def resolve_variant(relative_path: str, size: str) -> str:
+    """The requested variant, or the original while it hasn't been generated."""
+    name = variant_name(relative_path, size)
+    return name if absolute_path(name).exists() else relative_path
+
+
+def _resolve_all(relative_paths: list, size: str) -> list:
+    return [resolve_variant(relative_path, size) for relative_path in relative_paths]
+
+
+async def resolve_variants(relative_paths: list, size: str) -> list:
+    """resolve_variant() over many paths, its stat calls off the event loop."""
+    if size == "original":
+        return list(relative_paths)
+    return await run_in_threadpool(_resolve_all, relative_paths, size)
+
+
+def render_variants(source: str):
+    """Write the missing JPEG variants next to `source` (runs in the pool)."""
+    created = []
+    with Image.open(source) as image:
+        # Phone photos are stored sideways with an EXIF orientation flag
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for size, pixels in VARIANTS.items():
+            target = Path(variant_name(source, size))
+            if target.exists():
+                continue
+            variant = image.copy()
+            variant.thumbnail((pixels, pixels))
+            tmp = target.with_name(f".{target.name}.part")
+            variant.save(tmp, "JPEG", quality=82, optimize=True)
+            os.replace(tmp, target)
+            created.append(target.name)
+    return created
+
+
+async def generate_variants(relative_path: str):
+    """Background task: render the variants of an uploaded image in the pool."""
+    source = str(absolute_path(relative_path))
+    try:
+        await asyncio.wrap_future(_pool().submit(render_variants, source))
+    except Exception:
+        logger.exception("Could not generate variants of %s", relative_path)
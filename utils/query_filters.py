@@ -0,0 +1,82 @@
+from datetime import date, datetime
+from fastapi import HTTPException
+from starlette import status
+
+
+# Query parameters handled by the routes themselves, never compiled to predicates
+RESERVED_PARAMS = {"order_by", "include_deleted"}
+
+OPERATORS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "in": lambda column, value: column.in_(value),
+}
+
+
+def _bad_request(detail: str):
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _coerce(column, field: str, raw: str):
+    python_type = column.type.python_type
+    try:
+        if python_type is bool:
+            if raw.lower() in ("1", "true", "yes"):
+                return True
+            if raw.lower() in ("0", "false", "no"):
+                return False
+            raise ValueError(raw)
+        if python_type is date:
+            return date.fromisoformat(raw)
+        if python_type is datetime:
+            return datetime.fromisoformat(raw)
+        return python_type(raw)
+    except ValueError:
+        raise _bad_request(f"Invalid value '{raw}' for '{field}'")
+
+
+def apply_filters(query, model, params, allowed_fields, default_order=None):
+    """
+    Compile query string parameters into SQL predicates and ordering.
+
+    `?client_id=12&date_op__gte=2025-01-01&order_by=-date_op`
+    Only the columns listed in `allowed_fields` (the indexed ones) are
+    filtered on. Other parameters, such as cache busters, are ignored; an
+    unknown operator or sorting on another column is a 400.
+    """
+    for key, raw in params.multi_items():
+        if key in RESERVED_PARAMS:
+            continue
+
+        field, _, op = key.partition("__")
+        op = op or "eq"
+        if field not in allowed_fields:
+            continue
+        if op not in OPERATORS:
+            raise _bad_request(f"Filtering on '{key}' is not supported")
+
+        column = getattr(model, field)
+        if op == "in":
+            value = [_coerce(column, field, item) for item in raw.split(",") if item]
+        else:
+            value = _coerce(column, field, raw)
+        query = query.filter(OPERATORS[op](column, value))
+
+    clauses = []
+    # `?order_by=name,` leaves an empty segment: skip it
+    for item in filter(None, params.get("order_by", "").split(",")):
+        field = item.lstrip("-")
+        if field not in allowed_fields:
+            raise _bad_request(f"Sorting on '{field}' is not supported")
+        column = getattr(model, field)
+        clauses.append(column.desc() if item.startswith("-") else column.asc())
+    if clauses:
+        query = query.order_by(*clauses)
+    elif default_order is not None:
+        query = query.order_by(default_order)
+
+    return query
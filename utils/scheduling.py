@@ -0,0 +1,58 @@
+from datetime import date
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import and_, select
+from starlette import status
+from ..models import JobAssign, Technician
+
+
+def overlaps(date_start: date, date_end: date):
+    """Assignments sharing at least one day with [date_start, date_end]."""
+    return and_(JobAssign.date_start <= date_end, JobAssign.date_end >= date_start)
+
+
+def check_period(date_start: date, date_end: date):
+    if date_start > date_end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_start must not be after date_end",
+        )
+
+
+def check_technician_available(
+    db,
+    technician_id: int,
+    date_start: date,
+    date_end: date,
+    exclude_id: Optional[int] = None,
+):
+    """
+    Raise a 409 listing the technician's assignments overlapping the period.
+
+    The technician row stays locked until the caller commits: a concurrent
+    assignment of the same technician waits here instead of passing the
+    same check and double-booking them.
+    """
+    check_period(date_start, date_end)
+    technician = db.execute(
+        select(Technician.id).where(Technician.id == technician_id).with_for_update()
+    ).first()
+    if technician is None:
+        raise HTTPException(status_code=404, detail="Technician not found")
+
+    # Seeks (technician_id, date_start) in ix_jobs_assigns_technician_period
+    query = select(JobAssign.id).where(
+        JobAssign.technician_id == technician_id, overlaps(date_start, date_end)
+    )
+    if exclude_id is not None:
+        query = query.where(JobAssign.id != exclude_id)
+
+    conflicts = list(db.execute(query.limit(10)).scalars())
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Technician already assigned over this period",
+                "job_assign_ids": conflicts,
+            },
+        )
@@ -0,0 +1,33 @@
+from sqlalchemy import Boolean, Column, String, event, false, or_
+from sqlalchemy.orm import with_loader_criteria
+from ..database import SessionLocal
+
+
+class SoftDeleteMixin:
+    """Models whose rows are flagged with `on_delete` instead of being deleted."""
+
+    on_delete = Column(Boolean, nullable=True)
+    reason_delete = Column(String(255), nullable=True)
+
+
+def is_live(cls):
+    # `= false OR IS NULL` lets MySQL walk the (on_delete, ...) index with ref_or_null
+    return or_(cls.on_delete == false(), cls.on_delete.is_(None))
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _exclude_soft_deleted(execute_state):
+    """
+    Hide soft-deleted rows from every ORM select, relationship loads included.
+
+    Pass `.execution_options(include_deleted=True)` to see them.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, is_live, include_aliases=True)
+        )
@@ -0,0 +1,119 @@
+import importlib
+import logging
+import time
+
+
+logger = logging.getLogger("uvicorn.error")
+
+# Router modules, in registration order, with the URL prefix each one serves
+ROUTERS = {
+    "auth": "/auth",
+    "generate_references": "/generate-code",
+    "profile": "/profiles",
+    "users": "/users",
+    "client_types": "/client-types",
+    "clients": "/clients",
+    "contact_person": "/contact-person",
+    "vendors": "/vendors",
+    "products": "/products",
+    "products_input": "/products-input",
+    "products_output": "/products-outputs",
+    "technicians_role": "/technicians_roles",
+    "technicians": "/technicians",
+    "job": "/jobs",
+    "job_assign": "/jobs_assign",
+    "job_report": "/jobs-report",
+    "job_report_image": "/jobs-report-image",
+    "company_info": "/company-detail",
+    "purchase_order": "/purchase_orders",
+    "purchase_order_product": "/purchase_order_products",
+    "quotation_type": "/quotations_types",
+    "quotation": "/quotations",
+    "quotation_product": "/quotations_products",
+    "quotation_service": "/quotations_services",
+    "invoice_type": "/invoices-types",
+    "invoice": "/invoices",
+    "invoice_job": "/invoices-jobs",
+    "invoice_products": "/invoices-products",
+    "invoice_technician": "/invoices-technicians",
+    "payment_method": "/payment-methods",
+    "payment": "/payments",
+    "tools": "/tools",
+    "tools_output": "/tools-output",
+    "tools_return": "/tools-return",
+    "cash": "/cash",
+    "expense": "/expenses",
+    "expense_task": "/expense-tasks",
+    "files": "/files",
+}
+
+# Paths that need every route registered (the OpenAPI schema and the docs)
+DOCS_PATHS = {"/openapi.json", "/docs", "/docs/oauth2-redirect", "/redoc"}
+
+# Seconds spent importing each module and registering its routes
+import_report = {}
+
+
+def _timed_import(name: str):
+    start = time.perf_counter()
+    module = importlib.import_module(f"..{name}", __package__)
+    import_report[name] = round(time.perf_counter() - start, 4)
+    return module
+
+
+def include_router(app, name: str):
+    start = time.perf_counter()
+    module = importlib.import_module(f"..routers.{name}", __package__)
+    app.include_router(module.router)
+    import_report[f"routers.{name}"] = round(time.perf_counter() - start, 4)
+
+
+def include_routers(app):
+    # Imported up front so their cost isn't charged to the first router
+    _timed_import("models")
+    _timed_import("schemas")
+    for name in ROUTERS:
+        include_router(app, name)
+
+
+def log_import_report():
+    total = sum(import_report.values())
+    logger.info("Imported %d modules in %.3fs", len(import_report), total)
+    for name, seconds in sorted(import_report.items(), key=lambda item: -item[1]):
+        logger.info("  %-40s %.4fs", name, seconds)
+
+
+class LazyRouterMiddleware:
+    """
+    Register a router the first time a request hits its prefix.
+
+    Workers become ready without importing the routers, models and schemas;
+    the cost is paid by the first request of each resource instead.
+    """
+
+    def __init__(self, app, fastapi_app):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.loaded = set()
+
+    def load(self, name: str):
+        if name in self.loaded:
+            return
+        # No await between the check and the registration: the event loop
+        # can't interleave two registrations of the same router
+        include_router(self.fastapi_app, name)
+        self.loaded.add(name)
+        self.fastapi_app.openapi_schema = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path in DOCS_PATHS:
+                for name in ROUTERS:
+                    self.load(name)
+            else:
+                for name, prefix in ROUTERS.items():
+                    if path == prefix or path.startswith(prefix + "/"):
+                        self.load(name)
+                        break
+        await self.app(scope, receive, send)
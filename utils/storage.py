@@ -0,0 +1,176 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+import anyio
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from starlette import status
+
+
+# Uploaded files live under UPLOAD_ROOT; the database stores paths relative to it
+UPLOAD_ROOT = Path(
+    os.getenv("UPLOAD_ROOT", Path(__file__).resolve().parent.parent / "uploads")
+)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 20 * 1024 * 1024))
+# Whole request body, a batch of several files included
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", 5 * MAX_UPLOAD_BYTES))
+CHUNK_SIZE = 1024 * 1024
+
+REPORT_IMAGES = "reports/images"
+
+
+def absolute_path(relative_path: str) -> Path:
+    return UPLOAD_ROOT / relative_path
+
+
+def sniff_image(head: bytes):
+    """
+    Suffix of the image format `head` starts with, None for anything else.
+
+    The stored name never reuses the client's suffix: a `.html` upload would
+    otherwise be served back as a page from the API origin.
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+def _fsync(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _commit(tmp: Path, target: Path):
+    """Make the written file durable, then publish it under its final name."""
+    _fsync(tmp)
+    if target.exists():
+        # Same content already stored: keep the existing file
+        tmp.unlink()
+        return
+    os.replace(tmp, target)
+    _fsync(target.parent)
+
+
+async def store_upload(
+    upload: UploadFile, folder: str, max_bytes: int = MAX_UPLOAD_BYTES
+) -> str:
+    """
+    Copy an upload under UPLOAD_ROOT/folder, chunk by chunk, without blocking
+    the event loop, and return its path relative to UPLOAD_ROOT.
+
+    The file is named after the sha256 of its content: the same photo sent
+    twice is stored once. Its suffix comes from the detected image format,
+    anything that isn't a JPEG, PNG, GIF or WebP image gets a 415. Anything
+    larger than `max_bytes` is rejected with a 413 as soon as the limit is
+    crossed.
+    """
+    directory = UPLOAD_ROOT / folder
+    await anyio.Path(directory).mkdir(parents=True, exist_ok=True)
+    tmp = directory / f".{uuid.uuid4().hex}.part"
+    buffer = anyio.wrap_file(open(tmp, "wb"))
+    digest = hashlib.sha256()
+    size = 0
+    suffix = None
+    try:
+        async with buffer:
+            while chunk := await upload.read(CHUNK_SIZE):
+                if suffix is None:
+                    suffix = sniff_image(chunk)
+                    if suffix is None:
+                        raise HTTPException(
+                            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail="Only JPEG, PNG, GIF and WebP images are accepted",
+                        )
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File larger than {max_bytes} bytes",
+                    )
+                digest.update(chunk)
+                await buffer.write(chunk)
+
+        if suffix is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Empty file"
+            )
+        name = f"{digest.hexdigest()}{suffix}"
+        await anyio.to_thread.run_sync(_commit, tmp, directory / name)
+    except BaseException:
+        # Not awaited: once a batch upload cancels this write, anyio drops
+        # the thread calls still queued, closing and unlinking included
+        buffer.wrapped.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    return f"{folder}/{name}"
+
+
+async def remove_upload(relative_path: str):
+    await anyio.Path(absolute_path(relative_path)).unlink(missing_ok=True)
+
+
+class RequestSizeLimitMiddleware:
+    """
+    413 for request bodies over MAX_REQUEST_BYTES, decided from Content-Length
+    up front or while the body streams in: Starlette would otherwise spool a
+    whole multipart upload to disk before any route sees it.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.detail = f"Request body larger than {max_bytes} bytes"
+
+    async def _reject(self, scope, receive, send):
+        response = JSONResponse(
+            {"detail": self.detail},
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            return await self._reject(scope, receive, send)
+
+        received = 0
+        started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPExceptions met while parsing a body
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=self.detail,
+                    )
+            return message
+
+        async def tracking_send(message):
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as exc:
+            # Raised outside of a route, by a middleware reading the body
+            if exc.status_code != status.HTTP_413_REQUEST_ENTITY_TOO_LARGE or started:
+                raise
+            await self._reject(scope, receive, send)
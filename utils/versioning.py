@@ -0,0 +1,121 @@
+import typing
+from typing import Optional
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import Column, Integer, inspect, select, update
+from sqlalchemy.orm import joinedload
+from starlette import status
+
+
+class VersionedMixin:
+    """Rows carrying a `version` bumped by every update (optimistic locking)."""
+
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Version expected by an `If-Match: "3"` header, None when absent or `*`."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid If-Match header '{if_match}'",
+        )
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def conditional_update(db, model, row_id: int, values: dict, if_match: Optional[str]):
+    """
+    Apply `values` with a single `UPDATE ... WHERE id AND version` statement,
+    bumping the version.
+
+    Without If-Match the update is unconditional but still bumps the version.
+    Raises 404 when the row doesn't exist and 412 when it was modified since
+    the version the client read.
+    """
+    expected = parse_if_match(if_match)
+    statement = update(model).where(model.id == row_id)
+    if expected is not None:
+        statement = statement.where(model.version == expected)
+    statement = statement.values(**values, version=model.version + 1)
+    statement = statement.execution_options(synchronize_session=False)
+
+    if db.get_bind().dialect.update_returning:
+        if db.execute(statement.returning(model.id)).first() is not None:
+            return
+    elif db.execute(statement).rowcount:
+        return
+
+    # Only reached on failure: find out which of the two it was
+    exists = db.execute(
+        select(model.id)
+        .where(model.id == row_id)
+        .execution_options(include_deleted=True)
+    ).first()
+    if exists is None:
+        raise HTTPException(status_code=404, detail="Data not found.")
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="The record was modified by someone else, reload it and retry.",
+    )
+
+
+def _nested_schema(annotation):
+    """The response model inside `Optional[List[X]]` and the like, if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        schema = _nested_schema(arg)
+        if schema is not None:
+            return schema
+    return None
+
+
+def eager_loads(model, schema, parent=None, seen=()):
+    """
+    joinedload() options for every relationship `schema` serializes, nested
+    ones included, so that a single SELECT fills the whole response.
+    """
+    options = []
+    relationships = inspect(model).relationships
+    for name, field in schema.model_fields.items():
+        if name not in relationships:
+            continue
+        attribute = getattr(model, name)
+        loader = (
+            joinedload(attribute) if parent is None else parent.joinedload(attribute)
+        )
+        options.append(loader)
+        target = relationships[name].mapper.class_
+        nested = _nested_schema(field.annotation)
+        # A schema pointing back to a model already on the path stops there
+        if nested is not None and target not in seen:
+            options += eager_loads(target, nested, loader, seen + (model,))
+    return options
+
+
+def load_updated(db, model, row_id: int, schema=None):
+    """
+    The row a conditional update just wrote, for the response body, and its
+    version for the ETag, in one SELECT.
+
+    With the route's response `schema`, the relationships it serializes are
+    joined in the same SELECT instead of being lazy-loaded one by one.
+    Soft-deleted rows included: the update itself may have set `on_delete`.
+    """
+    statement = select(model).where(model.id == row_id)
+    if schema is not None:
+        statement = statement.options(*eager_loads(model, schema))
+    statement = statement.execution_options(
+        include_deleted=True, populate_existing=True
+    )
+    return db.execute(statement).unique().scalar_one()